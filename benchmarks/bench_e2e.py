@@ -0,0 +1,260 @@
+"""
+End-to-end conversion benchmark: the generated corpus through real Docling.
+
+Converts every corpus document (see benchmarks/corpus.py) under named
+option profiles and reports, per profile, pages per second, seconds per
+document and peak memory, so defaults can be chosen from measurements:
+
+    default           the converter's defaults
+    ocr-<engine>      each OCR engine check_ocr_engine_available() reports
+                      as installed (OCR forced on every page)
+    tables-<mode>     table_mode fast and accurate
+    backend-<name>    each PDF backend
+
+Each profile first converts one small document to load the models; that
+warm-up is reported separately and not counted. Peak memory is the
+converter process's peak while converting a document (per-job resource
+accounting).
+
+Usage:
+    python benchmarks/bench_e2e.py [--corpus DIR] [--profiles default tables-fast ...]
+        [--engine inprocess|cli] [--repeat 1] [--config profile.json]
+        [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config  # noqa: E402
+from core.batch import conversion_kwargs, params_from_config  # noqa: E402
+from core.converter import DoclingConverter  # noqa: E402
+from core.usage import ResourceUsage  # noqa: E402
+from corpus import MANIFEST_NAME, generate_corpus, load_corpus  # noqa: E402
+
+PDF_BACKENDS = ["dlparse_v4", "dlparse_v2", "dlparse_v1", "pypdfium2"]
+TABLE_MODES = ["fast", "accurate"]
+
+# Seconds a single document may take before it counts as failed
+DOCUMENT_TIMEOUT = 1800
+
+
+def build_profiles(converter: DoclingConverter, config: Config) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the named option profiles (overrides of the base parameters).
+
+    OCR engines that are not installed are left out and reported.
+    """
+    profiles: Dict[str, Dict[str, Any]] = {'default': {}}
+
+    engines = config.get("models", "ocr_engines",
+                         default=["auto", "easyocr", "tesseract", "tesserocr", "rapidocr", "ocrmac"])
+    for engine in engines:
+        if engine == "auto":
+            continue
+        available, _ = converter.check_ocr_engine_available(engine)
+        if available:
+            profiles[f"ocr-{engine}"] = {'ocr_enabled': True, 'force_ocr': True, 'ocr_engine': engine}
+        else:
+            print(f"Skipping profile ocr-{engine}: engine not installed", file=sys.stderr)
+
+    for mode in TABLE_MODES:
+        profiles[f"tables-{mode}"] = {'table_mode': mode}
+    for backend in PDF_BACKENDS:
+        profiles[f"backend-{backend}"] = {'pdf_backend': backend}
+    return profiles
+
+
+def convert_one(converter: DoclingConverter, params: Dict[str, Any],
+                input_path: str) -> Dict[str, Any]:
+    """Convert one document and wait for it; returns its timing and usage."""
+    done = threading.Event()
+    result: Dict[str, Any] = {'return_code': None, 'error': None, 'usage': None}
+
+    def on_complete(return_code: int):
+        result['return_code'] = return_code
+        done.set()
+
+    def on_error(error: str):
+        result['error'] = error
+        done.set()
+
+    def on_usage(usage: ResourceUsage):
+        result['usage'] = usage
+
+    start = time.perf_counter()
+    job = converter.convert(**params, input_path=input_path, on_complete=on_complete,
+                            on_error=on_error, on_usage=on_usage)
+    if job is None:
+        return {'seconds': 0.0, 'ok': False, 'error': "no free converter slot", 'peak_rss_mb': None}
+    if not done.wait(DOCUMENT_TIMEOUT):
+        converter.cancel(job.job_id)
+        result['error'] = "timed out"
+    seconds = time.perf_counter() - start
+
+    usage: Optional[ResourceUsage] = result['usage']
+    peak = usage.peak_rss_bytes if usage is not None else None
+    return {
+        'seconds': seconds,
+        'ok': result['error'] is None and result['return_code'] == 0,
+        'error': result['error'] or (None if result['return_code'] == 0
+                                     else f"exit code: {result['return_code']}"),
+        'cpu_seconds': usage.cpu_seconds if usage is not None else None,
+        'peak_rss_mb': peak / (1024 * 1024) if peak is not None else None,
+    }
+
+
+def run_profile(converter: DoclingConverter, base_params: Dict[str, Any],
+                overrides: Dict[str, Any], corpus_dir: Path, documents: List[Dict[str, Any]],
+                output_dir: str, repeat: int) -> Dict[str, Any]:
+    """Convert the corpus under one profile and summarize it."""
+    params = {**base_params, **overrides, 'output_dir': output_dir}
+
+    # Warm up: load the models for this option set
+    warmup_doc = min((doc for doc in documents if doc['format'] == 'pdf'),
+                     key=lambda doc: doc['pages'] or 0, default=documents[0])
+    warmup = convert_one(converter, params, str(corpus_dir / warmup_doc['path']))
+
+    runs = []
+    for _ in range(repeat):
+        for doc in documents:
+            run = convert_one(converter, params, str(corpus_dir / doc['path']))
+            runs.append({**run, 'path': doc['path'], 'category': doc['category'],
+                         'pages': doc['pages']})
+            status = "ok" if run['ok'] else f"FAILED ({run['error']})"
+            print(f"    {doc['path']:<28} {run['seconds']:8.2f}s  {status}")
+
+    succeeded = [run for run in runs if run['ok']]
+    paged = [run for run in succeeded if run['pages']]
+    seconds = [run['seconds'] for run in succeeded]
+    peaks = [run['peak_rss_mb'] for run in succeeded if run['peak_rss_mb'] is not None]
+    paged_seconds = sum(run['seconds'] for run in paged)
+
+    categories: Dict[str, Dict[str, float]] = {}
+    for category in sorted({run['category'] for run in succeeded}):
+        in_category = [run for run in succeeded if run['category'] == category]
+        category_paged = [run for run in in_category if run['pages']]
+        category_paged_seconds = sum(run['seconds'] for run in category_paged)
+        categories[category] = {
+            'documents': len(in_category),
+            'seconds_per_document': statistics.mean(run['seconds'] for run in in_category),
+            'pages_per_second': (sum(run['pages'] for run in category_paged) / category_paged_seconds
+                                 if category_paged_seconds else None),
+        }
+
+    return {
+        'overrides': overrides,
+        'warmup_seconds': warmup['seconds'],
+        'documents': len(runs),
+        'failed': len(runs) - len(succeeded),
+        'failures': [{'path': run['path'], 'error': run['error']} for run in runs if not run['ok']],
+        'pages': sum(run['pages'] for run in paged),
+        'pages_per_second': (sum(run['pages'] for run in paged) / paged_seconds
+                             if paged_seconds else None),
+        'seconds_per_document': statistics.mean(seconds) if seconds else None,
+        'median_seconds_per_document': statistics.median(seconds) if seconds else None,
+        'peak_rss_mb': max(peaks) if peaks else None,
+        'categories': categories,
+        'runs': runs,
+    }
+
+
+def _format(value: Optional[float], spec: str) -> str:
+    return format(value, spec) if value is not None else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--corpus', help="Corpus directory (generated there if it has no manifest; "
+                                         "default: a temporary directory)")
+    parser.add_argument('--scale', type=int, default=1, help="Corpus page count multiplier")
+    parser.add_argument('--profiles', nargs='+', help="Profiles to run (default: all)")
+    parser.add_argument('--engine', choices=["inprocess", "cli"], default="inprocess",
+                        help="Conversion engine (the CLI reloads models for every document)")
+    parser.add_argument('--repeat', type=int, default=1, help="Conversions of each document")
+    parser.add_argument('-c', '--config', help="Settings profile for the base parameters")
+    parser.add_argument('--output', help="Result file (default: bench_e2e_<time>.json)")
+    args = parser.parse_args()
+
+    config = Config(args.config) if args.config else Config()
+    converter = DoclingConverter()
+    cli_path = config.get("processing", "doclingCliPath", default="auto")
+    if cli_path and cli_path != "auto":
+        converter.docling_path = cli_path
+
+    params = params_from_config(config)
+    artifacts_path = None
+    if params['processing_mode'] == "offline":
+        artifacts_path = config.get("processing", "artifactsPath")
+    base_params = conversion_kwargs(params, artifacts_path)
+    base_params['engine'] = args.engine
+
+    profiles = build_profiles(converter, config)
+    if args.profiles:
+        unknown = [name for name in args.profiles if name not in profiles]
+        if unknown:
+            parser.error(f"unknown or unavailable profiles: {', '.join(unknown)} "
+                         f"(available: {', '.join(profiles)})")
+        profiles = {name: profiles[name] for name in args.profiles}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = Path(args.corpus or Path(tmp) / "corpus")
+        if (corpus_dir / MANIFEST_NAME).exists():
+            manifest = load_corpus(str(corpus_dir))
+        else:
+            manifest = generate_corpus(str(corpus_dir), scale=max(1, args.scale))
+        documents = manifest['documents']
+        print(f"Corpus: {len(documents)} documents in {corpus_dir}")
+
+        results = {}
+        try:
+            for name, overrides in profiles.items():
+                print(f"\nProfile {name}")
+                output_dir = str(Path(tmp) / "output" / name)
+                os.makedirs(output_dir, exist_ok=True)
+                results[name] = run_profile(converter, base_params, overrides, corpus_dir,
+                                            documents, output_dir, max(1, args.repeat))
+        finally:
+            converter.shutdown()
+
+    print(f"\n{'profile':<22} {'pages/s':>8} {'s/doc':>8} {'median':>8} {'peak MB':>8} "
+          f"{'failed':>7} {'warm-up s':>10}")
+    for name, result in results.items():
+        print(f"{name:<22} {_format(result['pages_per_second'], '8.2f')} "
+              f"{_format(result['seconds_per_document'], '8.2f')} "
+              f"{_format(result['median_seconds_per_document'], '8.2f')} "
+              f"{_format(result['peak_rss_mb'], '8.0f')} {result['failed']:>7} "
+              f"{result['warmup_seconds']:>10.1f}")
+
+    document = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'engine': args.engine,
+            'corpus': {'seed': manifest['seed'], 'scale': manifest['scale'],
+                       'documents': len(documents)},
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    output = args.output or f"bench_e2e_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""
+Benchmark the orchestration layer against a stub docling executable.
+
+Docling itself is replaced by benchmarks/fake_docling.py, so the numbers
+show what the queue, runner, converter and output handling cost on their
+own:
+
+    enqueue     items added per second (ConversionQueue.add_files)
+    statistics  microseconds per ConversionQueue.get_statistics call
+    streaming   parent CPU time per output line, from the docling child
+                through DoclingConverter and QueueRunner into an OutputBuffer
+    end_to_end  items per second through QueueRunner with a stub that exits
+                immediately, and the time per item beyond starting the stub
+
+Results are printed and written as JSON; --compare prints the change
+against an earlier result file.
+
+Usage:
+    python benchmarks/bench_orchestration.py [--sizes 10 100 1000 10000 100000]
+        [--e2e-sizes 10 100 1000] [--workers 1 4] [--batch-size 1]
+        [--output results.json] [--compare previous.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import queue
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config  # noqa: E402
+from core.batch import conversion_kwargs, params_from_config  # noqa: E402
+from core.converter import DoclingConverter  # noqa: E402
+from core.output_buffer import OutputBuffer  # noqa: E402
+from core.queue import ConversionQueue  # noqa: E402
+from core.runner import QueueRunner  # noqa: E402
+from fake_docling import make_executable  # noqa: E402
+
+
+def _make_files(folder: Path, count: int) -> List[str]:
+    """Create (or reuse) ``count`` empty input files."""
+    files = []
+    for i in range(count):
+        path = folder / f"doc_{i}.pdf"
+        if not path.exists():
+            path.touch()
+        files.append(str(path))
+    return files
+
+
+def _set_stub(**settings):
+    """Configure the stub through the environment its processes inherit."""
+    for name in ("SECONDS", "LINES", "LINE_COUNT", "EXIT_CODE", "FAIL_MATCH"):
+        os.environ.pop(f"FAKE_DOCLING_{name}", None)
+    for name, value in settings.items():
+        os.environ[f"FAKE_DOCLING_{name.upper()}"] = str(value)
+
+
+def _cpu_seconds() -> float:
+    """User plus system CPU time of this process."""
+    times = os.times()
+    return times.user + times.system
+
+
+def _run_queue(files: List[str], converter: DoclingConverter, run_params: Dict[str, Any],
+               workers: int = 1, batch_size: int = 1,
+               on_output: Optional[Callable[[str, str], None]] = None) -> Dict[str, float]:
+    """Convert files with a QueueRunner driven by a headless event loop."""
+    conversion_queue = ConversionQueue()
+    conversion_queue.add_files(files)
+    events: "queue.Queue" = queue.Queue()
+    finished: List[Dict[str, int]] = []
+
+    runner = QueueRunner(
+        conversion_queue,
+        converter,
+        dispatch=events.put,
+        max_workers=workers,
+        batch_size=batch_size,
+        on_output=on_output,
+        on_queue_complete=finished.append
+    )
+
+    cpu_start = _cpu_seconds()
+    start = time.perf_counter()
+    runner.start(lambda item: run_params)
+    while not finished:
+        events.get()()
+    elapsed = time.perf_counter() - start
+
+    stats = finished[0]
+    if stats['completed'] != len(files):
+        raise RuntimeError(f"stub conversions failed: {stats}")
+    return {'seconds': elapsed, 'parent_cpu_seconds': _cpu_seconds() - cpu_start}
+
+
+def bench_enqueue(sizes: List[int], folder: Path) -> Dict[str, float]:
+    """Items added per second at each queue size."""
+    results = {}
+    for size in sizes:
+        files = _make_files(folder, size)
+        conversion_queue = ConversionQueue()
+        start = time.perf_counter()
+        conversion_queue.add_files(files)
+        results[str(size)] = size / (time.perf_counter() - start)
+    return results
+
+
+def bench_statistics(sizes: List[int], folder: Path, calls: int = 2000) -> Dict[str, float]:
+    """Microseconds per get_statistics call at each queue size."""
+    results = {}
+    for size in sizes:
+        conversion_queue = ConversionQueue()
+        conversion_queue.add_files(_make_files(folder, size))
+        start = time.perf_counter()
+        for _ in range(calls):
+            conversion_queue.get_statistics()
+        results[str(size)] = (time.perf_counter() - start) / calls * 1e6
+    return results
+
+
+def bench_streaming(line_counts: List[int], folder: Path, converter: DoclingConverter,
+                    run_params: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Cost of moving docling output lines into the console buffer."""
+    files = _make_files(folder, 1)
+    buffer = OutputBuffer(max_chars=2_000_000)
+
+    def on_output(job_id: str, text: str):
+        buffer.write(text)
+        if len(buffer) > 1_000_000:
+            buffer.drain()
+
+    # Baseline: the same conversion without the extra lines
+    _set_stub()
+    baseline = _run_queue(files, converter, run_params, on_output=on_output)
+
+    results = {}
+    for lines in line_counts:
+        _set_stub(line_count=lines)
+        run = _run_queue(files, converter, run_params, on_output=on_output)
+        extra_seconds = max(1e-9, run['seconds'] - baseline['seconds'])
+        extra_cpu = max(0.0, run['parent_cpu_seconds'] - baseline['parent_cpu_seconds'])
+        results[str(lines)] = {
+            'lines_per_second': lines / extra_seconds,
+            'parent_cpu_us_per_line': extra_cpu / lines * 1e6,
+        }
+        buffer.clear()
+    return results
+
+
+def _stub_startup_ms(stub: str, folder: Path, output_dir: str, runs: int = 10) -> float:
+    """Milliseconds to run the stub directly (process start-up, no orchestration)."""
+    _set_stub()
+    files = _make_files(folder, 1)
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run([stub, files[0], "--to", "md", "--output", output_dir],
+                       stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def bench_end_to_end(sizes: List[int], worker_counts: List[int], batch_size: int, folder: Path,
+                     converter: DoclingConverter, run_params: Dict[str, Any],
+                     stub_ms: float) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Items per second through the runner with an instant stub."""
+    _set_stub()
+    results = {}
+    for workers in worker_counts:
+        per_size = {}
+        for size in sizes:
+            run = _run_queue(_make_files(folder, size), converter, run_params,
+                             workers=workers, batch_size=batch_size)
+            calls = -(-size // batch_size)
+            per_call_ms = run['seconds'] * min(workers, calls) / calls * 1000
+            per_size[str(size)] = {
+                'items_per_second': size / run['seconds'],
+                'overhead_ms_per_call': per_call_ms - stub_ms,
+                'parent_cpu_ms_per_item': run['parent_cpu_seconds'] / size * 1000,
+            }
+        results[f"workers={workers}"] = per_size
+    return results
+
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    """Flatten nested result dicts into dotted keys."""
+    if isinstance(data, dict):
+        flat = {}
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    if isinstance(data, (int, float)):
+        return {prefix: float(data)}
+    return {}
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]):
+    """Print each metric of two result files side by side."""
+    old = _flatten(previous.get('results', {}))
+    new = _flatten(current.get('results', {}))
+    print(f"\n{'metric':<60} {'previous':>12} {'current':>12} {'change':>8}")
+    for key in sorted(new):
+        if key not in old:
+            continue
+        change = f"{(new[key] - old[key]) / old[key] * 100:+.1f}%" if old[key] else "n/a"
+        print(f"{key:<60} {old[key]:>12.2f} {new[key]:>12.2f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000],
+                        help="Queue sizes for the enqueue and statistics benchmarks")
+    parser.add_argument('--e2e-sizes', type=int, nargs='+', default=[10, 100, 1000],
+                        help="Queue sizes for the end-to-end benchmark (one process per call)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4],
+                        help="Worker counts for the end-to-end benchmark")
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help="Files per stub call in the end-to-end benchmark")
+    parser.add_argument('--lines', type=int, nargs='+', default=[10000, 100000],
+                        help="Output line counts for the streaming benchmark")
+    parser.add_argument('--output', help="Result file (default: bench_orchestration_<time>.json)")
+    parser.add_argument('--compare', help="Earlier result file to compare with")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        inputs = tmp_path / "inputs"
+        inputs.mkdir()
+        output_dir = str(tmp_path / "output")
+
+        converter = DoclingConverter()
+        converter.docling_path = make_executable(tmp)
+        params = params_from_config(Config(str(tmp_path / "profile.json")))
+        params['output_dir'] = output_dir
+        run_params = conversion_kwargs(params, None)
+        run_params['engine'] = 'cli'
+
+        results['enqueue_items_per_second'] = bench_enqueue(sorted(args.sizes), inputs)
+        print("enqueue (items/s):      " + ", ".join(
+            f"{size}: {value:,.0f}" for size, value in results['enqueue_items_per_second'].items()))
+
+        results['statistics_us_per_call'] = bench_statistics(sorted(args.sizes), inputs)
+        print("get_statistics (µs):    " + ", ".join(
+            f"{size}: {value:.2f}" for size, value in results['statistics_us_per_call'].items()))
+
+        results['streaming'] = bench_streaming(args.lines, inputs, converter, run_params)
+        for lines, value in results['streaming'].items():
+            print(f"streaming {lines} lines:  {value['lines_per_second']:,.0f} lines/s, "
+                  f"{value['parent_cpu_us_per_line']:.2f} µs parent CPU per line")
+
+        stub_ms = _stub_startup_ms(converter.docling_path, inputs, output_dir)
+        results['stub_startup_ms'] = stub_ms
+        print(f"stub start-up:          {stub_ms:.1f} ms per call")
+
+        results['end_to_end'] = bench_end_to_end(sorted(args.e2e_sizes), args.workers,
+                                                 max(1, args.batch_size), inputs,
+                                                 converter, run_params, stub_ms)
+        for workers, per_size in results['end_to_end'].items():
+            for size, value in per_size.items():
+                print(f"end-to-end {workers:<10} {size:>7} items: "
+                      f"{value['items_per_second']:8.1f} items/s, "
+                      f"{value['overhead_ms_per_call']:6.1f} ms overhead per call, "
+                      f"{value['parent_cpu_ms_per_item']:.2f} ms parent CPU per item")
+        converter.shutdown()
+
+    document = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    output = args.output or f"bench_orchestration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), document)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark ConversionQueue operations as the queue grows.
+
+Times the per-call cost of the operations the runner and UI use on every
+job (lookup, status change, next pending, statistics, removal) at several
+queue sizes. With the indexed queue the per-call cost stays flat.
+``--backend sqlite`` runs the same operations on SQLiteConversionQueue.
+
+Usage:
+    python benchmarks/bench_queue.py [--sizes 1000 10000 100000] [--backend memory|sqlite]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.queue import ConversionQueue, QueueItemStatus  # noqa: E402
+from core.queue_store import SQLiteConversionQueue  # noqa: E402
+
+
+def _per_call_us(fn, calls: int) -> float:
+    """Run fn(i) for i in range(calls) and return microseconds per call."""
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def bench(size: int, folder: Path, backend: str = "memory", calls: int = 2000) -> dict:
+    """Fill a queue with ``size`` items and time each operation."""
+    files = []
+    for i in range(size):
+        path = folder / f"doc_{i}.pdf"
+        if not path.exists():
+            path.touch()
+        files.append(str(path))
+
+    queue = SQLiteConversionQueue() if backend == "sqlite" else ConversionQueue()
+    start = time.perf_counter()
+    queue.add_files(files)
+    results = {'add': (time.perf_counter() - start) / size * 1e6}
+
+    rng = random.Random(size)
+    ids = queue.item_ids()
+    sample = [rng.choice(ids) for _ in range(calls)]
+
+    results['get_item'] = _per_call_us(lambda i: queue.get_item(sample[i]), calls)
+    results['next_pending'] = _per_call_us(lambda i: queue.get_next_pending(), calls)
+
+    # Same cycle the runner drives: take the next pending item, finish it
+    def process(_):
+        item = queue.get_next_pending()
+        queue.update_status(item.id, QueueItemStatus.PROCESSING)
+        queue.update_status(item.id, QueueItemStatus.COMPLETED)
+    results['process'] = _per_call_us(process, min(calls, size // 2))
+
+    results['statistics'] = _per_call_us(lambda i: queue.get_statistics(), calls)
+
+    pending = [item.id for item in queue.get_pending_items(limit=calls)]
+    results['remove'] = _per_call_us(lambda i: queue.remove_item(pending[i]), len(pending))
+    queue.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--backend', choices=["memory", "sqlite"], default="memory")
+    args = parser.parse_args()
+
+    columns = ['add', 'get_item', 'next_pending', 'process', 'statistics', 'remove']
+    print(f"{'items':>8}  " + "  ".join(f"{name:>12}" for name in columns) + "   (µs per call)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sorted(args.sizes):
+            results = bench(size, Path(tmp), args.backend)
+            print(f"{size:>8}  " + "  ".join(f"{results[name]:>12.2f}" for name in columns))
+
+
+if __name__ == '__main__':
+    main()
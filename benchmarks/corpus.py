@@ -0,0 +1,545 @@
+"""
+Generate a reproducible document corpus for the end-to-end benchmark.
+
+Everything is generated locally from a seed, so every machine converts
+the same documents:
+
+    born-digital  multi-page text PDFs (headings and paragraphs)
+    tables        PDFs with ruled tables, plus tables in DOCX, PPTX and HTML
+    multilingual  German, French, Spanish and Portuguese PDFs; Greek,
+                  Cyrillic, CJK and Arabic text in DOCX and HTML
+    scanned       page images (PNG) and image-only PDFs that need OCR
+                  (requires Pillow; skipped without it)
+    office        DOCX reports and PPTX slide decks
+    html          HTML articles
+
+PDFs and Office files are written directly (no extra libraries needed).
+A ``corpus.json`` manifest lists each file with its category and page count.
+
+Usage:
+    python benchmarks/corpus.py OUTPUT_DIR [--seed 0] [--scale 1]
+"""
+
+import argparse
+import html
+import json
+import random
+import sys
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+MANIFEST_NAME = "corpus.json"
+
+_WORDS = (
+    "document conversion pipeline layout model table cell page section report analysis "
+    "result method data figure value quarterly revenue growth market region customer "
+    "product service process quality system network performance measurement sample "
+    "annual summary overview introduction conclusion appendix reference parameter"
+).split()
+
+# Latin-1 text, which the PDF base fonts can show
+_LATIN_TEXT = {
+    'de': "Die Qualität der Übersetzung hängt von der Größe des Wörterbuchs ab. "
+          "Für die Prüfung müssen alle Änderungen schriftlich eingereicht werden.",
+    'fr': "Le système a été conçu pour traiter des documents très variés. "
+          "Les résultats présentés ci-dessous sont préliminaires et sujets à révision.",
+    'es': "El análisis se realizó durante el año pasado en varias regiones. "
+          "Los niños y las niñas participaron en la evaluación de la información.",
+    'pt': "A avaliação das condições econômicas não é simples nem rápida. "
+          "As informações foram coletadas em diversas regiões do país.",
+}
+
+# Other scripts, for formats that carry Unicode text
+_UNICODE_TEXT = {
+    'el': "Η ανάλυση των εγγράφων γίνεται αυτόματα από το σύστημα μετατροπής.",
+    'ru': "Система преобразования документов обрабатывает таблицы и изображения.",
+    'zh': "文档转换系统可以自动识别表格、标题和段落。",
+    'ja': "この文書には表と見出しと段落が含まれています。",
+    'ar': "يقوم النظام بتحويل المستندات والجداول إلى نص منظم.",
+}
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, sentences: int = 4) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+
+def _table_rows(rng: random.Random, rows: int, columns: int) -> List[List[str]]:
+    header = ["Region"] + [f"Q{i}" for i in range(1, columns)]
+    body = [[f"{rng.choice(_WORDS).title()} {row + 1}"]
+            + [f"{rng.randint(100, 99999):,}" for _ in range(columns - 1)]
+            for row in range(rows)]
+    return [header] + body
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    """Split text into lines of at most ``width`` characters."""
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+# PDF
+
+class _PdfPage:
+    """Content stream of one PDF page (A4, Helvetica)."""
+
+    WIDTH, HEIGHT = 595, 842
+
+    def __init__(self):
+        self.ops: List[str] = []
+
+    def text(self, x: float, y: float, text: str, size: float = 11, bold: bool = False):
+        font = "F2" if bold else "F1"
+        self.ops.append(f"BT /{font} {size} Tf {x:.1f} {y:.1f} Td ({_pdf_escape(text)}) Tj ET")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float):
+        self.ops.append(f"{x1:.1f} {y1:.1f} m {x2:.1f} {y2:.1f} l S")
+
+    def table(self, x: float, y: float, rows: List[List[str]], widths: Sequence[float],
+              row_height: float = 18) -> float:
+        """Draw a ruled table with its top-left corner at (x, y); returns the bottom y."""
+        total_width = sum(widths)
+        bottom = y - row_height * len(rows)
+        for index in range(len(rows) + 1):
+            self.line(x, y - index * row_height, x + total_width, y - index * row_height)
+        column_x = x
+        for width in (*widths, 0):
+            self.line(column_x, y, column_x, bottom)
+            column_x += width
+        for index, row in enumerate(rows):
+            column_x = x
+            for cell, width in zip(row, widths):
+                self.text(column_x + 4, y - (index + 1) * row_height + 5, cell,
+                          size=9, bold=index == 0)
+                column_x += width
+        return bottom
+
+
+def _pdf_escape(text: str) -> str:
+    data = text.encode('latin-1', errors='replace').decode('latin-1')
+    return data.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Path, pages: List[_PdfPage]):
+    """Write pages as a PDF using the base Helvetica fonts (WinAnsi encoding)."""
+    objects: List[bytes] = []
+    page_ids = [5 + 2 * index for index in range(len(pages))]
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    for name in ("Helvetica", "Helvetica-Bold"):
+        objects.append(f"<< /Type /Font /Subtype /Type1 /BaseFont /{name} "
+                       f"/Encoding /WinAnsiEncoding >>".encode())
+    for page_id, page in zip(page_ids, pages):
+        content = "\n".join(page.ops).encode('latin-1')
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page.WIDTH} {page.HEIGHT}] "
+                       f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+                       f"/Contents {page_id + 1} 0 R >>".encode())
+        objects.append(f"<< /Length {len(content)} >>\nstream\n".encode() + content
+                       + b"\nendstream")
+
+    data = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        data += f"{offset:010d} 00000 n \n".encode()
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(bytes(data))
+
+
+def _text_pages(rng: random.Random, title: str, page_count: int,
+                paragraphs: Optional[List[str]] = None) -> List[_PdfPage]:
+    """Pages of headings and wrapped paragraphs."""
+    pages = []
+    for number in range(page_count):
+        page = _PdfPage()
+        y = page.HEIGHT - 72
+        if number == 0:
+            page.text(72, y, title, size=18, bold=True)
+            y -= 36
+        section = 1
+        while y > 140:
+            page.text(72, y, f"{number + 1}.{section} {_sentence(rng, 4)[:-1]}", size=13, bold=True)
+            y -= 22
+            text = paragraphs[(number + section) % len(paragraphs)] if paragraphs else _paragraph(rng)
+            for line in _wrap(text, 80):
+                page.text(72, y, line)
+                y -= 15
+            y -= 12
+            section += 1
+        page.text(page.WIDTH / 2 - 10, 40, str(number + 1), size=9)
+        pages.append(page)
+    return pages
+
+
+def _table_pages(rng: random.Random, page_count: int) -> List[_PdfPage]:
+    """Pages with a caption, a paragraph and a ruled table each."""
+    pages = []
+    for number in range(page_count):
+        page = _PdfPage()
+        page.text(72, 770, f"Table {number + 1}: {_sentence(rng, 5)[:-1]}", size=13, bold=True)
+        y = 745
+        for line in _wrap(_paragraph(rng, 2), 80):
+            page.text(72, y, line)
+            y -= 15
+        columns = rng.randint(3, 6)
+        rows = _table_rows(rng, rng.randint(8, 25), columns)
+        widths = [110] + [(451 - 110) / (columns - 1)] * (columns - 1)
+        page.table(72, y - 15, rows, widths)
+        pages.append(page)
+    return pages
+
+
+# Office Open XML
+
+_CONTENT_TYPES_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+)
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_OFFICE_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+def _rels(targets: Sequence[Tuple[str, str]]) -> str:
+    """Relationship part for (type suffix, target) pairs, numbered rId1..."""
+    body = "".join(
+        f'<Relationship Id="rId{index}" Type="{_OFFICE_REL}/{kind}" Target="{target}"/>'
+        for index, (kind, target) in enumerate(targets, start=1)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{_REL_NS}">{body}</Relationships>'
+
+
+def _write_zip(path: Path, parts: Dict[str, str]):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+
+
+_W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _docx_paragraph(text: str, style: Optional[str] = None) -> str:
+    style_xml = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f'<w:p>{style_xml}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def _docx_table(rows: List[List[str]]) -> str:
+    grid = "".join('<w:gridCol w:w="1800"/>' for _ in rows[0])
+    body = "".join(
+        "<w:tr>" + "".join(f"<w:tc>{_docx_paragraph(cell)}</w:tc>" for cell in row) + "</w:tr>"
+        for row in rows
+    )
+    return (f'<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/>'
+            f'</w:tblPr><w:tblGrid>{grid}</w:tblGrid>{body}</w:tbl>')
+
+
+def write_docx(path: Path, blocks: List[str]):
+    """Write a DOCX from body XML blocks (see _docx_paragraph and _docx_table)."""
+    document = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document {_W_NS}><w:body>{"".join(blocks)}</w:body></w:document>')
+    _write_zip(path, {
+        "[Content_Types].xml": _CONTENT_TYPES_HEAD
+        + '<Override PartName="/word/document.xml" ContentType="application/'
+          'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>',
+        "_rels/.rels": _rels([("officeDocument", "word/document.xml")]),
+        "word/document.xml": document,
+    })
+
+
+_P_NS = ('xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+         f'xmlns:r="{_OFFICE_REL}" '
+         'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"')
+_EMPTY_TREE = ('<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+               '<p:grpSpPr/>')
+
+
+def _pptx_text_shape(shape_id: int, name: str, y: int, height: int, paragraphs: List[str],
+                     title: bool = False) -> str:
+    placeholder = '<p:ph type="title"/>' if title else ""
+    text = "".join(f'<a:p><a:r><a:rPr lang="en-US"/><a:t>{escape(p)}</a:t></a:r></a:p>'
+                   for p in paragraphs)
+    box = "" if title else ' txBox="1"'
+    return (f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"/><p:cNvSpPr{box}/>'
+            f'<p:nvPr>{placeholder}</p:nvPr></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="457200" y="{y}"/><a:ext cx="8229600" cy="{height}"/></a:xfrm>'
+            f'</p:spPr><p:txBody><a:bodyPr/><a:lstStyle/>{text}</p:txBody></p:sp>')
+
+
+def _pptx_table(shape_id: int, y: int, rows: List[List[str]]) -> str:
+    width = 8229600 // len(rows[0])
+    grid = "".join(f'<a:gridCol w="{width}"/>' for _ in rows[0])
+    body = "".join(
+        '<a:tr h="300000">' + "".join(
+            f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:r><a:t>{escape(cell)}</a:t></a:r>'
+            f'</a:p></a:txBody><a:tcPr/></a:tc>' for cell in row) + '</a:tr>'
+        for row in rows
+    )
+    return (f'<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="{shape_id}" name="Table {shape_id}"/>'
+            f'<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr><p:nvPr/>'
+            f'</p:nvGraphicFramePr><p:xfrm><a:off x="457200" y="{y}"/>'
+            f'<a:ext cx="8229600" cy="{300000 * len(rows)}"/></p:xfrm><a:graphic>'
+            f'<a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+            f'<a:tbl><a:tblPr firstRow="1"/><a:tblGrid>{grid}</a:tblGrid>{body}</a:tbl>'
+            f'</a:graphicData></a:graphic></p:graphicFrame>')
+
+
+def write_pptx(path: Path, slides: List[Tuple[str, List[str], Optional[List[List[str]]]]]):
+    """Write a PPTX of (title, bullet paragraphs, optional table rows) slides."""
+    types = _CONTENT_TYPES_HEAD + (
+        '<Override PartName="/ppt/presentation.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"/>'
+        '<Override PartName="/ppt/slideMasters/slideMaster1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.presentationml.slideMaster+xml"/>'
+        '<Override PartName="/ppt/slideLayouts/slideLayout1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.presentationml.slideLayout+xml"/>'
+    )
+    parts: Dict[str, str] = {
+        "_rels/.rels": _rels([("officeDocument", "ppt/presentation.xml")]),
+        "ppt/slideMasters/slideMaster1.xml": (
+            f'<p:sldMaster {_P_NS}><p:cSld><p:spTree>{_EMPTY_TREE}</p:spTree></p:cSld>'
+            '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" accent2="accent2" '
+            'accent3="accent3" accent4="accent4" accent5="accent5" accent6="accent6" hlink="hlink" '
+            'folHlink="folHlink"/><p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/>'
+            '</p:sldLayoutIdLst></p:sldMaster>'),
+        "ppt/slideMasters/_rels/slideMaster1.xml.rels": _rels([("slideLayout",
+                                                                "../slideLayouts/slideLayout1.xml")]),
+        "ppt/slideLayouts/slideLayout1.xml": (
+            f'<p:sldLayout {_P_NS}><p:cSld><p:spTree>{_EMPTY_TREE}</p:spTree></p:cSld>'
+            '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>'),
+        "ppt/slideLayouts/_rels/slideLayout1.xml.rels": _rels([("slideMaster",
+                                                                "../slideMasters/slideMaster1.xml")]),
+    }
+
+    slide_ids = []
+    for number, (title, bullets, table) in enumerate(slides, start=1):
+        shapes = _pptx_text_shape(2, "Title 1", 274638, 1143000, [title], title=True)
+        shapes += _pptx_text_shape(3, "Text 2", 1600200, 2000000, bullets)
+        if table:
+            shapes += _pptx_table(4, 3700000, table)
+        parts[f"ppt/slides/slide{number}.xml"] = (
+            f'<p:sld {_P_NS}><p:cSld><p:spTree>{_EMPTY_TREE}{shapes}</p:spTree></p:cSld>'
+            '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>')
+        parts[f"ppt/slides/_rels/slide{number}.xml.rels"] = _rels([("slideLayout",
+                                                                   "../slideLayouts/slideLayout1.xml")])
+        types += (f'<Override PartName="/ppt/slides/slide{number}.xml" ContentType="application/'
+                  'vnd.openxmlformats-officedocument.presentationml.slide+xml"/>')
+        slide_ids.append(f'<p:sldId id="{255 + number}" r:id="rId{number + 1}"/>')
+
+    parts["[Content_Types].xml"] = types + "</Types>"
+    parts["ppt/presentation.xml"] = (
+        f'<p:presentation {_P_NS}><p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/>'
+        f'</p:sldMasterIdLst><p:sldIdLst>{"".join(slide_ids)}</p:sldIdLst>'
+        '<p:sldSz cx="9144000" cy="6858000"/><p:notesSz cx="6858000" cy="9144000"/></p:presentation>')
+    parts["ppt/_rels/presentation.xml.rels"] = _rels(
+        [("slideMaster", "slideMasters/slideMaster1.xml")]
+        + [("slide", f"slides/slide{number}.xml") for number in range(1, len(slides) + 1)]
+    )
+    _write_zip(path, parts)
+
+
+# HTML
+
+def write_html(path: Path, title: str, blocks: List[str]):
+    path.write_text(
+        f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+        f'</head>\n<body>\n<h1>{html.escape(title)}</h1>\n' + "\n".join(blocks) + "\n</body></html>\n",
+        encoding='utf-8'
+    )
+
+
+def _html_table(rows: List[List[str]]) -> str:
+    head = "".join(f"<th>{html.escape(cell)}</th>" for cell in rows[0])
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(cell)}</td>" for cell in row) + "</tr>"
+                   for row in rows[1:])
+    return f"<table border=\"1\"><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+# Scanned pages
+
+def _load_font(size: int):
+    from PIL import ImageFont
+    for name in ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def write_scans(png_path: Path, pdf_path: Path, rng: random.Random, page_count: int):
+    """
+    Render text pages to images: the first as PNG, all as an image-only PDF.
+
+    Pages are slightly rotated and blurred, like a scan.
+
+    Raises:
+        ImportError: If Pillow is not installed
+    """
+    from PIL import Image, ImageDraw, ImageFilter
+
+    font = _load_font(26)
+    title_font = _load_font(40)
+    images = []
+    for number in range(page_count):
+        image = Image.new("L", (1240, 1754), 255)  # A4 at 150 dpi
+        draw = ImageDraw.Draw(image)
+        y = 140
+        draw.text((140, y), f"Scanned page {number + 1}", font=title_font, fill=0)
+        y += 90
+        while y < 1400:
+            for line in _wrap(_paragraph(rng, 3), 70):
+                draw.text((140, y), line, font=font, fill=20)
+                y += 38
+            y += 30
+        rows = _table_rows(rng, 5, 4)
+        for row in rows:
+            for column, cell in enumerate(row):
+                draw.text((140 + column * 240, y), cell, font=font, fill=20)
+            y += 40
+        image = image.rotate(rng.uniform(-0.8, 0.8), fillcolor=255, expand=False)
+        images.append(image.filter(ImageFilter.GaussianBlur(0.6)))
+
+    images[0].save(png_path)
+    images[0].save(pdf_path, save_all=True, append_images=images[1:], resolution=150)
+
+
+# Corpus
+
+def generate_corpus(directory: str, seed: int = 0, scale: int = 1) -> Dict[str, Any]:
+    """
+    Generate the benchmark corpus and its manifest.
+
+    Args:
+        directory: Output directory (created if missing)
+        seed: Random seed; the same seed produces the same documents
+        scale: Multiplies page counts (1 = a few hundred pages in total)
+
+    Returns:
+        The manifest (also written to ``corpus.json``)
+    """
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    documents: List[Dict[str, Any]] = []
+
+    def add(name: str, category: str, pages: Optional[int]):
+        documents.append({'path': name, 'category': category,
+                          'format': Path(name).suffix[1:], 'pages': pages})
+
+    # Born-digital PDFs
+    for pages in (2, 10, 40):
+        pages *= scale
+        name = f"born_digital_{pages}p.pdf"
+        write_pdf(root / name, _text_pages(rng, f"Technical report ({pages} pages)", pages))
+        add(name, "born-digital", pages)
+
+    # Tables
+    pages = 8 * scale
+    write_pdf(root / "tables.pdf", _table_pages(rng, pages))
+    add("tables.pdf", "tables", pages)
+
+    # Multilingual PDFs (Latin-1 scripts)
+    for language, text in _LATIN_TEXT.items():
+        pages = 3 * scale
+        name = f"multilingual_{language}.pdf"
+        write_pdf(root / name, _text_pages(rng, f"Dokument / document ({language})", pages,
+                                           paragraphs=[text * 3, _paragraph(rng)]))
+        add(name, "multilingual", pages)
+
+    # Scanned pages
+    try:
+        write_scans(root / "scanned_page.png", root / "scanned.pdf", rng, 4 * scale)
+        add("scanned_page.png", "scanned", 1)
+        add("scanned.pdf", "scanned", 4 * scale)
+    except ImportError:
+        print("Pillow is not installed; skipping scanned documents", file=sys.stderr)
+
+    # Office documents
+    blocks = [_docx_paragraph("Quarterly report", "Title")]
+    for section in range(1, 6 * scale + 1):
+        blocks.append(_docx_paragraph(f"Section {section}", "Heading1"))
+        blocks.extend(_docx_paragraph(_paragraph(rng)) for _ in range(3))
+        if section % 2 == 0:
+            blocks.append(_docx_table(_table_rows(rng, 6, 5)))
+    write_docx(root / "report.docx", blocks)
+    add("report.docx", "office", None)
+
+    blocks = [_docx_paragraph("Multilingual sample", "Title")]
+    for language, text in {**_LATIN_TEXT, **_UNICODE_TEXT}.items():
+        blocks.append(_docx_paragraph(language, "Heading1"))
+        blocks.append(_docx_paragraph(text))
+    write_docx(root / "multilingual.docx", blocks)
+    add("multilingual.docx", "multilingual", None)
+
+    slides = []
+    for number in range(1, 8 * scale + 1):
+        table = _table_rows(rng, 4, 4) if number % 3 == 0 else None
+        slides.append((f"Slide {number}: {_sentence(rng, 4)[:-1]}",
+                       [_sentence(rng) for _ in range(4)], table))
+    write_pptx(root / "slides.pptx", slides)
+    add("slides.pptx", "office", len(slides))
+
+    # HTML
+    blocks = []
+    for section in range(1, 5 * scale + 1):
+        blocks.append(f"<h2>Section {section}</h2>")
+        blocks.extend(f"<p>{html.escape(_paragraph(rng))}</p>" for _ in range(3))
+        blocks.append(_html_table(_table_rows(rng, 10, 5)))
+    write_html(root / "article.html", "Article with tables", blocks)
+    add("article.html", "html", None)
+
+    blocks = [f'<h2>{language}</h2><p lang="{language}">{html.escape(text)}</p>'
+              for language, text in {**_LATIN_TEXT, **_UNICODE_TEXT}.items()]
+    write_html(root / "multilingual.html", "Multilingual article", blocks)
+    add("multilingual.html", "multilingual", None)
+
+    manifest = {'seed': seed, 'scale': scale, 'documents': documents}
+    with open(root / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_corpus(directory: str) -> Dict[str, Any]:
+    """Read the manifest of a generated corpus."""
+    with open(Path(directory) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('directory', help="Output directory")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scale', type=int, default=1, help="Page count multiplier")
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.directory, args.seed, max(1, args.scale))
+    pages = sum(doc['pages'] or 0 for doc in manifest['documents'])
+    print(f"Wrote {len(manifest['documents'])} documents ({pages} pages) to {args.directory}")
+
+
+if __name__ == '__main__':
+    main()
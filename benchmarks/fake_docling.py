@@ -0,0 +1,104 @@
+"""
+Stand-in for the ``docling`` CLI, for benchmarking the orchestration layer.
+
+Accepts the command lines DoclingConverter builds, writes a small output
+file per input and behaves as configured through environment variables
+(the converter's child processes inherit them):
+
+    FAKE_DOCLING_SECONDS     Seconds to spend per input file (default 0)
+    FAKE_DOCLING_LINES       Output lines per second while working (default 0)
+    FAKE_DOCLING_LINE_COUNT  Extra lines printed at once before exiting (default 0)
+    FAKE_DOCLING_EXIT_CODE   Exit code (default 0)
+    FAKE_DOCLING_FAIL_MATCH  Exit with 1 and skip outputs of inputs whose
+                             path contains this text
+
+Use make_executable() to get a path DoclingConverter.docling_path can run.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.outputs import expected_output_path  # noqa: E402
+
+
+def make_executable(directory: str) -> str:
+    """
+    Write a launcher that runs this stub with the current interpreter.
+
+    Args:
+        directory: Directory for the launcher
+
+    Returns:
+        Path of the launcher, for DoclingConverter.docling_path
+    """
+    script = Path(__file__).resolve()
+    if sys.platform == "win32":
+        path = Path(directory) / "docling.cmd"
+        path.write_text(f'@"{sys.executable}" "{script}" %*\r\n')
+    else:
+        path = Path(directory) / "docling"
+        path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+        path.chmod(0o755)
+    return str(path)
+
+
+def _option(args, name: str, default: str) -> str:
+    """Get the value following an option, or a default."""
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return default
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    inputs = []
+    for arg in args:
+        if arg.startswith("-"):
+            break
+        inputs.append(arg)
+    output_format = _option(args, "--to", "md")
+    output_dir = _option(args, "--output", ".")
+
+    seconds = float(os.environ.get("FAKE_DOCLING_SECONDS", "0"))
+    lines_per_second = float(os.environ.get("FAKE_DOCLING_LINES", "0"))
+    line_count = int(os.environ.get("FAKE_DOCLING_LINE_COUNT", "0"))
+    exit_code = int(os.environ.get("FAKE_DOCLING_EXIT_CODE", "0"))
+    fail_match = os.environ.get("FAKE_DOCLING_FAIL_MATCH", "")
+
+    os.makedirs(output_dir, exist_ok=True)
+    line_number = 0
+    for input_path in inputs:
+        print(f"INFO:docling.document_converter:Going to convert document batch... {input_path}",
+              flush=True)
+
+        deadline = time.monotonic() + seconds
+        if lines_per_second > 0:
+            interval = 1.0 / lines_per_second
+            next_line = time.monotonic()
+            while next_line < deadline:
+                time.sleep(max(0.0, next_line - time.monotonic()))
+                line_number += 1
+                print(f"DEBUG:docling.pipeline:Finished converting page batch time={line_number}",
+                      flush=True)
+                next_line += interval
+        time.sleep(max(0.0, deadline - time.monotonic()))
+
+        if fail_match and fail_match in input_path:
+            exit_code = exit_code or 1
+            continue
+        expected_output_path(output_dir, input_path, output_format).write_text(f"# {input_path}\n")
+
+    if line_count:
+        sys.stdout.write("".join(f"INFO:docling:output line {i}\n" for i in range(line_count)))
+    print("INFO:docling.document_converter:Finished converting document.", flush=True)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,22 @@
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class Config:
     """Application configuration manager."""
 
-    def __init__(self):
+    def __init__(self, config_file: Optional[str] = None):
+        """
+        Initialize Config.
+
+        Args:
+            config_file: Settings file to use instead of the per-user
+                         config.json (e.g. a profile for headless runs)
+        """
         self.config_dir = self._get_config_dir()
-        self.config_file = self.config_dir / "config.json"
+        self.config_file = Path(config_file) if config_file else self.config_dir / "config.json"
         self.config = self._load_config()
 
     def _get_config_dir(self) -> Path:
@@ -34,12 +41,74 @@ class Config:
                 "autoOpenOutputFolder": False,
                 "rememberWindowGeometry": True,
                 "enableLogging": False,
-                "logDirectory": str(Path.home() / "Documents" / "docling_logs")
+                "logDirectory": str(Path.home() / "Documents" / "docling_logs"),
+                "logMaxSizeMB": 50,
+                "logCompressRotated": True,
+                "itemLogs": True,
+                "itemLogDirectory": ""
             },
             "processing": {
                 "mode": "online",
                 "artifactsPath": str(Path.home() / ".cache" / "docling"),
-                "doclingCliPath": "auto"
+                "doclingCliPath": "auto",
+                "engine": "cli",
+                "maxWorkers": 1,
+                "batchSize": 1,
+                "batchMaxMB": 256,
+                "ordering": "fifo"
+            },
+            "sharding": {
+                "enabled": False,
+                "minPages": 200,
+                "pagesPerShard": 50
+            },
+            "cache": {
+                "enabled": False,
+                "directory": str(Path.home() / ".cache" / "docling_gui"),
+                "maxSizeMB": 2048
+            },
+            "scan": {
+                "includeGlobs": [],
+                "excludeGlobs": [],
+                "minSizeKB": 0,
+                "maxSizeMB": 0,
+                "symlinks": "files",
+                "workers": 1
+            },
+            "dedupe": {
+                "enabled": True,
+                "hashWorkers": 4
+            },
+            "queue": {
+                "backend": "memory",
+                "path": str(self.config_dir / "queue.sqlite3"),
+                "cacheItems": 2000
+            },
+            "journal": {
+                "enabled": True,
+                "path": str(self.config_dir / "queue_journal.jsonl"),
+                "compactMinRecords": 10000
+            },
+            "sync": {
+                "enabled": False,
+                "manifestPath": str(self.config_dir / "sync_manifest.json"),
+                "pruneMissing": False
+            },
+            "resources": {
+                "admissionControl": False,
+                "cpuSlots": 0,
+                "memoryBudgetMB": 0,
+                "lowPriority": False
+            },
+            "console": {
+                "maxLines": 10000,
+                "historyDirectory": ""
+            },
+            "service": {
+                "host": "127.0.0.1",
+                "port": 8765,
+                "uploadDir": "",
+                "jobTtl": 3600
             },
             "defaults": {
                 "pipeline": "standard",
@@ -74,6 +143,7 @@ class Config:
             },
             "models": {
                 "pipelines": ["standard", "vlm", "asr"],
+                "engines": ["cli", "inprocess"],
                 "ocr_engines": ["auto", "easyocr", "tesseract", "tesserocr", "rapidocr", "ocrmac"],
                 "ocr_languages": {
                     "English": "eng",
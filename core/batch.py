@@ -0,0 +1,433 @@
+"""
+Headless batch conversion.
+
+Runs the same queue, runner and converter as the GUI without importing
+customtkinter or tkinterdnd2, for servers, cron jobs and containers::
+
+    python -m core.batch ~/inbox/*.pdf ~/archive -o ~/converted
+    python main.py --headless ~/archive --config profile.json --sync
+
+Settings come from the GUI's config file (or a profile in the same
+schema passed with ``--config``); command-line options override them.
+The exit code is 0 when every file converted, 1 when any failed or was
+cancelled, 2 for invalid arguments, and 130 when interrupted with Ctrl-C.
+"""
+
+import argparse
+import os
+import queue
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from core.cache import ResultCache
+from core.converter import DoclingConverter
+from core.dedupe import collapse_duplicates
+from core.item_logs import ItemLogStore
+from core.ordering import ORDERING_POLICIES, estimate_seconds
+from core.outputs import OUTPUT_EXTENSIONS
+from core.progress import format_duration
+from core.queue import (ConversionQueue, QueueItem, QueueItemStatus, SUPPORTED_EXTENSIONS,
+                        scan_supported_files)
+from core.resources import AdmissionController
+from core.queue_store import SQLiteConversionQueue
+from core.runner import QueueRunner
+from core.scanner import ScanOptions
+from core.sync import SyncManifest, options_hash, output_paths
+
+
+def params_from_config(config: Config) -> Dict[str, Any]:
+    """
+    Get conversion parameters from config, as the sidebar would show them.
+
+    Args:
+        config: Application config or settings profile
+
+    Returns:
+        Dictionary in the format of Sidebar.get_conversion_params
+    """
+    pipeline = config.get("defaults", "pipeline", default="standard")
+    ocr_lang = config.get("defaults", "ocrLanguages", default="eng")
+    pdf_password = config.get("defaults", "pdfPassword", default="")
+    return {
+        'output_format': config.get("general", "defaultOutputFormat", default="md"),
+        'output_dir': config.get("general", "defaultOutputDir",
+                                 default=str(Path.home() / "Documents" / "docling_output")),
+        'processing_mode': config.get("processing", "mode", default="online"),
+        'engine': config.get("processing", "engine", default="cli"),
+        'pipeline': pipeline,
+        'ocr_enabled': config.get("defaults", "ocrEnabled", default=True),
+        'force_ocr': config.get("defaults", "forceOcr", default=False),
+        'ocr_lang': ocr_lang if ocr_lang and ocr_lang.strip() else None,
+        'ocr_engine': config.get("defaults", "ocrEngine", default="auto"),
+        'vlm_model': config.get("defaults", "vlmModel", default="smoldocling") if pipeline == "vlm" else None,
+        'image_export_mode': config.get("defaults", "imageExportMode", default="embedded"),
+        'pdf_backend': config.get("defaults", "pdfBackend", default="dlparse_v4"),
+        'pdf_password': pdf_password if pdf_password and pdf_password.strip() else None,
+        'table_mode': config.get("defaults", "tableMode", default="accurate"),
+        'verbose': config.get("defaults", "verbose", default=0),
+        'enrich_formula': config.get("defaults", "enrichFormula", default=False),
+        'enrich_picture_classes': config.get("defaults", "enrichPictureClasses", default=False),
+        'enrich_picture_description': config.get("defaults", "enrichPictureDescription", default=False),
+        'extract_tables': config.get("defaults", "extractTables", default=True),
+        'enrich_code': config.get("defaults", "enrichCode", default=False),
+        'show_layout': config.get("defaults", "showLayout", default=False),
+        'debug_visualize_layout': config.get("defaults", "debugVisualizeLayout", default=False),
+        'debug_visualize_cells': config.get("defaults", "debugVisualizeCells", default=False),
+        'debug_visualize_ocr': config.get("defaults", "debugVisualizeOcr", default=False),
+        'debug_visualize_tables': config.get("defaults", "debugVisualizeTables", default=False),
+    }
+
+
+def conversion_kwargs(params: Dict[str, Any], artifacts_path: Optional[str]) -> Dict[str, Any]:
+    """Map sidebar-style parameters onto DoclingConverter.convert keyword arguments."""
+    return dict(
+        output_format=params['output_format'],
+        output_dir=params['output_dir'],
+        processing_mode=params['processing_mode'],
+        ocr_enabled=params['ocr_enabled'],
+        force_ocr=params['force_ocr'],
+        pipeline=params['pipeline'],
+        artifacts_path=artifacts_path,
+        ocr_lang=params['ocr_lang'],
+        ocr_engine=params.get('ocr_engine', 'auto'),
+        vlm_model=params['vlm_model'],
+        extract_tables=params['extract_tables'],
+        enrich_code=params['enrich_code'],
+        enrich_formula=params['enrich_formula'],
+        enrich_picture_classes=params['enrich_picture_classes'],
+        enrich_picture_description=params['enrich_picture_description'],
+        image_export_mode=params['image_export_mode'],
+        pdf_backend=params['pdf_backend'],
+        pdf_password=params['pdf_password'],
+        table_mode=params['table_mode'],
+        show_layout=params['show_layout'],
+        debug_visualize_layout=params['debug_visualize_layout'],
+        debug_visualize_cells=params['debug_visualize_cells'],
+        debug_visualize_ocr=params['debug_visualize_ocr'],
+        debug_visualize_tables=params['debug_visualize_tables'],
+        verbose=params['verbose'],
+        engine=params.get('engine', 'cli')
+    )
+
+
+def create_result_cache(config: Config) -> Optional[ResultCache]:
+    """
+    Open the result cache if enabled in config.
+
+    Raises:
+        OSError: If the cache directory cannot be created
+    """
+    if not config.get("cache", "enabled", default=False):
+        return None
+
+    cache_dir = config.get("cache", "directory",
+                           default=str(Path.home() / ".cache" / "docling_gui"))
+    max_mb = config.get("cache", "maxSizeMB", default=2048)
+    return ResultCache(cache_dir, max_mb * 1024 * 1024)
+
+
+def create_queue(config: Config, persistent: bool = True):
+    """
+    Create the conversion queue selected by ``queue.backend``.
+
+    "memory" (the default) keeps items in a ConversionQueue; "sqlite"
+    stores them in an SQLiteConversionQueue, which suits batches of
+    millions of files.
+
+    Args:
+        config: Configuration
+        persistent: Open the database at ``queue.path``, so the queue is
+            kept across sessions (False = a temporary database)
+
+    Returns:
+        ConversionQueue or SQLiteConversionQueue
+
+    Raises:
+        sqlite3.Error: If the queue database cannot be opened
+    """
+    if config.get("queue", "backend", default="memory") != "sqlite":
+        return ConversionQueue()
+
+    path = None
+    if persistent:
+        path = config.get("queue", "path", default=str(config.config_dir / "queue.sqlite3"))
+    return SQLiteConversionQueue(path, cache_items=config.get("queue", "cacheItems", default=2000))
+
+
+def create_item_log_store(config: Config) -> Optional[ItemLogStore]:
+    """
+    Create a per-item log store for this session if enabled in config.
+
+    Logs go to a timestamped folder under ``general.itemLogDirectory``
+    (default: a folder in the system temp directory).
+
+    Raises:
+        OSError: If the log directory cannot be created
+    """
+    if not config.get("general", "itemLogs", default=True):
+        return None
+
+    base = config.get("general", "itemLogDirectory", default="") \
+        or str(Path(tempfile.gettempdir()) / "docling_gui_item_logs")
+    session = datetime.now().strftime("%Y%m%d_%H%M%S") + f"_{os.getpid()}"
+    return ItemLogStore(str(Path(base) / session))
+
+
+def configure_runner(runner: QueueRunner, config: Config):
+    """Apply batching, sharding and resource settings from config to a runner."""
+    runner.batch_size = max(1, config.get("processing", "batchSize", default=1))
+    runner.batch_max_bytes = config.get("processing", "batchMaxMB", default=256) * 1024 * 1024
+    if config.get("sharding", "enabled", default=False):
+        runner.shard_pages = config.get("sharding", "pagesPerShard", default=50)
+        runner.shard_min_pages = config.get("sharding", "minPages", default=200)
+    else:
+        runner.shard_pages = 0
+
+    if config.get("resources", "admissionControl", default=False):
+        runner.admission = AdmissionController.from_config(config)
+    else:
+        runner.admission = None
+    runner.converter.low_priority = config.get("resources", "lowPriority", default=False)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Create the command-line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m core.batch",
+        description="Convert files and folders with Docling without the GUI.",
+        epilog="Exit codes: 0 every file converted, 1 a file failed or was cancelled, "
+               "2 invalid arguments, 130 interrupted (Ctrl-C)."
+    )
+    parser.add_argument("inputs", nargs="+", help="Files and folders to convert")
+    parser.add_argument("-o", "--output-dir", help="Output directory (default: from config)")
+    parser.add_argument("-f", "--format", choices=sorted(OUTPUT_EXTENSIONS),
+                        help="Output format (default: from config)")
+    parser.add_argument("-c", "--config", help="Settings profile in the config.json schema")
+    parser.add_argument("--engine", choices=["cli", "inprocess"], help="Conversion engine")
+    parser.add_argument("-w", "--workers", type=int, help="Number of concurrent conversions")
+    parser.add_argument("--order", choices=sorted(ORDERING_POLICIES),
+                        help="Processing order (default: from config)")
+    parser.add_argument("--no-recursive", action="store_true",
+                        help="Do not descend into subfolders")
+    parser.add_argument("--sync", action="store_true",
+                        help="Only convert files that are new or changed since the last sync")
+    parser.add_argument("--prune", action="store_true",
+                        help="With --sync, delete outputs whose source files were removed")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Do not print Docling's output")
+    return parser
+
+
+def _log(message: str):
+    """Print a status line."""
+    print(message, flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a headless batch conversion.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = _build_parser().parse_args(argv)
+
+    config = Config(args.config)
+    if args.config and not config.config_file.exists():
+        _log(f"Error: settings profile not found: {args.config}")
+        return 2
+
+    params = params_from_config(config)
+    if args.output_dir:
+        params['output_dir'] = args.output_dir
+    if args.format:
+        params['output_format'] = args.format
+    if args.engine:
+        params['engine'] = args.engine
+
+    try:
+        Path(params['output_dir']).mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        _log(f"Error: could not create output directory: {e}")
+        return 2
+
+    converter = DoclingConverter()
+    cli_path = config.get("processing", "doclingCliPath", default="auto")
+    if cli_path and cli_path != "auto":
+        converter.docling_path = cli_path
+    artifacts_path = None
+    if params['processing_mode'] == "offline":
+        artifacts_path = config.get("processing", "artifactsPath")
+        models_ok, missing_files = converter.check_models_downloaded(artifacts_path)
+        if not models_ok:
+            _log("Error: offline mode requires downloaded models. Missing:")
+            for missing in missing_files:
+                _log(f"  - {missing}")
+            return 2
+    run_params = conversion_kwargs(params, artifacts_path)
+
+    # Collect inputs
+    # A headless run starts from an empty queue, so a database is only temporary
+    conversion_queue = create_queue(config, persistent=False)
+    conversion_queue.deduplicate = config.get("dedupe", "enabled", default=True)
+    manifest = None
+    if args.sync or config.get("sync", "enabled", default=False):
+        manifest = SyncManifest(config.get("sync", "manifestPath",
+                                           default=str(config.config_dir / "sync_manifest.json")))
+    opts_hash = options_hash(run_params)
+
+    for input_path in args.inputs:
+        if os.path.isdir(input_path):
+            scanned = list(scan_supported_files(input_path, options=ScanOptions.from_config(
+                config, SUPPORTED_EXTENSIONS, recursive=not args.no_recursive)))
+            if manifest is not None:
+                stale = set(manifest.plan(scanned, opts_hash))
+                _log(f"Sync: {len(stale)} of {len(scanned)} file(s) in {input_path} are new or changed")
+                if args.prune or config.get("sync", "pruneMissing", default=False):
+                    try:
+                        removed = manifest.prune(input_path)
+                    except OSError as e:
+                        _log(f"Sync: could not remove an output of a deleted source file: {e}")
+                        removed = []
+                    if removed:
+                        _log(f"Sync: removed {len(removed)} output(s) of deleted source files")
+                scanned = [f for f in scanned if f.path in stale]
+            conversion_queue.add_scanned_count(scanned)
+        elif os.path.isfile(input_path):
+            files = [input_path]
+            if manifest is not None:
+                files = manifest.plan(files, opts_hash)
+            conversion_queue.add_files(files)
+        else:
+            _log(f"Skipping {input_path}: not found")
+
+    if conversion_queue.deduplicate:
+        collapse_duplicates(conversion_queue, config.get("dedupe", "hashWorkers", default=4))
+        duplicates = conversion_queue.duplicate_count
+        if duplicates:
+            _log(f"Duplicates: {duplicates} file(s) are copies of queued files and share their conversion")
+
+    if len(conversion_queue) == 0:
+        _log("Nothing to convert.")
+        if manifest is not None:
+            manifest.save()
+        conversion_queue.close()
+        return 0
+
+    # Run the queue; worker callbacks are handed to this thread via a queue
+    events: "queue.Queue" = queue.Queue()
+    workers = args.workers if args.workers else config.get("processing", "maxWorkers", default=1)
+    finished: List[Dict[str, int]] = []
+
+    def on_item_started(item: QueueItem):
+        stats = conversion_queue.get_statistics()
+        eta = runner.progress.eta_seconds()
+        suffix = f" (ETA {format_duration(eta)})" if eta is not None else ""
+        _log(f"Processing [{stats['total'] - stats['pending']}/{stats['total']}]: {item.file_path}{suffix}")
+
+    def on_item_finished(item: QueueItem):
+        if item.status == QueueItemStatus.COMPLETED:
+            _log(f"[SUCCESS] Completed: {item.filename}")
+        elif item.status == QueueItemStatus.FAILED:
+            _log(f"[FAILED] {item.filename}: {item.error_message}")
+            if item.log_path:
+                _log(f"  Log: {item.log_path}")
+
+        if manifest is not None and item.status != QueueItemStatus.CANCELLED:
+            # Duplicates collapsed onto this item share its result
+            for file_path in [item.file_path, *item.duplicate_paths]:
+                if not manifest.is_tracked(file_path):
+                    continue
+                outputs = []
+                if item.status == QueueItemStatus.COMPLETED:
+                    outputs = output_paths(file_path, run_params['output_dir'],
+                                           run_params['output_format'])
+                manifest.record(file_path, opts_hash, outputs, item.status.value,
+                                item.content_hash)
+
+    def on_output(job_id: str, text: str):
+        if args.quiet:
+            return
+        if workers > 1:
+            text = "".join(f"[{job_id}] {line}" for line in text.splitlines(keepends=True))
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    try:
+        cache = create_result_cache(config)
+    except OSError as e:
+        _log(f"Warning: result cache disabled: {e}")
+        cache = None
+
+    try:
+        item_logs = create_item_log_store(config)
+    except OSError as e:
+        _log(f"Warning: per-item logs disabled: {e}")
+        item_logs = None
+
+    ordering = args.order or config.get("processing", "ordering", default="fifo")
+    conversion_queue.set_ordering(ordering, lambda item: estimate_seconds(item, run_params))
+
+    runner = QueueRunner(
+        conversion_queue,
+        converter,
+        dispatch=events.put,
+        max_workers=workers,
+        cache=cache,
+        item_logs=item_logs,
+        on_item_started=on_item_started,
+        on_item_finished=on_item_finished,
+        on_output=on_output,
+        on_queue_complete=finished.append
+    )
+    configure_runner(runner, config)
+
+    interrupted = False
+    try:
+        runner.start(lambda item: run_params)
+        while not finished:
+            events.get()()
+    except KeyboardInterrupt:
+        interrupted = True
+        _log("\n[CANCELLED] Interrupted, stopping conversions...")
+        runner.cancel_all()
+    finally:
+        converter.shutdown()
+        if manifest is not None:
+            manifest.save()
+        if cache is not None:
+            cache.flush()
+        if item_logs is not None:
+            item_logs.close()
+
+    # Summary
+    stats = conversion_queue.get_statistics()
+    conversion_queue.close()
+    _log("=" * 60)
+    _log(f"Total files processed: {stats['total']}")
+    _log(f"Completed successfully: {stats['completed']}")
+    _log(f"Failed: {stats['failed']}")
+    if stats['cancelled'] or stats['pending']:
+        _log(f"Cancelled: {stats['cancelled'] + stats['pending']}")
+    if cache is not None:
+        _log(f"Cache: {cache.hits} hits, {cache.misses} misses")
+    for line in runner.usage.summary_lines():
+        _log(line)
+    _log(f"Output directory: {run_params['output_dir']}")
+    if item_logs is not None:
+        _log(f"Item logs: {item_logs.directory}")
+
+    if interrupted:
+        return 130
+    return 0 if stats['completed'] == stats['total'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
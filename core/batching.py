@@ -0,0 +1,68 @@
+"""Grouping of queue items into multi-file docling CLI invocations."""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from core.queue import QueueItem
+
+
+def freeze_params(params: Dict[str, Any]) -> Tuple:
+    """Return a hashable, order-independent form of conversion parameters."""
+    return tuple(sorted((key, repr(value)) for key, value in params.items()))
+
+
+def next_batch(
+    pending: Iterable[QueueItem],
+    params_for: Callable[[QueueItem], Dict[str, Any]],
+    max_count: int,
+    max_bytes: int
+) -> List[QueueItem]:
+    """
+    Take the next chunk of pending items that can share one docling call.
+
+    The chunk starts with the first pending item and collects following
+    items with identical conversion parameters, up to ``max_count`` files
+    and ``max_bytes`` total size. Items whose output name (the input stem)
+    would collide with one already in the chunk are left for a later
+    chunk, since docling writes ``<stem>.<ext>`` into one output directory.
+
+    Args:
+        pending: Pending items in processing order
+        params_for: Returns the conversion parameters for an item
+        max_count: Maximum number of files per chunk
+        max_bytes: Maximum total input size per chunk (the first item is
+                   always taken, even if it alone exceeds the limit)
+
+    Returns:
+        List of items for one invocation (empty if nothing is pending)
+    """
+    batch: List[QueueItem] = []
+    batch_key = None
+    batch_bytes = 0
+    stems = set()
+
+    for item in pending:
+        if not batch:
+            batch_key = freeze_params(params_for(item))
+            batch.append(item)
+            batch_bytes = item.file_size
+            stems.add(Path(item.file_path).stem)
+            if max_count <= 1:
+                break
+            continue
+
+        if batch_bytes + item.file_size > max_bytes:
+            continue
+
+        stem = Path(item.file_path).stem
+        if stem in stems or freeze_params(params_for(item)) != batch_key:
+            continue
+
+        batch.append(item)
+        batch_bytes += item.file_size
+        stems.add(stem)
+
+        if len(batch) >= max_count:
+            break
+
+    return batch
@@ -0,0 +1,255 @@
+"""Content-addressed cache of conversion results."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.dedupe import content_digest
+from core.outputs import copy_file, expected_output_path
+
+
+# Flags that only change logging, not the converted document
+_VERBOSITY_FLAGS = {"-v", "-vv"}
+
+
+def normalized_args(converter, params: Dict[str, Any]) -> List[str]:
+    """
+    Get the docling arguments that determine a conversion's result.
+
+    Builds the CLI command for ``params`` and drops the executable, the
+    input path, the output directory and verbosity flags.
+
+    Args:
+        converter: DoclingConverter used to build the command
+        params: DoclingConverter.convert keyword arguments
+
+    Returns:
+        List of normalized command-line arguments
+    """
+    options = {key: value for key, value in params.items() if key != 'input_path'}
+    if options.get('processing_mode') != "offline":
+        options['artifacts_path'] = None
+    cmd = converter.build_command(input_path="", **options)
+
+    args = []
+    skip_next = False
+    for arg in cmd[2:]:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == "--output":
+            skip_next = True
+            continue
+        if arg in _VERBOSITY_FLAGS:
+            continue
+        args.append(arg)
+    return args
+
+
+class ResultCache:
+    """
+    On-disk cache of converted outputs keyed by input bytes and options.
+
+    Each entry holds the primary output file plus the ``<stem>_artifacts``
+    directory docling writes for referenced images. Entries are copies,
+    never links: docling rewrites an output file in place, which would
+    otherwise change the entry of an earlier conversion. Entries are
+    evicted least-recently-used first once the cache exceeds ``max_bytes``.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Initialize ResultCache.
+
+        Args:
+            cache_dir: Directory holding cached outputs
+            max_bytes: Maximum total size of cached outputs
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the entry index from disk."""
+        index_path = self.cache_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return {}
+        try:
+            with open(index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading cache index: {e}. Starting with an empty cache.")
+            return {}
+
+    def _save_index(self):
+        """Write the entry index to disk (caller holds the lock)."""
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Error saving cache index: {e}")
+
+    def _entry_dir(self, key: str) -> Path:
+        """Get the directory holding an entry's files."""
+        return self.cache_dir / "objects" / key[:2] / key
+
+    def make_key(self, input_path: str, args: List[str],
+                 content_hash: Optional[str] = None) -> str:
+        """
+        Compute the cache key for an input file and normalized arguments.
+
+        Args:
+            input_path: Input document path
+            args: Normalized docling arguments (see normalized_args)
+            content_hash: content_digest() of the input, if already known
+                          (e.g. from duplicate detection)
+
+        Returns:
+            Hex digest identifying the conversion result
+        """
+        digest = hashlib.sha256()
+        digest.update((content_hash or content_digest(input_path)).encode())
+        digest.update(b"\0")
+        digest.update("\x1f".join(args).encode())
+        return digest.hexdigest()
+
+    def restore(self, key: str, input_path: str, output_dir: str,
+                output_format: str) -> Optional[Path]:
+        """
+        Place cached outputs for ``key`` into ``output_dir``.
+
+        Args:
+            key: Cache key
+            input_path: Input document path (determines the output name)
+            output_dir: Output directory
+            output_format: Output format
+
+        Returns:
+            Path of the restored output, or None on a cache miss
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry['last_used'] = time.time()
+            self._dirty = True
+
+        entry_dir = self._entry_dir(key)
+        target = expected_output_path(output_dir, input_path, output_format)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            copy_file(str(entry_dir / entry['output']), str(target))
+            for name in entry.get('artifacts', []):
+                destination = Path(output_dir) / name
+                shutil.rmtree(destination, ignore_errors=True)
+                shutil.copytree(entry_dir / name, destination)
+        except OSError:
+            # Entry damaged on disk: drop it and treat as a miss
+            with self._lock:
+                self._index.pop(key, None)
+                self._dirty = True
+                self.misses += 1
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return target
+
+    def store(self, key: str, input_path: str, output_dir: str, output_format: str):
+        """
+        Add a finished conversion's outputs to the cache.
+
+        Args:
+            key: Cache key
+            input_path: Input document path
+            output_dir: Output directory the conversion wrote to
+            output_format: Output format
+        """
+        output_path = expected_output_path(output_dir, input_path, output_format)
+        if not output_path.exists():
+            return
+
+        # Build the entry beside its final place, then rename it into place
+        entry_dir = self._entry_dir(key)
+        temp_dir = entry_dir.with_name(f"{entry_dir.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+        size = 0
+        artifacts = []
+        try:
+            temp_dir.mkdir(parents=True)
+            shutil.copy2(output_path, temp_dir / output_path.name)
+            size += output_path.stat().st_size
+
+            artifacts_dir = Path(output_dir) / f"{output_path.stem}_artifacts"
+            if artifacts_dir.is_dir():
+                shutil.copytree(artifacts_dir, temp_dir / artifacts_dir.name)
+                artifacts.append(artifacts_dir.name)
+                size += sum(f.stat().st_size for f in artifacts_dir.rglob('*') if f.is_file())
+
+            with self._lock:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(temp_dir, entry_dir)
+        except OSError as e:
+            print(f"Error caching {output_path}: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._index[key] = {
+                'output': output_path.name,
+                'artifacts': artifacts,
+                'size': size,
+                'last_used': time.time()
+            }
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        """Remove least recently used entries until under the size limit (lock held)."""
+        total = sum(entry['size'] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)['size']
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def flush(self):
+        """Persist access times recorded since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def reset_counters(self):
+        """Reset the hit/miss counters (e.g. at the start of a run)."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def total_size(self) -> int:
+        """Total size of cached outputs in bytes."""
+        with self._lock:
+            return sum(entry['size'] for entry in self._index.values())
@@ -0,0 +1,250 @@
+"""Disk-backed, searchable history of console output."""
+
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Queue entry that deletes the stored lines (in order with appended text)
+_CLEAR = object()
+
+
+class ConsoleHistory:
+    """
+    Stores every console line in an SQLite file.
+
+    Lines are indexed with an FTS5 trigram index when SQLite provides one,
+    so substring searches do not scan the whole history; otherwise search
+    falls back to a table scan. The console widget itself only keeps the
+    most recent lines.
+
+    append() only enqueues, like AsyncLogWriter.write(): a writer thread
+    stores the text in one transaction once ``flush_chars`` are pending or
+    ``flush_interval`` seconds have passed, so callers never wait for
+    SQLite or the index. search() sees the lines stored so far.
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_chars: int = 256 * 1024,
+                 flush_interval: float = 0.25):
+        """
+        Initialize ConsoleHistory.
+
+        Args:
+            path: Database file to use (None = a temporary file that is
+                  deleted on close())
+            flush_chars: Pending characters that trigger a write
+            flush_interval: Maximum seconds text stays pending
+        """
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="docling_console_", suffix=".sqlite3")
+            os.close(fd)
+        self.path = path
+        self.flush_chars = flush_chars
+        self.flush_interval = flush_interval
+        self.error: Optional[Exception] = None  # First write error; later text is discarded
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Scratch data: favor write speed over durability
+        self._conn.execute("PRAGMA journal_mode=MEMORY")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS lines (id INTEGER PRIMARY KEY, text TEXT NOT NULL)")
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts "
+                "USING fts5(text, content='lines', content_rowid='id', tokenize='trigram')"
+            )
+            self.indexed = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer)
+            self.indexed = False
+        self._conn.commit()
+
+        self._count = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM lines").fetchone()[0]
+        self._partial = ""  # Text after the last newline, stored once the line ends
+
+        self._queue: "queue.Queue[Union[str, object, threading.Event, None]]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="console-history", daemon=True)
+        self._thread.start()
+
+    def append(self, text: str):
+        """
+        Queue console text for storage (safe to call from any thread).
+
+        Complete lines are stored by the writer thread; a trailing partial
+        line waits for the rest of it.
+
+        Args:
+            text: Text to add
+        """
+        if text and not self._closed and self.error is None:
+            self._queue.put(text)
+
+    def flush(self):
+        """Wait until all text appended so far is stored."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def _run(self):
+        """Collect queued text and store it in batches."""
+        pending: List[str] = []
+        pending_size = 0
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                entry = ""
+
+            if isinstance(entry, str):
+                if entry:
+                    pending.append(entry)
+                    pending_size += len(entry)
+                if pending_size < self.flush_chars \
+                        and time.monotonic() - last_flush < self.flush_interval:
+                    continue
+
+            # Store pending text before a clear, flush or stop is handled
+            if pending:
+                self._store("".join(pending))
+                pending.clear()
+                pending_size = 0
+            last_flush = time.monotonic()
+
+            if entry is None:
+                break
+            if entry is _CLEAR:
+                self._clear()
+            elif isinstance(entry, threading.Event):
+                entry.set()
+
+    def _store(self, text: str):
+        """Insert the complete lines of text (and index them) in one transaction."""
+        text = self._partial + text
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        if not lines or self.error is not None:
+            return
+
+        with self._lock:
+            first = self._count + 1
+            rows = list(enumerate(lines, start=first))
+            try:
+                with self._conn:
+                    self._conn.executemany("INSERT INTO lines (id, text) VALUES (?, ?)", rows)
+                    if self.indexed:
+                        self._conn.executemany("INSERT INTO lines_fts (rowid, text) VALUES (?, ?)",
+                                               rows)
+            except sqlite3.Error as e:
+                self.error = e
+                return
+            self._count += len(lines)
+
+    def search(self, query: str, limit: int = 1000) -> List[Tuple[int, str]]:
+        """
+        Find stored lines containing a substring (case-insensitive).
+
+        Lines appended within the last ``flush_interval`` may not be stored yet.
+
+        Args:
+            query: Text to look for
+            limit: Maximum number of matches (the most recent are returned)
+
+        Returns:
+            List of (line number, line text) in line order
+        """
+        if not query:
+            return []
+
+        with self._lock:
+            if self.indexed and len(query) >= 3:
+                # A quoted trigram phrase matches the query as a substring
+                phrase = '"' + query.replace('"', '""') + '"'
+                rows = self._conn.execute(
+                    "SELECT rowid, text FROM lines_fts WHERE lines_fts MATCH ? "
+                    "ORDER BY rowid DESC LIMIT ?",
+                    (phrase, limit)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT id, text FROM lines WHERE instr(lower(text), lower(?)) > 0 "
+                    "ORDER BY id DESC LIMIT ?",
+                    (query, limit)
+                ).fetchall()
+        rows.reverse()
+        return rows
+
+    def iter_text(self, chunk_lines: int = 10000) -> Iterator[str]:
+        """
+        Iterate over the full history in chunks of text.
+
+        Args:
+            chunk_lines: Lines per chunk
+
+        Yields:
+            Consecutive pieces of the text appended so far
+        """
+        self.flush()
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, text FROM lines WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_lines)
+                ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            yield "".join(f"{text}\n" for _, text in rows)
+        if self._partial:
+            yield self._partial
+
+    def clear(self):
+        """Delete all lines appended so far (on the writer thread)."""
+        if not self._closed:
+            self._queue.put(_CLEAR)
+
+    def _clear(self):
+        """Delete all stored lines."""
+        self._partial = ""
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute("DELETE FROM lines")
+                    if self.indexed:
+                        self._conn.execute("INSERT INTO lines_fts (lines_fts) VALUES ('delete-all')")
+            except sqlite3.Error as e:
+                self.error = e
+                return
+            self._count = 0
+
+    def close(self):
+        """Store all queued text, then close the database (deleting it if it is temporary)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        with self._lock:
+            self._conn.close()
+        if self._temporary:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        """Return number of stored lines (queued text is not counted yet)."""
+        return self._count
@@ -3,17 +3,120 @@ import threading
 import sys
 import os
 from pathlib import Path
-from typing import Callable, Optional, List
+from typing import Callable, Dict, Optional, List, Sequence, Tuple, Union
 import shutil
+import time
+
+from core.inprocess import InProcessEngine
+from core.progress import ProgressEvent
+from core.resources import LOW_PRIORITY_CREATIONFLAGS, lower_process_priority
+from core.usage import ResourceUsage, wait_measured
+
+
+class _Cancelled(Exception):
+    """Raised inside a job thread once its job has been cancelled."""
+
+
+class ConversionJob:
+    """Handle for a single running conversion (one queue item) or model download."""
+
+    # Seconds a terminated child gets to exit before it is killed
+    KILL_AFTER = 5.0
+
+    def __init__(self, job_id: str, engine: str = "cli", kind: str = "convert"):
+        self.job_id = job_id
+        self.engine = engine
+        self.kind = kind  # "convert" or "download"
+        self.process: Optional[subprocess.Popen] = None
+        self.inprocess_engine: Optional[InProcessEngine] = None
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Stop this job's child process without waiting for it.
+
+        The job's own thread reaps the child (and measures it); a child
+        that ignores the request is killed after KILL_AFTER seconds.
+        """
+        self.cancelled = True
+
+        if self.inprocess_engine:
+            self.inprocess_engine.cancel()
+
+        process = self.process
+        if process:
+            try:
+                process.terminate()
+            except OSError:
+                return
+            timer = threading.Timer(self.KILL_AFTER, self._kill, args=(process,))
+            timer.daemon = True
+            timer.start()
+
+    def attach(self, process: subprocess.Popen):
+        """
+        Track a newly started child process.
+
+        A cancel that arrived while the child was being started only set
+        ``cancelled``; the child is stopped here instead.
+        """
+        self.process = process
+        if self.cancelled:
+            self.cancel()
+
+    @staticmethod
+    def _kill(process: subprocess.Popen):
+        """Kill a child that is still running."""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except OSError:
+                pass
 
 
 class DoclingConverter:
     """Handles Docling document conversion operations."""
 
-    def __init__(self):
-        self.current_process: Optional[subprocess.Popen] = None
-        self.is_running = False
+    def __init__(self, max_jobs: int = 1, low_priority: bool = False):
+        self.max_jobs = max_jobs
+        self.low_priority = low_priority  # run children with lower CPU/I/O priority
+        self.jobs: Dict[str, ConversionJob] = {}
         self.docling_path = self._get_docling_path()
+        self._jobs_lock = threading.Lock()
+        self._next_job_id = 1
+        self._idle_engines: List[InProcessEngine] = []
+        self._all_engines: List[InProcessEngine] = []
+
+    @property
+    def is_running(self) -> bool:
+        """Check if any conversion or download is in progress."""
+        return len(self.jobs) > 0
+
+    @property
+    def has_free_slot(self) -> bool:
+        """Check if another conversion can be started."""
+        return len(self.jobs) < max(1, self.max_jobs)
+
+    def _register_job(self, job_id: Optional[str], engine: str,
+                      kind: str = "convert") -> Optional[ConversionJob]:
+        """Reserve a slot for a new job. Returns None if all slots are busy."""
+        with self._jobs_lock:
+            if len(self.jobs) >= max(1, self.max_jobs):
+                return None
+            if job_id is None:
+                job_id = f"job-{self._next_job_id}"
+                self._next_job_id += 1
+            if job_id in self.jobs:
+                return None
+            job = ConversionJob(job_id, engine, kind)
+            self.jobs[job_id] = job
+            return job
+
+    def _release_job(self, job: ConversionJob):
+        """Free the slot held by a finished job."""
+        with self._jobs_lock:
+            if self.jobs.get(job.job_id) is job:
+                del self.jobs[job.job_id]
 
     def _get_docling_path(self) -> str:
         """Get the correct docling executable path from virtual environment."""
@@ -160,7 +263,7 @@ class DoclingConverter:
 
     def build_command(
         self,
-        input_path: str,
+        input_path: Union[str, Sequence[str]],
         output_format: str,
         output_dir: str,
         processing_mode: str,
@@ -188,8 +291,15 @@ class DoclingConverter:
         verbose: int = 0,
         **kwargs
     ) -> List[str]:
-        """Build Docling command from parameters."""
-        cmd = [self.docling_path, input_path]
+        """Build Docling command from parameters.
+
+        ``input_path`` may be a list of paths; docling then converts all of
+        them in one invocation with the same options.
+        """
+        if isinstance(input_path, str):
+            cmd = [self.docling_path, input_path]
+        else:
+            cmd = [self.docling_path, *input_path]
 
         # Output settings
         cmd.extend(["--to", output_format])
@@ -282,7 +392,7 @@ class DoclingConverter:
 
     def convert(
         self,
-        input_path: str,
+        input_path: Union[str, Sequence[str]],
         output_format: str,
         output_dir: str,
         processing_mode: str,
@@ -308,15 +418,22 @@ class DoclingConverter:
         debug_visualize_ocr: bool = False,
         debug_visualize_tables: bool = False,
         verbose: int = 0,
+        engine: str = "cli",
+        job_id: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+        shard_output: Optional[str] = None,
         on_output: Optional[Callable[[str], None]] = None,
         on_complete: Optional[Callable[[int], None]] = None,
-        on_error: Optional[Callable[[str], None]] = None
-    ):
+        on_error: Optional[Callable[[str], None]] = None,
+        on_progress: Optional[Callable[[ProgressEvent], None]] = None,
+        on_usage: Optional[Callable[[ResourceUsage], None]] = None
+    ) -> Optional[ConversionJob]:
         """
         Convert document using Docling.
 
         Args:
-            input_path: Path to input file
+            input_path: Path to input file, or a list of paths converted in
+                        one docling CLI call (CLI engine only)
             output_format: Output format (md, json, html, text, doctags)
             output_dir: Output directory path
             processing_mode: "online" or "offline"
@@ -342,17 +459,31 @@ class DoclingConverter:
             debug_visualize_ocr: Visualize OCR cells
             debug_visualize_tables: Visualize table cells
             verbose: Verbosity level (0=normal, 1=-v, 2=-vv)
+            engine: Conversion engine ("cli" spawns the docling CLI per file,
+                    "inprocess" reuses loaded models in a worker process)
+            job_id: Identifier for the job handle (e.g. the queue item ID)
+            page_range: Convert only these 1-based inclusive pages (in-process engine only)
+            shard_output: Write the result as lossless JSON to this path instead
+                          of the normal output (in-process engine only)
             on_output: Callback for stdout/stderr output
             on_complete: Callback for completion (receives return code)
             on_error: Callback for errors
+            on_progress: Callback for progress events (in-process engine only;
+                         CLI progress can be parsed from the output with
+                         core.progress.DoclingProgressParser)
+            on_usage: Callback for the resources the conversion used (called
+                      before on_complete/on_error when they could be measured)
+
+        Returns:
+            ConversionJob handle, or None if all conversion slots are busy
         """
-        if self.is_running:
+        job = self._register_job(job_id, engine)
+        if job is None:
             if on_error:
                 on_error("Conversion already in progress")
-            return
+            return None
 
-        # Build command
-        cmd = self.build_command(
+        options = dict(
             input_path=input_path,
             output_format=output_format,
             output_dir=output_dir,
@@ -381,65 +512,238 @@ class DoclingConverter:
             verbose=verbose
         )
 
+        if engine == "inprocess":
+            if not isinstance(input_path, str):
+                self._release_job(job)
+                if on_error:
+                    on_error("The in-process engine converts one file per job")
+                return None
+            if page_range:
+                options['page_range'] = tuple(page_range)
+            if shard_output:
+                options['shard_output'] = shard_output
+            self._convert_inprocess(job, options, on_output, on_complete, on_error,
+                                    on_progress, on_usage)
+            return job
+
+        if page_range or shard_output:
+            self._release_job(job)
+            if on_error:
+                on_error("Page-range sharding requires the in-process engine")
+            return None
+
+        # Build command
+        cmd = self.build_command(**options)
+
         # Run in separate thread
         def run_conversion():
-            self.is_running = True
+            return_code = None
+            error_msg = None
+            usage = None
             try:
                 if on_output:
                     on_output(f"Executing: {' '.join(cmd)}\n")
 
+                if job.cancelled:
+                    raise _Cancelled()
+
                 # Start process
-                self.current_process = subprocess.Popen(
+                started_at = time.monotonic()
+                process = subprocess.Popen(
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
                     text=True,
                     bufsize=1,
-                    universal_newlines=True
+                    universal_newlines=True,
+                    creationflags=LOW_PRIORITY_CREATIONFLAGS if self.low_priority else 0
                 )
+                job.attach(process)
+                if self.low_priority and not job.cancelled:
+                    lower_process_priority(process.pid)
 
                 # Read output line by line
-                if self.current_process.stdout:
-                    for line in self.current_process.stdout:
+                if job.process.stdout:
+                    for line in job.process.stdout:
                         if on_output:
                             on_output(line)
 
-                # Wait for completion
-                return_code = self.current_process.wait()
-
-                if on_complete:
-                    on_complete(return_code)
+                # Wait for completion, collecting the child's resource usage
+                return_code, usage = wait_measured(job.process, started_at)
+                if job.cancelled:
+                    error_msg = "Conversion cancelled"
 
+            except _Cancelled:
+                error_msg = "Conversion cancelled"
             except FileNotFoundError:
                 error_msg = "Docling CLI not found. Please install it: pip install docling"
-                if on_error:
-                    on_error(error_msg)
-                if on_output:
-                    on_output(f"\nERROR: {error_msg}\n")
             except Exception as e:
                 error_msg = f"Conversion error: {str(e)}"
-                if on_error:
-                    on_error(error_msg)
-                if on_output:
-                    on_output(f"\nERROR: {error_msg}\n")
             finally:
-                self.is_running = False
-                self.current_process = None
+                # Free the slot before notifying, so the caller can start the next job
+                self._release_job(job)
+
+            if usage is not None and on_usage:
+                on_usage(usage)
+            self._notify_result(return_code, error_msg, on_output, on_complete, on_error)
 
         thread = threading.Thread(target=run_conversion, daemon=True)
         thread.start()
+        return job
 
-    def cancel(self):
-        """Cancel current conversion."""
-        if self.current_process:
+    def _notify_result(
+        self,
+        return_code: Optional[int],
+        error_msg: Optional[str],
+        on_output: Optional[Callable[[str], None]],
+        on_complete: Optional[Callable[[int], None]],
+        on_error: Optional[Callable[[str], None]]
+    ):
+        """Invoke completion or error callbacks for a finished job."""
+        if error_msg is None:
+            if on_complete:
+                on_complete(return_code)
+        else:
+            if on_error:
+                on_error(error_msg)
+            if on_output:
+                on_output(f"\nERROR: {error_msg}\n")
+
+    def _acquire_engine(self) -> InProcessEngine:
+        """Take an idle in-process worker, starting a new one if needed."""
+        with self._jobs_lock:
+            if self._idle_engines:
+                return self._idle_engines.pop()
+            engine = InProcessEngine(low_priority=self.low_priority)
+            self._all_engines.append(engine)
+            return engine
+
+    def _return_engine(self, engine: InProcessEngine):
+        """Return an in-process worker to the idle pool."""
+        with self._jobs_lock:
+            # Keep at most one warm worker per slot
+            if len(self._idle_engines) < max(1, self.max_jobs):
+                self._idle_engines.append(engine)
+                return
+            self._all_engines.remove(engine)
+        engine.shutdown()
+
+    def _convert_inprocess(
+        self,
+        job: ConversionJob,
+        options: dict,
+        on_output: Optional[Callable[[str], None]] = None,
+        on_complete: Optional[Callable[[int], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None,
+        on_progress: Optional[Callable[[ProgressEvent], None]] = None,
+        on_usage: Optional[Callable[[ResourceUsage], None]] = None
+    ):
+        """Run a conversion on a pooled in-process worker in a separate thread."""
+        engine = self._acquire_engine()
+        job.inprocess_engine = engine
+
+        def run_conversion():
+            return_code = None
+            error_msg = None
             try:
-                self.current_process.terminate()
-                self.current_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.current_process.kill()
+                if on_output:
+                    on_output(f"Converting in-process: {options['input_path']}\n")
+
+                return_code = engine.run(options, on_output=on_output, on_progress=on_progress,
+                                         on_usage=on_usage)
+
+            except Exception as e:
+                error_msg = str(e) if str(e).startswith("Conversion error") else f"Conversion error: {str(e)}"
             finally:
-                self.current_process = None
-                self.is_running = False
+                job.inprocess_engine = None
+                self._return_engine(engine)
+                self._release_job(job)
+
+            self._notify_result(return_code, error_msg, on_output, on_complete, on_error)
+
+        thread = threading.Thread(target=run_conversion, daemon=True)
+        thread.start()
+
+    def merge_shards(
+        self,
+        shard_paths: List[str],
+        input_path: str,
+        output_format: str,
+        output_dir: str,
+        image_export_mode: str = "embedded",
+        job_id: Optional[str] = None,
+        on_output: Optional[Callable[[str], None]] = None,
+        on_complete: Optional[Callable[[int], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None,
+        on_usage: Optional[Callable[[ResourceUsage], None]] = None
+    ) -> Optional[ConversionJob]:
+        """
+        Merge page-range shard outputs into one document (in-process engine).
+
+        Args:
+            shard_paths: Shard JSON files in page order
+            input_path: Original input file (determines the output name)
+            output_format: Output format (md, json, html, text, doctags)
+            output_dir: Output directory path
+            image_export_mode: Image handling (embedded, placeholder, referenced)
+            job_id: Identifier for the job handle
+            on_output: Callback for output
+            on_complete: Callback for completion (receives return code)
+            on_error: Callback for errors
+            on_usage: Callback for the resources the merge used
+
+        Returns:
+            ConversionJob handle, or None if all conversion slots are busy
+        """
+        job = self._register_job(job_id, "inprocess")
+        if job is None:
+            if on_error:
+                on_error("Conversion already in progress")
+            return None
+
+        options = dict(
+            input_path=input_path,
+            output_format=output_format,
+            output_dir=output_dir,
+            image_export_mode=image_export_mode,
+            merge_inputs=[str(path) for path in shard_paths]
+        )
+        self._convert_inprocess(job, options, on_output, on_complete, on_error,
+                                on_usage=on_usage)
+        return job
+
+    def cancel(self, job_id: Optional[str] = None):
+        """
+        Cancel running conversions.
+
+        Args:
+            job_id: Job to cancel. If None, every running conversion is
+                    cancelled (a model download keeps running).
+        """
+        with self._jobs_lock:
+            if job_id is None:
+                jobs = [job for job in self.jobs.values() if job.kind == "convert"]
+            else:
+                jobs = [self.jobs[job_id]] if job_id in self.jobs else []
+        self._cancel_jobs(jobs)
+
+    def _cancel_jobs(self, jobs: List[ConversionJob]):
+        """Stop jobs and free their slots."""
+        for job in jobs:
+            job.cancel()
+            self._release_job(job)
+
+    def shutdown(self):
+        """Stop every job, including a model download, and background workers (in-process engine)."""
+        with self._jobs_lock:
+            jobs = list(self.jobs.values())
+        self._cancel_jobs(jobs)
+        with self._jobs_lock:
+            engines = list(self._all_engines)
+            self._all_engines.clear()
+            self._idle_engines.clear()
+        for engine in engines:
+            engine.shutdown()
 
     def download_models(
         self,
@@ -468,12 +772,19 @@ class DoclingConverter:
                 on_error("No models selected for download.")
             return
 
+        job = self._register_job("download", "cli", kind="download")
+        if job is None:
+            if on_error:
+                on_error("Conversion already in progress. Cannot download models now.")
+            return
+
         def run_download():
-            self.is_running = True
             total_return_code = 0
 
             try:
                 for i, model in enumerate(models, 1):
+                    if job.cancelled:
+                        raise _Cancelled()
                     model_name = model["name"]
                     command = model.get("command", "download")
 
@@ -486,21 +797,23 @@ class DoclingConverter:
                     if on_output:
                         on_output(f"Executing: {' '.join(cmd)}\n\n")
 
-                    self.current_process = subprocess.Popen(
+                    job.attach(subprocess.Popen(
                         cmd,
                         stdout=subprocess.PIPE,
                         stderr=subprocess.STDOUT,
                         text=True,
                         bufsize=1,
                         universal_newlines=True
-                    )
+                    ))
 
-                    if self.current_process.stdout:
-                        for line in self.current_process.stdout:
+                    if job.process.stdout:
+                        for line in job.process.stdout:
                             if on_output:
                                 on_output(line)
 
-                    return_code = self.current_process.wait()
+                    return_code = job.process.wait()
+                    if job.cancelled:
+                        raise _Cancelled()
                     if return_code != 0:
                         total_return_code = return_code
                         if on_output:
@@ -517,6 +830,12 @@ class DoclingConverter:
                 if on_complete:
                     on_complete(total_return_code)
 
+            except _Cancelled:
+                error_msg = "Model download cancelled"
+                if on_error:
+                    on_error(error_msg)
+                if on_output:
+                    on_output(f"\n[CANCELLED] {error_msg}\n")
             except FileNotFoundError:
                 error_msg = "docling-tools command not found. Please ensure Docling is installed: pip install docling"
                 if on_error:
@@ -530,8 +849,7 @@ class DoclingConverter:
                 if on_output:
                     on_output(f"\nERROR: {error_msg}\n")
             finally:
-                self.is_running = False
-                self.current_process = None
+                self._release_job(job)
 
         thread = threading.Thread(target=run_download, daemon=True)
         thread.start()
@@ -0,0 +1,122 @@
+"""Content hashing for collapsing duplicate queue items onto one conversion."""
+
+import hashlib
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from core.queue import ConversionQueue, QueueItem
+
+
+# Bytes hashed per update (a view into the mapping, so nothing is copied)
+_HASH_BLOCK = 4 * 1024 * 1024
+
+
+def content_digest(file_path: str) -> str:
+    """
+    Return the BLAKE2b hex digest of a file's contents.
+
+    The file is memory-mapped, so the kernel pages it in without copying it
+    into Python buffers.
+
+    Args:
+        file_path: File to hash
+
+    Returns:
+        Hex digest
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file (cannot be mapped)
+            return digest.hexdigest()
+        with mapped, memoryview(mapped) as view:
+            for offset in range(0, len(view), _HASH_BLOCK):
+                digest.update(view[offset:offset + _HASH_BLOCK])
+    return digest.hexdigest()
+
+
+class ContentHasher:
+    """
+    Hashes queue items' files on a thread pool.
+
+    Digests are reported through dispatch on the thread that owns the
+    queue, which then calls ConversionQueue.set_content_hash().
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[Callable[[], None]], None],
+        on_hashed: Callable[[str, Optional[str]], None],
+        workers: int = 4
+    ):
+        """
+        Initialize ContentHasher.
+
+        Args:
+            dispatch: Schedules a callable on the thread that owns the queue
+            on_hashed: Receives an item ID and its file's digest (None if the
+                       file could not be read)
+            workers: Files hashed in parallel
+        """
+        self._dispatch = dispatch
+        self._on_hashed = on_hashed
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                            thread_name_prefix="hash")
+
+    def submit(self, items: List[QueueItem]):
+        """Hash items' files in the background."""
+        for item in items:
+            self._executor.submit(self._hash, item.id, item.file_path)
+
+    def _hash(self, item_id: str, file_path: str):
+        """Hash one file (pool thread)."""
+        try:
+            digest: Optional[str] = content_digest(file_path)
+        except OSError:
+            digest = None
+        self._dispatch(lambda: self._on_hashed(item_id, digest))
+
+    def shutdown(self):
+        """Drop queued work and stop the pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def collapse_duplicates(queue: ConversionQueue, workers: int = 4) -> List[QueueItem]:
+    """
+    Hash the queue's pending hash requests and collapse the duplicates found.
+
+    For callers that own the queue on one thread and can wait (headless mode).
+
+    Args:
+        queue: Queue with deduplication enabled
+        workers: Files hashed in parallel
+
+    Returns:
+        Items removed because they duplicate an earlier item
+    """
+    requests = queue.take_hash_requests()
+    if not requests:
+        return []
+
+    def digest_or_none(item: QueueItem) -> Optional[str]:
+        try:
+            return content_digest(item.file_path)
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        digests = list(executor.map(digest_or_none, requests))
+
+    removed = []
+    for item, digest in zip(requests, digests):
+        if digest is not None:
+            duplicate = queue.set_content_hash(item.id, digest)
+            if duplicate is not None:
+                removed.append(duplicate)
+    return removed
@@ -0,0 +1,220 @@
+"""Background ingestion of dropped or selected files and folders into the queue."""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from core.scanner import FolderScanner, ScannedFile, ScanOptions
+
+
+# Marks the end of the files read by chunked()'s helper thread
+_END = object()
+
+
+class _Failed:
+    """An error raised while chunked() read the files."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def scan_sources(sources: Iterable[str], scanner: FolderScanner) -> Iterator[ScannedFile]:
+    """
+    Yield the files named by a list of paths, scanning the folders among them.
+
+    Files are taken as given (whatever their extension); folders are scanned
+    with the scanner.
+
+    Args:
+        sources: File and folder paths
+        scanner: Scanner for the folders
+
+    Returns:
+        Iterator of the files found (missing paths are skipped)
+    """
+    for source in sources:
+        path = os.path.abspath(source)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            print(f"Skipping {source}: not found")
+            continue
+
+        if os.path.isdir(path):
+            yield from scanner.scan(path)
+        else:
+            yield ScannedFile(path, stat.st_size, stat.st_mtime_ns, stat.st_dev, stat.st_ino)
+
+
+def chunked(files: Iterable[ScannedFile], max_files: int,
+            max_seconds: float) -> Iterator[List[ScannedFile]]:
+    """
+    Group files into chunks.
+
+    The files are read on a helper thread. A chunk is closed once it holds
+    max_files files or max_seconds after its first file was found, whether
+    or not another file has arrived, so a scan stuck in a slow folder still
+    hands over what it found. Closing the iterator stops the helper thread
+    at its next file.
+
+    Args:
+        files: Files to group (an iterator is also closed on that thread)
+        max_files: Largest chunk
+        max_seconds: Longest a found file waits in a chunk
+
+    Returns:
+        Iterator of non-empty chunks
+
+    Raises:
+        Exception: Whatever reading the files raised
+    """
+    found: "queue.Queue" = queue.Queue(maxsize=max_files)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                found.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(files)
+        try:
+            for scanned in iterator:
+                if not put(scanned):
+                    return
+        except Exception as e:
+            put(_Failed(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        put(_END)
+
+    threading.Thread(target=produce, name="ingest-scan", daemon=True).start()
+
+    chunk: List[ScannedFile] = []
+    deadline = 0.0
+    try:
+        while True:
+            try:
+                entry = found.get(timeout=max(0.0, deadline - time.monotonic()) if chunk else None)
+            except queue.Empty:
+                yield chunk
+                chunk = []
+                continue
+            if entry is _END:
+                break
+            if isinstance(entry, _Failed):
+                raise entry.error
+            if not chunk:
+                deadline = time.monotonic() + max_seconds
+            chunk.append(entry)
+            if len(chunk) >= max_files or time.monotonic() >= deadline:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        stop.set()
+
+
+class FolderIngest:
+    """
+    Scans files and folders on a background thread and hands them over in chunks.
+
+    Chunks are passed to on_chunk through dispatch (e.g. Tk's after), so the
+    thread that owns the queue adds them while the scan goes on; nothing
+    but the hand-over runs on that thread. A chunk dispatched before
+    cancel() but not yet delivered is dropped.
+    """
+
+    CHUNK_FILES = 500
+    CHUNK_SECONDS = 0.25
+
+    def __init__(
+        self,
+        sources: List[str],
+        options: ScanOptions,
+        dispatch: Callable[[Callable[[], None]], None],
+        on_chunk: Callable[[List[ScannedFile]], None],
+        on_done: Callable[["FolderIngest"], None],
+        filter_chunk: Optional[Callable[[List[ScannedFile]], List[ScannedFile]]] = None
+    ):
+        """
+        Initialize FolderIngest.
+
+        Args:
+            sources: File and folder paths to ingest
+            options: Scan options for the folders
+            dispatch: Schedules a callable on the thread that owns the queue
+            on_chunk: Receives each chunk of files (on the dispatch thread)
+            on_done: Called when the scan ended, was cancelled or failed
+                     (on the dispatch thread)
+            filter_chunk: Selects the files of a chunk to hand over; runs on
+                          the scan thread (e.g. folder sync planning)
+        """
+        self.sources = sources
+        self._scanner = FolderScanner(options)
+        self._dispatch = dispatch
+        self._on_chunk = on_chunk
+        self._on_done = on_done
+        self.filter_chunk = filter_chunk
+
+        self.discovered = 0  # Files found so far
+        self.accepted = 0  # Files kept by filter_chunk
+        self.delivered = 0  # Files passed to on_chunk
+        self.error: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the scan thread is still running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if the ingest was cancelled."""
+        return self._cancelled.is_set()
+
+    def start(self):
+        """Start scanning on a background thread."""
+        self._thread = threading.Thread(target=self._run, name="ingest", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop scanning and drop chunks not yet delivered."""
+        self._cancelled.set()
+        self._scanner.stop()
+
+    def _run(self):
+        """Scan the sources and dispatch the chunks (scan thread)."""
+        chunks = chunked(scan_sources(self.sources, self._scanner),
+                         self.CHUNK_FILES, self.CHUNK_SECONDS)
+        try:
+            for chunk in chunks:
+                if self._cancelled.is_set():
+                    break
+                self.discovered += len(chunk)
+                if self.filter_chunk is not None:
+                    chunk = self.filter_chunk(chunk)
+                if chunk:
+                    self.accepted += len(chunk)
+                    self._dispatch(lambda chunk=chunk: self._deliver(chunk))
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            chunks.close()
+            self._dispatch(lambda: self._on_done(self))
+
+    def _deliver(self, chunk: List[ScannedFile]):
+        """Hand a chunk over unless cancelled meanwhile (dispatch thread)."""
+        if not self._cancelled.is_set():
+            self.delivered += len(chunk)
+            self._on_chunk(chunk)
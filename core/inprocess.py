@@ -0,0 +1,490 @@
+"""In-process Docling conversion engine.
+
+Runs ``docling.document_converter.DocumentConverter`` inside a long-lived
+worker process so that layout, TableFormer and OCR models are loaded once
+and reused across queue items, instead of paying interpreter startup and
+model loading for every file as the CLI engine does.
+"""
+
+import logging
+import multiprocessing
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.outputs import expected_output_path
+from core.progress import DEFAULT_PAGE_BATCH_SIZE, DoclingProgressParser, ProgressEvent
+from core.resources import lower_process_priority
+from core.usage import ResourceUsage, SelfUsageMeter
+
+
+# Options that affect how the DocumentConverter (and its pipelines) are built.
+# Jobs sharing the same values for these keys reuse one converter instance.
+PIPELINE_OPTION_KEYS = (
+    'ocr_enabled', 'force_ocr', 'pipeline', 'image_export_mode', 'pdf_backend',
+    'pdf_password', 'table_mode', 'artifacts_path', 'ocr_lang', 'ocr_engine',
+    'vlm_model', 'extract_tables', 'enrich_code', 'enrich_formula',
+    'enrich_picture_classes', 'enrich_picture_description',
+)
+
+# Sidebar VLM model names -> attribute in docling.datamodel.vlm_model_specs
+VLM_MODEL_SPECS = {
+    'granite_docling': 'GRANITEDOCLING_TRANSFORMERS',
+    'granite_docling_vllm': 'GRANITEDOCLING_VLLM',
+    'smoldocling': 'SMOLDOCLING_TRANSFORMERS',
+    'smoldocling_vllm': 'SMOLDOCLING_VLLM',
+    'granite_vision': 'GRANITE_VISION_TRANSFORMERS',
+    'granite_vision_vllm': 'GRANITE_VISION_VLLM',
+    'granite_vision_ollama': 'GRANITE_VISION_OLLAMA',
+    'got_ocr_2': 'GOT2_TRANSFORMERS',
+}
+
+PDF_BACKENDS = {
+    'dlparse_v1': ('docling.backend.docling_parse_backend', 'DoclingParseDocumentBackend'),
+    'dlparse_v2': ('docling.backend.docling_parse_v2_backend', 'DoclingParseV2DocumentBackend'),
+    'dlparse_v4': ('docling.backend.docling_parse_v4_backend', 'DoclingParseV4DocumentBackend'),
+    'pypdfium2': ('docling.backend.pypdfium2_backend', 'PyPdfiumDocumentBackend'),
+}
+
+OCR_ENGINE_OPTIONS = {
+    'easyocr': 'EasyOcrOptions',
+    'tesseract': 'TesseractCliOcrOptions',
+    'tesserocr': 'TesseractOcrOptions',
+    'rapidocr': 'RapidOcrOptions',
+    'ocrmac': 'OcrMacOptions',
+}
+
+
+def converter_key(options: Dict[str, Any]) -> Tuple:
+    """Return a hashable key identifying the converter needed for a job."""
+    return tuple((key, options.get(key)) for key in PIPELINE_OPTION_KEYS)
+
+
+# Worker process side
+
+def _import_attr(module_name: str, attr: str):
+    """Import ``attr`` from ``module_name``."""
+    module = __import__(module_name, fromlist=[attr])
+    return getattr(module, attr)
+
+
+def _build_pdf_pipeline_options(options: Dict[str, Any]):
+    """Map build_command parameters onto PdfPipelineOptions."""
+    from docling.datamodel import pipeline_options as po
+
+    pipeline_options = po.PdfPipelineOptions()
+
+    # OCR
+    pipeline_options.do_ocr = bool(options.get('ocr_enabled'))
+    engine = options.get('ocr_engine') or 'auto'
+    if engine in OCR_ENGINE_OPTIONS:
+        pipeline_options.ocr_options = getattr(po, OCR_ENGINE_OPTIONS[engine])()
+    ocr_lang = options.get('ocr_lang')
+    if ocr_lang and ocr_lang.strip():
+        pipeline_options.ocr_options.lang = [
+            lang.strip() for lang in ocr_lang.split(',') if lang.strip()
+        ]
+    if options.get('force_ocr'):
+        pipeline_options.ocr_options.force_full_page_ocr = True
+
+    # Tables
+    pipeline_options.do_table_structure = bool(options.get('extract_tables', True))
+    if options.get('table_mode') == 'fast':
+        pipeline_options.table_structure_options.mode = po.TableFormerMode.FAST
+    else:
+        pipeline_options.table_structure_options.mode = po.TableFormerMode.ACCURATE
+
+    # Enrichment
+    pipeline_options.do_code_enrichment = bool(options.get('enrich_code'))
+    pipeline_options.do_formula_enrichment = bool(options.get('enrich_formula'))
+    pipeline_options.do_picture_classification = bool(options.get('enrich_picture_classes'))
+    pipeline_options.do_picture_description = bool(options.get('enrich_picture_description'))
+
+    # Images are only rendered when they will be exported
+    if options.get('image_export_mode', 'embedded') != 'placeholder':
+        pipeline_options.generate_picture_images = True
+        pipeline_options.images_scale = 2
+
+    # Artifacts path (for offline mode), models are in 'models' subdirectory
+    if options.get('artifacts_path'):
+        pipeline_options.artifacts_path = str(Path(options['artifacts_path']) / "models")
+
+    return pipeline_options
+
+
+def _create_document_converter(options: Dict[str, Any]):
+    """Create a DocumentConverter configured like the equivalent CLI call."""
+    from docling.datamodel.base_models import InputFormat
+    from docling.document_converter import DocumentConverter, PdfFormatOption, ImageFormatOption
+
+    pipeline = options.get('pipeline', 'standard')
+    format_options = {}
+
+    if pipeline == 'vlm':
+        from docling.datamodel import vlm_model_specs
+        from docling.datamodel.pipeline_options import VlmPipelineOptions
+        from docling.pipeline.vlm_pipeline import VlmPipeline
+
+        vlm_options = VlmPipelineOptions()
+        spec_name = VLM_MODEL_SPECS.get(options.get('vlm_model') or 'granite_docling')
+        if spec_name and hasattr(vlm_model_specs, spec_name):
+            vlm_options.vlm_options = getattr(vlm_model_specs, spec_name)
+        if options.get('artifacts_path'):
+            vlm_options.artifacts_path = str(Path(options['artifacts_path']) / "models")
+
+        pdf_option = PdfFormatOption(pipeline_cls=VlmPipeline, pipeline_options=vlm_options)
+        format_options[InputFormat.PDF] = pdf_option
+        format_options[InputFormat.IMAGE] = pdf_option
+
+    elif pipeline == 'asr':
+        from docling.datamodel import asr_model_specs
+        from docling.datamodel.pipeline_options import AsrPipelineOptions
+        from docling.document_converter import AudioFormatOption
+        from docling.pipeline.asr_pipeline import AsrPipeline
+
+        asr_options = AsrPipelineOptions()
+        asr_options.asr_options = asr_model_specs.WHISPER_TINY
+        if options.get('artifacts_path'):
+            asr_options.artifacts_path = str(Path(options['artifacts_path']) / "models")
+
+        format_options[InputFormat.AUDIO] = AudioFormatOption(
+            pipeline_cls=AsrPipeline, pipeline_options=asr_options
+        )
+
+    else:
+        pipeline_options = _build_pdf_pipeline_options(options)
+        pdf_kwargs = {'pipeline_options': pipeline_options}
+
+        backend = PDF_BACKENDS.get(options.get('pdf_backend') or 'dlparse_v4')
+        if backend:
+            pdf_kwargs['backend'] = _import_attr(*backend)
+
+        if options.get('pdf_password'):
+            from docling.datamodel.backend_options import PdfBackendOptions
+            pdf_kwargs['backend_options'] = PdfBackendOptions(password=options['pdf_password'])
+
+        format_options[InputFormat.PDF] = PdfFormatOption(**pdf_kwargs)
+        format_options[InputFormat.IMAGE] = ImageFormatOption(pipeline_options=pipeline_options)
+
+    return DocumentConverter(format_options=format_options)
+
+
+def _apply_debug_settings(options: Dict[str, Any]):
+    """Apply per-job debug visualization flags to docling's global settings."""
+    from docling.datamodel.settings import settings
+
+    settings.debug.visualize_layout = bool(options.get('debug_visualize_layout'))
+    settings.debug.visualize_cells = bool(options.get('debug_visualize_cells'))
+    settings.debug.visualize_ocr = bool(options.get('debug_visualize_ocr'))
+    settings.debug.visualize_tables = bool(options.get('debug_visualize_tables'))
+
+
+def _export_document(document, options: Dict[str, Any]) -> Path:
+    """Write a converted document using the same naming as the docling CLI."""
+    from docling_core.types.doc import ImageRefMode
+
+    output_format = options.get('output_format', 'md')
+    Path(options['output_dir']).mkdir(parents=True, exist_ok=True)
+    output_path = expected_output_path(options['output_dir'], options['input_path'], output_format)
+
+    image_mode = ImageRefMode(options.get('image_export_mode', 'embedded'))
+
+    if output_format == 'json':
+        document.save_as_json(output_path, image_mode=image_mode)
+    elif output_format == 'html':
+        document.save_as_html(output_path, image_mode=image_mode)
+    elif output_format == 'html_split_page':
+        document.save_as_html(output_path, image_mode=image_mode, split_page_view=True)
+    elif output_format == 'text':
+        document.save_as_markdown(output_path, image_mode=ImageRefMode.PLACEHOLDER, strict_text=True)
+    elif output_format == 'doctags':
+        document.save_as_doctags(output_path)
+    else:
+        document.save_as_markdown(output_path, image_mode=image_mode)
+
+    return output_path
+
+
+def _merge_shards(options: Dict[str, Any]) -> Path:
+    """Concatenate shard documents in page order and export the result."""
+    from docling_core.types.doc import DoclingDocument
+
+    documents = [DoclingDocument.load_from_json(Path(path)) for path in options['merge_inputs']]
+    if not hasattr(DoclingDocument, 'concatenate'):
+        raise RuntimeError("Merging shards requires a docling-core version with DoclingDocument.concatenate")
+
+    merged = DoclingDocument.concatenate(docs=documents)
+    merged.name = Path(options['input_path']).stem
+    return _export_document(merged, options)
+
+
+class _PipeLogHandler(logging.Handler):
+    """Forward log records from the worker to the parent as output lines."""
+
+    def __init__(self, conn):
+        super().__init__()
+        self._conn = conn
+        self.setFormatter(logging.Formatter("%(asctime)s\t%(levelname)s\t%(name)s: %(message)s"))
+
+    def emit(self, record):
+        try:
+            self._conn.send(("output", self.format(record) + "\n"))
+        except Exception:
+            pass
+
+
+class _ProgressLogHandler(logging.Handler):
+    """Turn Docling's stage and page-batch log records into progress messages."""
+
+    def __init__(self, conn):
+        super().__init__(logging.DEBUG)
+        self._conn = conn
+        self.parser = DoclingProgressParser()
+
+    def emit(self, record):
+        try:
+            event = self.parser.parse_line(record.getMessage())
+            if event is not None:
+                self._conn.send(("progress", asdict(event)))
+        except Exception:
+            pass
+
+
+def _page_batch_size() -> int:
+    """Get the number of pages Docling converts per batch."""
+    try:
+        from docling.datamodel.settings import settings
+        return settings.perf.page_batch_size
+    except Exception:
+        return DEFAULT_PAGE_BATCH_SIZE
+
+
+def _count_job_pages(options: Dict[str, Any]) -> Optional[int]:
+    """Get the number of pages a job converts (PDFs only)."""
+    if options.get('page_range'):
+        start, end = options['page_range']
+        return end - start + 1
+    if str(options['input_path']).lower().endswith('.pdf'):
+        from core.sharding import count_pdf_pages
+        return count_pdf_pages(options['input_path'])
+    return None
+
+
+def _worker_main(conn):
+    """Worker process loop: receive jobs, convert, report back."""
+    converters = {}
+    handler = _PipeLogHandler(conn)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+
+    # Docling's page-batch records are debug level: always create them for
+    # progress, while the output handler keeps following the verbosity
+    progress_handler = _ProgressLogHandler(conn)
+    docling_logger = logging.getLogger("docling")
+    docling_logger.addHandler(progress_handler)
+    docling_logger.setLevel(logging.DEBUG)
+
+    # Each job's resources are measured inside the worker, which outlives jobs
+    meter = SelfUsageMeter()
+
+    while True:
+        try:
+            options = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if options is None:
+            break
+
+        meter.start()
+        try:
+            verbose = options.get('verbose', 0)
+            level = logging.DEBUG if verbose >= 2 else logging.INFO if verbose == 1 else logging.WARNING
+            root_logger.setLevel(level)
+            handler.setLevel(level)
+            _apply_debug_settings(options)
+
+            if options.get('merge_inputs'):
+                output_path = _merge_shards(options)
+                conn.send(("output", f"Merged {len(options['merge_inputs'])} shards into {output_path}\n"))
+                conn.send(("usage", asdict(meter.stop())))
+                conn.send(("done", 0))
+                continue
+
+            if options.get('show_layout'):
+                conn.send(("output", "Note: show_layout is only supported by the CLI engine.\n"))
+
+            progress_handler.parser.page_batch_size = _page_batch_size()
+            conn.send(("progress", asdict(ProgressEvent(stage="Starting",
+                                                        pages_total=_count_job_pages(options)))))
+
+            key = converter_key(options)
+            converter = converters.get(key)
+            if converter is None:
+                conn.send(("output", "Loading Docling models for this option set...\n"))
+                converter = _create_document_converter(options)
+                converters[key] = converter
+            else:
+                conn.send(("output", "Reusing loaded Docling models.\n"))
+
+            from docling.datamodel.base_models import ConversionStatus
+
+            convert_kwargs = {'raises_on_error': False}
+            if options.get('page_range'):
+                convert_kwargs['page_range'] = tuple(options['page_range'])
+
+            result = converter.convert(options['input_path'], **convert_kwargs)
+            for error in getattr(result, 'errors', None) or []:
+                conn.send(("output", f"ERROR: {getattr(error, 'error_message', error)}\n"))
+
+            if result.status in (ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS):
+                if options.get('shard_output'):
+                    # Lossless intermediate output, merged once all shards finish
+                    from docling_core.types.doc import ImageRefMode
+                    output_path = Path(options['shard_output'])
+                    result.document.save_as_json(output_path, image_mode=ImageRefMode.EMBEDDED)
+                else:
+                    output_path = _export_document(result.document, options)
+                conn.send(("output", f"Wrote {output_path}\n"))
+                conn.send(("usage", asdict(meter.stop())))
+                conn.send(("done", 0))
+            else:
+                conn.send(("output", f"Conversion finished with status: {result.status.value}\n"))
+                conn.send(("usage", asdict(meter.stop())))
+                conn.send(("done", 1))
+
+        except Exception as e:
+            conn.send(("usage", asdict(meter.stop())))
+            conn.send(("error", f"Conversion error: {str(e)}"))
+
+
+# Parent process side
+
+class InProcessEngine:
+    """
+    Runs Docling conversions in a long-lived worker process.
+
+    The worker keeps one DocumentConverter per distinct option set, so
+    models are loaded on the first job and reused for subsequent ones.
+    Cancelling a job terminates the worker; the next job starts a fresh one.
+    """
+
+    def __init__(self, low_priority: bool = False):
+        """
+        Initialize InProcessEngine.
+
+        Args:
+            low_priority: Run the worker with lower CPU and I/O priority
+        """
+        self.low_priority = low_priority
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        """Start the worker process if it is not running."""
+        if self._process is not None and self._process.is_alive():
+            return
+
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_worker_main, args=(child_conn,), daemon=True,
+            name="docling-inprocess-worker"
+        )
+        self._process.start()
+        child_conn.close()
+        if self.low_priority:
+            lower_process_priority(self._process.pid)
+        self._conn = parent_conn
+
+    def run(self, options: Dict[str, Any],
+            on_output: Optional[Callable[[str], None]] = None,
+            on_progress: Optional[Callable[[ProgressEvent], None]] = None,
+            on_usage: Optional[Callable[[ResourceUsage], None]] = None) -> int:
+        """
+        Convert one document and block until it finishes.
+
+        Args:
+            options: Conversion parameters (same names as build_command)
+            on_output: Callback for log output
+            on_progress: Callback for progress events (stages and pages)
+            on_usage: Callback for the resources the job used (before it returns)
+
+        Returns:
+            Return code (0 on success, non-zero on failure or cancellation)
+
+        Raises:
+            RuntimeError: If the worker reports an unexpected error
+        """
+        with self._lock:
+            self._ensure_worker()
+            conn = self._conn
+            process = self._process
+
+        conn.send(options)
+
+        while True:
+            try:
+                kind, payload = conn.recv()
+            except (EOFError, OSError):
+                # Worker exited: cancelled or crashed
+                process.join(timeout=5)
+                return process.exitcode if process.exitcode else -1
+
+            if kind == "output":
+                if on_output:
+                    on_output(payload)
+            elif kind == "progress":
+                if on_progress:
+                    on_progress(ProgressEvent(**payload))
+            elif kind == "usage":
+                if on_usage:
+                    on_usage(ResourceUsage(**payload))
+            elif kind == "done":
+                return payload
+            elif kind == "error":
+                raise RuntimeError(payload)
+
+    def cancel(self):
+        """Terminate the worker process, aborting the current job (does not wait for it)."""
+        with self._lock:
+            process = self._process
+            self._process = None
+            self._conn = None
+
+        if process is not None and process.is_alive():
+            process.terminate()
+            # Reap it off the caller's (UI) thread; kill it if it ignores the request
+            threading.Thread(target=self._reap, args=(process,), name="inprocess-reap",
+                             daemon=True).start()
+
+    @staticmethod
+    def _reap(process: multiprocessing.Process):
+        """Wait for a terminated worker, killing it if it does not exit."""
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    def shutdown(self):
+        """Stop the worker process."""
+        with self._lock:
+            process = self._process
+            conn = self._conn
+            self._process = None
+            self._conn = None
+
+        if process is not None and process.is_alive():
+            try:
+                conn.send(None)
+                process.join(timeout=5)
+            except Exception:
+                pass
+            if process.is_alive():
+                process.terminate()
+
+    @property
+    def is_alive(self) -> bool:
+        """Check whether the worker process is running."""
+        return self._process is not None and self._process.is_alive()
@@ -0,0 +1,184 @@
+"""Per-item conversion logs with an index for quick lookup."""
+
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Optional, Tuple
+
+from core.queue import QueueItem
+
+
+# Bytes of a log shown by default (the end of the log)
+DEFAULT_TAIL_BYTES = 512 * 1024
+
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+class ItemLogStore:
+    """
+    Writes each queue item's conversion output to its own log file.
+
+    ``index.json`` in the log directory maps item IDs to their log file,
+    file name and size in bytes, so a viewer can open any item's log (or
+    just its end) without reading other output. Writes are thread-safe;
+    begin() and finish() are called from the thread that owns the queue.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize ItemLogStore.
+
+        Args:
+            directory: Directory for the log files and index (created if missing)
+
+        Raises:
+            OSError: If the directory cannot be created
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.json"
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._handles: Dict[str, IO[bytes]] = {}
+        self._lock = threading.Lock()
+
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def begin(self, item: QueueItem):
+        """
+        Open an item's log for writing (appending if it ran before).
+
+        Args:
+            item: Queue item that starts converting
+        """
+        stem = _UNSAFE_CHARS.sub('_', Path(item.filename).stem)[:60]
+        path = self.directory / f"{item.id}_{stem}.log"
+        header = (f"=== {item.filename} ({item.file_path}) - "
+                  f"started {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
+
+        with self._lock:
+            entry = self._entries.setdefault(
+                item.id, {'path': str(path), 'filename': item.filename, 'size': 0}
+            )
+            if item.id not in self._handles:
+                try:
+                    self._handles[item.id] = open(entry['path'], 'ab')
+                except OSError:
+                    return
+            item.log_path = entry['path']
+        self.write(item.id, header)
+
+    def write(self, item_id: str, text: str):
+        """
+        Append output to an item's log (safe to call from any thread).
+
+        Args:
+            item_id: Queue item ID
+            text: Output text
+        """
+        data = text.encode('utf-8', errors='replace')
+        with self._lock:
+            handle = self._handles.get(item_id)
+            if handle is None:
+                return
+            try:
+                handle.write(data)
+            except OSError:
+                return
+            self._entries[item_id]['size'] += len(data)
+
+    def finish(self, item: QueueItem):
+        """
+        Close an item's log after it reached a final status.
+
+        Args:
+            item: Queue item that finished
+        """
+        footer = f"=== {item.status.value}"
+        if item.error_message:
+            footer += f": {item.error_message}"
+        footer += f" - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n\n"
+        self.write(item.id, footer)
+
+        with self._lock:
+            handle = self._handles.pop(item.id, None)
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+            entry = self._entries.get(item.id)
+            if entry is not None:
+                item.log_path = entry['path']
+                item.log_size = entry['size']
+
+    def read(self, item_id: str, max_bytes: int = DEFAULT_TAIL_BYTES) -> Tuple[str, bool]:
+        """
+        Read the end of an item's log.
+
+        Args:
+            item_id: Queue item ID
+            max_bytes: Maximum bytes to read from the end of the log
+
+        Returns:
+            Tuple of (text, truncated); text is empty if the item has no log
+        """
+        with self._lock:
+            entry = self._entries.get(item_id)
+            if entry is None:
+                return "", False
+            handle = self._handles.get(item_id)
+            if handle is not None:
+                handle.flush()
+            path, size = entry['path'], entry['size']
+
+        start = max(0, size - max_bytes)
+        try:
+            with open(path, 'rb') as f:
+                f.seek(start)
+                data = f.read(size - start)
+        except OSError:
+            return "", False
+
+        if start > 0:
+            # Start at a line boundary
+            newline = data.find(b"\n")
+            if newline != -1:
+                data = data[newline + 1:]
+        return data.decode('utf-8', errors='replace'), start > 0
+
+    def log_path(self, item_id: str) -> Optional[str]:
+        """Get the log file of an item, or None if it has none."""
+        entry = self._entries.get(item_id)
+        return entry['path'] if entry else None
+
+    def save(self):
+        """Write the index to disk."""
+        with self._lock:
+            entries = json.dumps(self._entries)
+            for handle in self._handles.values():
+                handle.flush()
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(entries)
+        tmp_path.replace(self.index_path)
+
+    def close(self):
+        """Close open logs and save the index."""
+        with self._lock:
+            for handle in self._handles.values():
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+            self._handles.clear()
+        try:
+            self.save()
+        except OSError:
+            pass
@@ -0,0 +1,385 @@
+"""Append-only journal of queue changes, for resuming a batch after a crash."""
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from core.queue import QueueItem, QueueItemStatus
+
+
+# One-letter status codes used in the journal
+_STATUS_CODES = {
+    QueueItemStatus.PENDING: "p",
+    QueueItemStatus.PROCESSING: "r",
+    QueueItemStatus.COMPLETED: "c",
+    QueueItemStatus.FAILED: "f",
+    QueueItemStatus.CANCELLED: "x",
+}
+_STATUSES = {code: status for status, code in _STATUS_CODES.items()}
+
+# Bytes read per step when looking for the last added item from the end
+_TAIL_BLOCK = 64 * 1024
+
+
+def _encode(record: list) -> str:
+    """Encode one record as a compact JSON line."""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+class QueueJournal:
+    """
+    Records queue changes in an append-only file so a crashed batch can resume.
+
+    Each enqueue, status change, duplicate path and removal is one JSON
+    array per line::
+
+        ["+","12",48213,"/docs/a.pdf"]    item 12 added (size, path)
+        ["s","12","f","exit code: 1"]     status (p, r, c, f, x) and error
+        ["d","12","/copies/a.pdf"]        duplicate path of item 12
+        ["-","12"]                        item 12 removed
+
+    Records are written by a background thread, flushed and fsync-ed at
+    most ``flush_interval`` seconds after they were made; a line torn by a
+    crash is skipped when the journal is read. Once the journal holds many
+    more records than the queue has items, compact() rewrites it as a
+    snapshot (encoded by the writer, written beside the journal, then
+    swapped in).
+    """
+
+    COMPACT_MIN_RECORDS = 10000
+
+    def __init__(self, path: str, flush_interval: float = 0.2,
+                 compact_min_records: Optional[int] = None):
+        """
+        Initialize QueueJournal and open the file for appending.
+
+        Args:
+            path: Journal file (created if missing)
+            flush_interval: Maximum seconds a record waits before it is written
+            compact_min_records: Records before compaction is considered
+
+        Raises:
+            OSError: If the journal cannot be opened
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.compact_min_records = compact_min_records or self.COMPACT_MIN_RECORDS
+        self.error: Optional[Exception] = None  # First write error; later records are discarded
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._replay_size = self._file.tell()  # Bytes written by earlier sessions
+        if self._replay_size:
+            with open(self.path, 'rb') as f:
+                f.seek(self._replay_size - 1)
+                if f.read(1) != b"\n":
+                    # A crash tore the last record: keep new records off its line
+                    self._file.write("\n")
+                    self._file.flush()
+        self._records = 0  # Records in the file (counted once replayed)
+        self._replayed_records = 0
+        self._replaying = False
+        self._queue: "queue.Queue[Union[str, Tuple[str, Any], None]]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="queue-journal", daemon=True)
+        self._thread.start()
+
+    @property
+    def has_history(self) -> bool:
+        """Check if earlier sessions left records to replay."""
+        return self._replay_size > 0
+
+    # Recording (called on the thread that owns the queue)
+
+    def record_add(self, item: QueueItem):
+        """Record a new item."""
+        self._put(_encode(["+", item.id, item.file_size, item.file_path]))
+
+    def record_status(self, item: QueueItem):
+        """Record an item's status and error message."""
+        record = ["s", item.id, _STATUS_CODES[item.status]]
+        if item.error_message:
+            record.append(item.error_message)
+        self._put(_encode(record))
+
+    def record_duplicate(self, item: QueueItem, duplicate_path: str):
+        """Record a path whose output an item also writes."""
+        self._put(_encode(["d", item.id, duplicate_path]))
+
+    def record_remove(self, item_id: str):
+        """Record an item's removal."""
+        self._put(_encode(["-", item_id]))
+
+    def should_compact(self, item_count: int) -> bool:
+        """Check if the journal holds enough superseded records to be rewritten."""
+        return (not self._replaying and self._records >= self.compact_min_records
+                and self._records > 4 * item_count)
+
+    def compact(self, items: Iterable[QueueItem]):
+        """
+        Replace the journal with a snapshot of the queue.
+
+        Only the item list and their duplicate paths are copied here; the
+        writer thread sorts and encodes the snapshot. A status it reads
+        that changed after this call is harmless: the change is recorded
+        after the snapshot too.
+
+        Args:
+            items: Every queue item
+        """
+        items = list(items)
+        duplicates = {item.id: list(item.duplicate_paths) for item in items if item.duplicate_paths}
+        self._records = len(items)  # At least one record per item
+        if not self._closed:
+            self._queue.put(("compact", (items, duplicates)))
+
+    def _put(self, line: str):
+        """Queue a record for the writer."""
+        if not self._closed and self.error is None:
+            self._records += 1
+            self._queue.put(line)
+
+    # Replay
+
+    def last_item_id(self) -> int:
+        """
+        Get the highest item ID earlier sessions added.
+
+        Items are added in ID order, so this is the ID of the last add
+        record; it is found by reading the journal backwards from its end.
+
+        Returns:
+            The ID, or 0 if none was recorded
+        """
+        if not self._replay_size:
+            return 0
+        with open(self.path, 'rb') as f:
+            end = self._replay_size
+            block = _TAIL_BLOCK
+            while True:
+                start = max(0, end - block)
+                f.seek(start)
+                lines = f.read(end - start).splitlines()
+                if start > 0:
+                    lines = lines[1:]  # May start mid-line
+                for line in reversed(lines):
+                    if line.startswith(b'["+"'):
+                        try:
+                            return int(json.loads(line)[1])
+                        except (ValueError, IndexError):
+                            continue
+                if start == 0:
+                    return 0
+                block *= 2
+
+    def read_chunks(self, chunk_size: int = 1000) -> Iterator[Tuple[List[QueueItem], List[tuple]]]:
+        """
+        Rebuild the items earlier sessions left in the journal, a chunk at a time.
+
+        The journal is parsed as a stream. Each chunk holds the items added
+        since the previous chunk, with every record read so far applied,
+        and the records read since then for items of earlier chunks (for
+        ConversionQueue.restore_changes). Items that were processing when
+        the session ended are reset to pending (and that is recorded).
+
+        Args:
+            chunk_size: Items and records per chunk
+
+        Returns:
+            Iterator of (new items in ID order, changes to earlier items)
+        """
+        items: Dict[str, QueueItem] = {}  # Not yet handed over
+        changes: List[tuple] = []
+        reset: Set[str] = set()  # Items last recorded as processing
+        records = 0
+        with open(self.path, 'rb') as f:
+            remaining = self._replay_size
+            for line in f:
+                if remaining <= 0:
+                    break
+                line = line[:remaining]
+                remaining -= len(line)
+                records += 1
+                try:
+                    record = json.loads(line)
+                    kind, item_id = record[0], record[1]
+                    item = items.get(item_id)
+                    if kind == "+":
+                        path = record[3]
+                        items[item_id] = QueueItem(
+                            id=item_id,
+                            file_path=path,
+                            filename=os.path.basename(path),
+                            file_size=record[2],
+                            file_format=os.path.splitext(path)[1].lstrip('.').lower() or 'unknown'
+                        )
+                    elif kind == "-":
+                        reset.discard(item_id)
+                        if items.pop(item_id, None) is None:
+                            changes.append(("-", item_id, None))
+                    elif kind == "s":
+                        status = _STATUSES[record[2]]
+                        error_message = record[3] if len(record) > 3 else None
+                        if status == QueueItemStatus.PROCESSING:
+                            reset.add(item_id)
+                            status = QueueItemStatus.PENDING
+                        else:
+                            reset.discard(item_id)
+                        if item is None:
+                            changes.append(("s", item_id, (status, error_message)))
+                        else:
+                            item.status = status
+                            item.error_message = error_message
+                    elif kind == "d":
+                        if item is None:
+                            changes.append(("d", item_id, record[2]))
+                        else:
+                            item.duplicate_paths.append(record[2])
+                except (ValueError, IndexError, KeyError, TypeError):
+                    # Torn or unknown record
+                    continue
+
+                if len(items) + len(changes) >= chunk_size:
+                    yield list(items.values()), changes
+                    items, changes = {}, []
+
+        self._replayed_records = records
+        if items or changes:
+            yield list(items.values()), changes
+        for item_id in reset:
+            self._put(_encode(["s", item_id, _STATUS_CODES[QueueItemStatus.PENDING]]))
+
+    def replay(self, dispatch: Callable[[Callable[[], None]], None],
+               on_items: Callable[[List[QueueItem], List[tuple]], None],
+               on_done: Callable[[], None], chunk_size: int = 1000):
+        """
+        Read the journal on a background thread and hand the items over in chunks.
+
+        Each chunk is handed over as soon as it is parsed, so the first
+        items show up before the rest of the journal is read.
+
+        Compaction waits until the replay is done, so the snapshot includes
+        every restored item.
+
+        Args:
+            dispatch: Schedules a callable on the thread that owns the queue
+            on_items: Receives each chunk from read_chunks(): new items (for
+                      ConversionQueue.restore) and changes to items of
+                      earlier chunks (for ConversionQueue.restore_changes)
+            on_done: Called after the last chunk
+            chunk_size: Items and records per chunk
+        """
+        self._replaying = True
+
+        def run():
+            try:
+                for items, changes in self.read_chunks(chunk_size):
+                    dispatch(lambda items=items, changes=changes: on_items(items, changes))
+            except OSError as e:
+                print(f"Error reading queue journal: {e}")
+            dispatch(finish)
+
+        def finish():
+            self._replaying = False
+            self._records += self._replayed_records
+            on_done()
+
+        threading.Thread(target=run, name="journal-replay", daemon=True).start()
+
+    # Writer
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Write all queued records and close the journal.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer (None = no limit)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Collect queued records and write them in batches."""
+        pending: List[str] = []
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                entry = ""
+
+            stop = entry is None
+            if isinstance(entry, tuple):
+                # Compaction: earlier records are superseded by the snapshot
+                pending.clear()
+                self._rewrite(self._snapshot(*entry[1]))
+            elif entry:
+                pending.append(entry)
+
+            if pending and (stop or time.monotonic() - last_flush >= self.flush_interval):
+                self._write("".join(pending))
+                pending.clear()
+            if not pending:
+                last_flush = time.monotonic()
+
+            if stop:
+                break
+
+        try:
+            self._file.close()
+        except OSError:
+            pass
+
+    def _write(self, text: str):
+        """Append records and force them to disk."""
+        if self.error is not None:
+            return
+        try:
+            self._file.write(text)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            self.error = e
+
+    @staticmethod
+    def _snapshot(items: List[QueueItem], duplicates: Dict[str, List[str]]) -> str:
+        """Encode the records that rebuild a queue (writer thread)."""
+        lines = []
+        # In ID order, so last_item_id() finds the highest ID at the end
+        for item in sorted(items, key=lambda item: int(item.id)):
+            lines.append(_encode(["+", item.id, item.file_size, item.file_path]))
+            status, error_message = item.status, item.error_message
+            if status != QueueItemStatus.PENDING or error_message:
+                record = ["s", item.id, _STATUS_CODES[status]]
+                if error_message:
+                    record.append(error_message)
+                lines.append(_encode(record))
+            lines.extend(_encode(["d", item.id, path]) for path in duplicates.get(item.id, ()))
+        return "".join(lines)
+
+    def _rewrite(self, text: str):
+        """Swap in a compacted journal."""
+        if self.error is not None:
+            return
+        temp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(temp, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temp, self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        except OSError as e:
+            self.error = e
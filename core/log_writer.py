@@ -0,0 +1,139 @@
+"""Background log file writer with buffered flushing and size-based rotation."""
+
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+class AsyncLogWriter:
+    """
+    Writes text to a log file on a background thread.
+
+    write() only enqueues, so a slow disk or network home directory never
+    stalls the caller. The writer thread flushes once ``flush_bytes`` are
+    pending or ``flush_interval`` seconds have passed. With ``max_bytes``
+    the file is rotated into numbered segments (``name.001.txt``, ...),
+    optionally gzip-compressed once closed. close() flushes everything.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 0,
+        compress: bool = False,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0
+    ):
+        """
+        Initialize AsyncLogWriter.
+
+        Args:
+            path: Log file path (created or truncated)
+            max_bytes: Rotate once the file reaches this size (0 = never)
+            compress: Gzip rotated segments
+            flush_bytes: Pending characters that trigger a write
+            flush_interval: Maximum seconds text stays pending
+
+        Raises:
+            OSError: If the log file cannot be opened
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.error: Optional[Exception] = None  # First write error; later text is discarded
+        self.segments: List[Path] = []  # Rotated segments, oldest first
+
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, text: str):
+        """Queue text for the log file (safe to call from any thread)."""
+        if text and not self._closed and self.error is None:
+            self._queue.put(text)
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Write all queued text and close the file.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer (None = no limit)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Collect queued text and write it in batches."""
+        pending: List[str] = []
+        pending_size = 0
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                text = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                text = ""
+
+            stop = text is None
+            if text:
+                pending.append(text)
+                pending_size += len(text)
+
+            if stop or pending_size >= self.flush_bytes \
+                    or time.monotonic() - last_flush >= self.flush_interval:
+                if pending:
+                    self._write("".join(pending))
+                    pending.clear()
+                    pending_size = 0
+                last_flush = time.monotonic()
+
+            if stop:
+                break
+
+        try:
+            self._file.close()
+        except OSError:
+            pass
+
+    def _write(self, text: str):
+        """Write and flush text, rotating when the size limit is reached."""
+        if self.error is not None:
+            return
+        try:
+            self._file.write(text)
+            self._file.flush()
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            self.error = e
+
+    def _rotate(self):
+        """Close the current file as the next segment and start a new one."""
+        self._file.close()
+        segment = self.path.with_name(f"{self.path.stem}.{len(self.segments) + 1:03d}{self.path.suffix}")
+        os.replace(self.path, segment)
+
+        if self.compress:
+            compressed = segment.with_name(segment.name + ".gz")
+            with open(segment, 'rb') as src, gzip.open(compressed, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            segment.unlink()
+            segment = compressed
+
+        self.segments.append(segment)
+        self._file = open(self.path, 'w', encoding='utf-8')
@@ -0,0 +1,89 @@
+"""Thread-safe buffer for conversion output shown by a periodically refreshed view."""
+
+import threading
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class OutputBuffer:
+    """
+    Collects text from producer threads for a consumer that drains it on a
+    fixed cadence (e.g. once per UI frame).
+
+    The buffer is bounded: when producers outrun the consumer, new text is
+    dropped and counted instead of growing memory or blocking the producers
+    (which read docling's stdout).
+    """
+
+    def __init__(self, max_chars: int = 1024 * 1024):
+        """
+        Initialize OutputBuffer.
+
+        Args:
+            max_chars: Maximum number of characters held before text is dropped
+        """
+        self.max_chars = max_chars
+        self._chunks: Deque[str] = deque()
+        self._size = 0
+        self._dropped_lines = 0
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> bool:
+        """
+        Add text (safe to call from any thread).
+
+        Args:
+            text: Text to add
+
+        Returns:
+            False if the buffer was full and the text was dropped
+        """
+        if not text:
+            return True
+        with self._lock:
+            if self._size + len(text) > self.max_chars:
+                self._dropped_lines += text.count("\n") or 1
+                return False
+            self._chunks.append(text)
+            self._size += len(text)
+            return True
+
+    def drain(self, max_chars: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Take buffered text in the order it was written.
+
+        Args:
+            max_chars: Stop after roughly this many characters (whole writes
+                       are kept together; at least one is taken). The rest
+                       stays buffered for the next drain.
+
+        Returns:
+            Tuple of (text, number of lines dropped since the last drain).
+            Dropped lines are only reported once the buffer is empty, so the
+            count follows the text that preceded them.
+        """
+        parts = []
+        taken = 0
+        with self._lock:
+            while self._chunks and (max_chars is None or not parts or taken < max_chars):
+                chunk = self._chunks.popleft()
+                parts.append(chunk)
+                taken += len(chunk)
+            self._size -= taken
+
+            dropped = 0
+            if not self._chunks:
+                dropped = self._dropped_lines
+                self._dropped_lines = 0
+        return "".join(parts), dropped
+
+    def clear(self):
+        """Discard buffered text and the dropped-line count."""
+        with self._lock:
+            self._chunks.clear()
+            self._size = 0
+            self._dropped_lines = 0
+
+    def __len__(self) -> int:
+        """Return number of buffered characters."""
+        return self._size
@@ -0,0 +1,112 @@
+"""Output file naming shared by the conversion engines."""
+
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+
+# Output format (--to) -> file extension written by docling
+OUTPUT_EXTENSIONS = {
+    'md': 'md',
+    'json': 'json',
+    'html': 'html',
+    'html_split_page': 'html',
+    'text': 'txt',
+    'doctags': 'doctags',
+}
+
+
+def expected_output_path(output_dir: str, input_path: str, output_format: str) -> Path:
+    """
+    Get the path docling writes for an input file.
+
+    Args:
+        output_dir: Output directory passed to the converter
+        input_path: Input document path
+        output_format: Output format (md, json, html, html_split_page, text, doctags)
+
+    Returns:
+        Path of the converted document
+    """
+    extension = OUTPUT_EXTENSIONS.get(output_format, output_format)
+    return Path(output_dir) / f"{Path(input_path).stem}.{extension}"
+
+
+def output_written_since(output_dir: str, input_path: str, output_format: str,
+                         since: Optional[float] = None) -> bool:
+    """
+    Check whether the output for an input file exists (and is fresh).
+
+    Args:
+        output_dir: Output directory passed to the converter
+        input_path: Input document path
+        output_format: Output format
+        since: Optional timestamp; outputs modified before it are stale
+
+    Returns:
+        True if the output file exists and was written after ``since``
+    """
+    path = expected_output_path(output_dir, input_path, output_format)
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return False
+    # Allow for coarse filesystem timestamp resolution
+    return since is None or mtime >= since - 2
+
+
+def copy_file(source: str, destination: str):
+    """
+    Copy a file through a temporary name, so the destination is replaced atomically.
+
+    The copy never shares an inode with the source, so rewriting either
+    file in place (docling truncates its output) leaves the other intact.
+
+    Raises:
+        OSError: If the file cannot be copied
+    """
+    temp = f"{destination}.{os.getpid()}.tmp"
+    try:
+        shutil.copy2(source, temp)
+        os.replace(temp, destination)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+
+
+def fan_out_output(output_dir: str, input_path: str, output_format: str,
+                   duplicate_paths: List[str]) -> List[Path]:
+    """
+    Give duplicates of an input the output written for it.
+
+    Each duplicate gets the output file it would have been converted to
+    (a copy, so re-converting either path cannot rewrite the other's
+    output). Image artifacts are shared: the output refers to
+    them by the original's artifacts folder, which sits next to it.
+
+    Args:
+        output_dir: Output directory the conversion wrote to
+        input_path: Converted input document path
+        output_format: Output format
+        duplicate_paths: Paths of identical copies of the input
+
+    Returns:
+        Paths of the outputs created
+
+    Raises:
+        OSError: If an output cannot be created
+    """
+    source = expected_output_path(output_dir, input_path, output_format)
+    created = []
+    for duplicate_path in duplicate_paths:
+        target = expected_output_path(output_dir, duplicate_path, output_format)
+        if target == source or target in created:
+            # Same name: the one output already stands for both
+            continue
+        copy_file(str(source), str(target))
+        created.append(target)
+    return created
@@ -0,0 +1,202 @@
+"""Conversion progress: parsing Docling's log output, page throughput and ETA."""
+
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+@dataclass
+class ProgressEvent:
+    """Progress reported by one conversion job."""
+
+    stage: Optional[str] = None  # Current stage, e.g. "Loading models"
+    pages: int = 0  # Pages finished since the previous event
+    pages_total: Optional[int] = None  # Pages the job converts, when known
+
+
+# Docling log messages -> stage (matched anywhere in a line)
+_STAGE_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"Loading plugin|Initializing pipeline|Accelerator device|Loading Docling models"),
+     "Loading models"),
+    (re.compile(r"Going to convert document batch|Processing document"), "Converting"),
+    (re.compile(r"Finished converting document"), "Writing output"),
+]
+# Logged (at debug level) after each batch of pages went through the pipeline
+_PAGE_BATCH_PATTERN = re.compile(r"Finished converting page batch")
+
+# Docling's default settings.perf.page_batch_size
+DEFAULT_PAGE_BATCH_SIZE = 4
+
+
+class DoclingProgressParser:
+    """
+    Recognizes Docling's stage and page-batch log lines in output text.
+
+    Page batches are only logged at debug level (``-vv`` for the CLI); the
+    in-process engine hooks Docling's loggers directly, so it reports pages
+    at any verbosity.
+    """
+
+    def __init__(self, page_batch_size: int = DEFAULT_PAGE_BATCH_SIZE):
+        """
+        Initialize DoclingProgressParser.
+
+        Args:
+            page_batch_size: Pages Docling converts per batch
+        """
+        self.page_batch_size = page_batch_size
+        self._partial = ""
+
+    def parse_line(self, line: str) -> Optional[ProgressEvent]:
+        """
+        Parse one log line.
+
+        Args:
+            line: Log line
+
+        Returns:
+            Progress event, or None if the line reports no progress
+        """
+        if _PAGE_BATCH_PATTERN.search(line):
+            return ProgressEvent(pages=self.page_batch_size)
+        for pattern, stage in _STAGE_PATTERNS:
+            if pattern.search(line):
+                return ProgressEvent(stage=stage)
+        return None
+
+    def feed(self, text: str) -> List[ProgressEvent]:
+        """
+        Parse output text (lines may be split across calls).
+
+        Args:
+            text: Output text
+
+        Returns:
+            Progress events for the complete lines in the text
+        """
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        events = []
+        for line in lines:
+            event = self.parse_line(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+
+class RunProgress:
+    """
+    Tracks the pages of a run: expected, finished, throughput and ETA.
+
+    Each item contributes its expected page count (refined once known);
+    pages are credited as the converter reports them, and whatever is left
+    of an item is credited when it finishes, so runs without page-level
+    output still get a throughput.
+    """
+
+    def __init__(self, window_seconds: float = 60.0):
+        """
+        Initialize RunProgress.
+
+        Args:
+            window_seconds: Time span the throughput is averaged over
+        """
+        self.window_seconds = window_seconds
+        self.pages_total = 0
+        self.pages_done = 0
+        self._items: Dict[str, List[int]] = {}  # Item ID -> [expected, done]
+        self._samples: Deque[Tuple[float, int]] = deque()  # (time, pages)
+        self._started_at = time.monotonic()
+
+    def add_item(self, item_id: str, pages: int):
+        """Expect an item with an estimated page count (ignored if already tracked)."""
+        if item_id not in self._items:
+            self._items[item_id] = [pages, 0]
+            self.pages_total += pages
+
+    def set_item_pages(self, item_id: str, pages: int):
+        """Replace an item's estimated page count with the real one."""
+        entry = self._items.get(item_id)
+        if entry is not None:
+            self.pages_total += pages - entry[0]
+            entry[0] = pages
+
+    def remove_item(self, item_id: str):
+        """Stop expecting an item that left the queue before it finished."""
+        entry = self._items.pop(item_id, None)
+        if entry is not None:
+            self.pages_total -= entry[0]
+            self.pages_done -= entry[1]
+
+    def advance(self, item_id: str, pages: int, now: Optional[float] = None):
+        """Credit pages an item finished."""
+        entry = self._items.get(item_id)
+        if entry is None:
+            return
+        pages = max(0, min(pages, entry[0] - entry[1]))
+        entry[1] += pages
+        self._credit(pages, now)
+
+    def finish_item(self, item_id: str, now: Optional[float] = None):
+        """Credit the rest of a finished item (converted, failed or cancelled)."""
+        entry = self._items.get(item_id)
+        if entry is not None:
+            remaining = max(0, entry[0] - entry[1])
+            entry[1] = entry[0]
+            self._credit(remaining, now)
+
+    def _credit(self, pages: int, now: Optional[float]):
+        """Record finished pages for the totals and the throughput window."""
+        if pages <= 0:
+            return
+        now = time.monotonic() if now is None else now
+        self.pages_done += pages
+        self._samples.append((now, pages))
+        while self._samples and now - self._samples[0][0] > self.window_seconds:
+            self._samples.popleft()
+
+    @property
+    def fraction(self) -> float:
+        """Share of expected pages that are finished (0..1)."""
+        if self.pages_total <= 0:
+            return 0.0
+        return min(1.0, self.pages_done / self.pages_total)
+
+    def pages_per_second(self, now: Optional[float] = None) -> float:
+        """Recent throughput in pages per second (0 until pages finished)."""
+        now = time.monotonic() if now is None else now
+        while self._samples and now - self._samples[0][0] > self.window_seconds:
+            self._samples.popleft()
+        if not self._samples:
+            return 0.0
+        span = min(self.window_seconds, now - self._started_at)
+        if span <= 0:
+            return 0.0
+        return sum(pages for _, pages in self._samples) / span
+
+    def eta_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        """Estimated seconds until all expected pages are finished, or None."""
+        rate = self.pages_per_second(now)
+        if rate <= 0:
+            return None
+        return max(0, self.pages_total - self.pages_done) / rate
+
+
+def format_duration(seconds: float, tenths: bool = False) -> str:
+    """
+    Format a duration as e.g. "45s", "12m 05s" or "3h 20m".
+
+    Args:
+        seconds: Duration in seconds
+        tenths: Show durations under a minute with tenths of a second ("0.8s")
+    """
+    if tenths and seconds < 60:
+        return f"{seconds:.1f}s"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
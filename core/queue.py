@@ -1,11 +1,52 @@
 """Queue management for batch processing."""
 
-from dataclasses import dataclass
+import heapq
+import os
+from itertools import islice
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 
+from core.scanner import ScannedFile, ScanOptions, scan_folder
+from core.usage import ResourceUsage
+
+
+# Supported file extensions (from Docling's --from parameter)
+SUPPORTED_EXTENSIONS = {
+    'pdf', 'docx', 'pptx', 'html', 'htm', 'md', 'csv', 'xlsx',
+    'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff',
+    'mp3', 'mp4', 'wav', 'avi', 'mov'
+}
+
+
+def find_supported_files(folder_path: str, recursive: bool = True,
+                         options: Optional[ScanOptions] = None) -> List[str]:
+    """
+    Find all supported files in a folder (extensions match case-insensitively).
+
+    Args:
+        folder_path: Folder to scan
+        recursive: Whether to include subfolders (ignored when options are given)
+        options: Scan options (globs, size limits, symlinks); their extensions
+            default to SUPPORTED_EXTENSIONS
+
+    Returns:
+        Paths of the files found
+    """
+    return [scanned.path for scanned in scan_supported_files(folder_path, recursive, options)]
+
+
+def scan_supported_files(folder_path: str, recursive: bool = True,
+                         options: Optional[ScanOptions] = None) -> Iterator[ScannedFile]:
+    """Scan a folder for supported files, like find_supported_files but with their stat data."""
+    if options is None:
+        options = ScanOptions(recursive=recursive)
+    if options.extensions is None:
+        options = replace(options, extensions=SUPPORTED_EXTENSIONS)
+    return scan_folder(folder_path, options)
+
 
 class QueueItemStatus(Enum):
     """Status of a queue item."""
@@ -30,6 +71,16 @@ class QueueItem:
     added_time: Optional[datetime] = None
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
+    page_count: Optional[int] = None  # PDF page count, when known
+    shards_total: int = 0  # Number of page-range shards (0 = not sharded)
+    shards_done: int = 0  # Shards converted so far
+    pages_done: int = 0  # Pages reported converted in the current attempt
+    stage: str = ""  # Current conversion stage, e.g. "Loading models"
+    log_path: Optional[str] = None  # This item's own conversion log, if captured
+    log_size: int = 0  # Size of the log in bytes (updated when the item finishes)
+    usage: Optional[ResourceUsage] = None  # Resources its conversion used, once measured
+    duplicate_paths: List[str] = field(default_factory=list)  # Copies whose outputs this item also writes
+    content_hash: Optional[str] = None  # Digest of the file, if it was hashed for deduplication
 
     def __post_init__(self):
         """Initialize computed fields."""
@@ -69,84 +120,337 @@ class QueueItem:
 
 
 class ConversionQueue:
-    """Manages the queue of files to be converted."""
+    """
+    Manages the queue of files to be converted.
+
+    Items are indexed by ID and bucketed by status, so lookups, status
+    changes, removal and statistics do not scan the whole queue. Pending
+    items are also kept in a heap ordered by (priority, insertion
+    sequence); an item's priority under the ordering policy is computed
+    once, when it first becomes pending, so taking the next pending item
+    costs O(log n). Status changes must go through update_status() to keep
+    the buckets and the heap current.
+
+    With ``deduplicate`` on, a file that is the same file as a pending item
+    (same device and inode: a hardlink, symlink or repeated path) is not
+    queued again but recorded in that item's duplicate_paths, so one
+    conversion writes both outputs. Pending files of equal size are listed
+    by take_hash_requests() for content hashing; set_content_hash() then
+    collapses the later of two identical pending items onto the earlier.
+    """
 
     def __init__(self):
-        self.items: List[QueueItem] = []
+        self._items: Dict[str, QueueItem] = {}  # ID -> item, insertion order
+        self._position: Dict[str, int] = {}  # ID -> insertion sequence number
+        self._buckets: Dict[QueueItemStatus, Dict[str, QueueItem]] = {
+            status: {} for status in QueueItemStatus
+        }
         self._next_id = 1
+        self.ordering = "fifo"
+        self._priority: Callable[[QueueItem], float] = lambda item: 0
+        self._priorities: Dict[str, float] = {}  # ID -> priority under the current policy
+        # Pending items as (priority, sequence, ID). Entries of items that
+        # left the pending bucket stay in the heap until they surface; an
+        # entry is live only while it is the one in _heap_entry.
+        self._pending_heap: List[Tuple[float, int, str]] = []
+        self._heap_entry: Dict[str, Tuple[float, int, str]] = {}
+
+        # QueueJournal (core.journal) recording every change, if any
+        self.journal = None
+
+        # Duplicate detection (entries are checked against _items when used)
+        self.deduplicate = False
+        self._by_inode: Dict[Tuple[int, int], str] = {}  # (device, inode) -> item ID
+        self._by_size: Dict[int, List[str]] = {}  # size -> item IDs
+        self._by_hash: Dict[str, str] = {}  # content digest -> item ID
+        self._hash_requests: List[QueueItem] = []
+        self._hash_requested: Set[str] = set()
+        self._duplicate_count = 0
+
+    @property
+    def items(self) -> List[QueueItem]:
+        """All queue items in insertion order (a snapshot list)."""
+        return list(self._items.values())
+
+    @property
+    def duplicate_count(self) -> int:
+        """Number of files recorded as duplicates of queued items."""
+        return self._duplicate_count
+
+    def item_ids(self, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """
+        Get the IDs of queue items in insertion order.
+
+        Args:
+            offset: Position of the first item to return
+            limit: Maximum number of IDs (None = all from ``offset`` on)
+
+        Returns:
+            List of item IDs
+        """
+        return list(islice(self._items, offset, None if limit is None else offset + limit))
+
+    def set_ordering(self, policy: str, cost_fn: Optional[Callable[[QueueItem], float]] = None):
+        """
+        Choose the order pending items are processed in.
+
+        Recomputes the priority of every pending item (one pass over them).
+
+        Args:
+            policy: "fifo", "sjf", "lpt" or "round_robin" (see core.ordering)
+            cost_fn: Estimated cost of an item, used by "sjf" and "lpt"
+        """
+        from core.ordering import priority_fn
+        self.ordering = policy
+        self._priority = priority_fn(policy, cost_fn)
+        self._priorities = {}
+        pending = sorted(self._heap_entry.values(), key=lambda entry: entry[1])
+        self._heap_entry = {}
+        for _, sequence, item_id in pending:
+            priority = self._priorities[item_id] = self._priority(self._items[item_id])
+            self._heap_entry[item_id] = (priority, sequence, item_id)
+        self._pending_heap = list(self._heap_entry.values())
+        heapq.heapify(self._pending_heap)
 
     def add_file(self, file_path: str) -> QueueItem:
-        """Add a single file to the queue."""
-        path = Path(file_path)
-
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        if not path.is_file():
-            raise ValueError(f"Not a file: {file_path}")
-
-        # Create queue item
-        item = QueueItem(
-            id=str(self._next_id),
-            file_path=str(path.absolute()),
-            filename=path.name,
-            file_size=path.stat().st_size,
-            file_format=path.suffix.lstrip('.').lower() or 'unknown'
-        )
-
-        self.items.append(item)
-        self._next_id += 1
-
+        """
+        Add a single file to the queue.
+
+        Returns:
+            The new item, or with deduplication the pending item that
+            already converts the same file
+        """
+        item, _ = self._add_path(file_path)
         return item
 
     def add_files(self, file_paths: List[str]) -> List[QueueItem]:
-        """Add multiple files to the queue."""
+        """Add multiple files to the queue. Returns the new items."""
         added_items = []
         for file_path in file_paths:
             try:
-                item = self.add_file(file_path)
-                added_items.append(item)
+                item, created = self._add_path(file_path)
+                if created:
+                    added_items.append(item)
             except (FileNotFoundError, ValueError) as e:
                 print(f"Skipping {file_path}: {e}")
                 continue
         return added_items
 
-    def add_folder(self, folder_path: str, recursive: bool = True) -> List[QueueItem]:
+    def add_scanned(self, files: Iterable[ScannedFile]) -> List[QueueItem]:
+        """Add files found by a folder scan, reusing the size the scan read. Returns the new items."""
+        added_items = []
+        for scanned in files:
+            item, created = self._append(scanned.path, scanned.size, (scanned.device, scanned.inode))
+            if created:
+                added_items.append(item)
+        return added_items
+
+    def add_scanned_count(self, files: Iterable[ScannedFile]) -> int:
+        """Add files found by a folder scan like add_scanned(). Returns only the number of new items."""
+        added = 0
+        for scanned in files:
+            _, created = self._append(scanned.path, scanned.size, (scanned.device, scanned.inode))
+            added += created
+        return added
+
+    def add_folder(self, folder_path: str, recursive: bool = True,
+                   options: Optional[ScanOptions] = None) -> List[QueueItem]:
         """Add all supported files from a folder."""
-        path = Path(folder_path)
+        return self.add_scanned(scan_supported_files(folder_path, recursive, options))
 
-        if not path.exists() or not path.is_dir():
-            raise ValueError(f"Invalid folder: {folder_path}")
+    def _add_path(self, file_path: str) -> Tuple[QueueItem, bool]:
+        """Check and stat a path, then append it (see _append)."""
+        path = Path(file_path)
 
-        # Supported file extensions (from Docling's --from parameter)
-        supported_extensions = {
-            'pdf', 'docx', 'pptx', 'html', 'htm', 'md', 'csv', 'xlsx',
-            'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff',
-            'mp3', 'mp4', 'wav', 'avi', 'mov'
-        }
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Find all supported files
-        file_paths = []
-        if recursive:
-            for ext in supported_extensions:
-                file_paths.extend(path.rglob(f"*.{ext}"))
-        else:
-            for ext in supported_extensions:
-                file_paths.extend(path.glob(f"*.{ext}"))
+        if not path.is_file():
+            raise ValueError(f"Not a file: {file_path}")
+
+        st = path.stat()
+        return self._append(str(path.absolute()), st.st_size, (st.st_dev, st.st_ino))
+
+    def _append(self, file_path: str, file_size: int,
+                identity: Optional[Tuple[int, int]] = None) -> Tuple[QueueItem, bool]:
+        """
+        Create a pending item for an absolute path and index it.
+
+        Returns:
+            The item and whether it was created (False if the file was
+            recorded as a duplicate of a pending item)
+        """
+        if self.deduplicate and identity is not None and identity[1]:
+            # st_ino is 0 where the platform does not report it (scandir on Windows)
+            primary = self._pending(self._by_inode.get(identity))
+            if primary is not None:
+                if file_path != primary.file_path and file_path not in primary.duplicate_paths:
+                    primary.duplicate_paths.append(file_path)
+                    self._duplicate_count += 1
+                    if self.journal is not None:
+                        self.journal.record_duplicate(primary, file_path)
+                return primary, False
+
+        item = QueueItem(
+            id=str(self._next_id),
+            file_path=file_path,
+            filename=os.path.basename(file_path),
+            file_size=file_size,
+            file_format=os.path.splitext(file_path)[1].lstrip('.').lower() or 'unknown'
+        )
 
-        # Add found files
-        return self.add_files([str(f) for f in file_paths])
+        self._items[item.id] = item
+        self._position[item.id] = self._next_id
+        self._next_id += 1
+        self._bucket_insert(item)
+        if self.journal is not None:
+            self.journal.record_add(item)
+            self._maybe_compact()
+
+        if self.deduplicate:
+            if identity is not None and identity[1]:
+                self._by_inode[identity] = item.id
+            self._index_size(item)
+
+        return item, True
+
+    def _pending(self, item_id: Optional[str]) -> Optional[QueueItem]:
+        """Get an item if it is still queued and pending."""
+        item = self._items.get(item_id) if item_id is not None else None
+        if item is None or item.status != QueueItemStatus.PENDING:
+            return None
+        return item
+
+    def _index_size(self, item: QueueItem):
+        """Add an item to its size bucket; request hashes once a bucket has pending peers."""
+        bucket = self._by_size.setdefault(item.file_size, [])
+        # Drop entries of items that were removed or started meanwhile
+        bucket[:] = [item_id for item_id in bucket if self._pending(item_id) is not None]
+        if bucket:
+            for item_id in (*bucket, item.id):
+                if item_id not in self._hash_requested:
+                    self._hash_requested.add(item_id)
+                    self._hash_requests.append(self._items[item_id])
+        bucket.append(item.id)
+
+    def take_hash_requests(self) -> List[QueueItem]:
+        """Get (and clear) the pending items whose files need a content hash."""
+        requests = [item for item in self._hash_requests if item.id in self._items]
+        self._hash_requests = []
+        return requests
+
+    def set_content_hash(self, item_id: str, digest: str) -> Optional[QueueItem]:
+        """
+        Record an item's content digest and collapse it with an identical pending item.
+
+        Of two pending items with the same content, the one queued later is
+        removed and its path (and its own duplicates) are added to the
+        earlier item's duplicate_paths.
+
+        Args:
+            item_id: Queue item ID
+            digest: Digest of the item's file
+
+        Returns:
+            The removed item, or None if nothing was collapsed
+        """
+        item = self._items.get(item_id)
+        if item is None:
+            return None
+        item.content_hash = digest
+
+        other = self._pending(self._by_hash.get(digest))
+        if other is None or other is item or item.status != QueueItemStatus.PENDING:
+            if item.status == QueueItemStatus.PENDING and other is None:
+                self._by_hash[digest] = item.id
+            return None
+
+        if self._position[other.id] < self._position[item.id]:
+            primary, duplicate = other, item
+        else:
+            primary, duplicate = item, other
+        primary.duplicate_paths.append(duplicate.file_path)
+        primary.duplicate_paths.extend(duplicate.duplicate_paths)
+        self._duplicate_count += 1 + len(duplicate.duplicate_paths)
+        if self.journal is not None:
+            for path in (duplicate.file_path, *duplicate.duplicate_paths):
+                self.journal.record_duplicate(primary, path)
+        self._by_hash[digest] = primary.id
+        self._forget(duplicate)
+        return duplicate
+
+    def restore(self, items: Iterable[QueueItem]) -> List[QueueItem]:
+        """
+        Put back items recorded by a journal, keeping their IDs and statuses.
+
+        They are not recorded again. Items whose ID is already in the queue
+        are skipped.
+
+        Args:
+            items: Items rebuilt by QueueJournal.read_chunks()
+
+        Returns:
+            The items restored
+        """
+        restored = []
+        for item in items:
+            if item.id in self._items:
+                continue
+            self._items[item.id] = item
+            self._position[item.id] = int(item.id)
+            self._bucket_insert(item)
+            self._next_id = max(self._next_id, int(item.id) + 1)
+            self._duplicate_count += len(item.duplicate_paths)
+            if self.deduplicate and item.status == QueueItemStatus.PENDING:
+                self._index_size(item)
+            restored.append(item)
+        return restored
+
+    def restore_changes(self, changes: Iterable[tuple]):
+        """
+        Apply journal records to items restored earlier, without recording them again.
+
+        Args:
+            changes: ("s", ID, (status, error message)), ("d", ID, path) and
+                     ("-", ID, None) tuples from QueueJournal.read_chunks(),
+                     in journal order; records for items no longer in the
+                     queue are skipped
+        """
+        for kind, item_id, value in changes:
+            item = self._items.get(item_id)
+            if item is None:
+                continue
+            if kind == "s":
+                status, item.error_message = value
+                if item.status != status:
+                    self._bucket_remove(item)
+                    item.status = status
+                    self._bucket_insert(item)
+                    if self.deduplicate and status == QueueItemStatus.PENDING:
+                        self._index_size(item)
+            elif kind == "d":
+                item.duplicate_paths.append(value)
+                self._duplicate_count += 1
+            elif kind == "-":
+                self._forget(item, record=False)
+
+    def reserve_ids(self, last_id: int):
+        """Make new items get IDs above last_id (e.g. one a journal still has to restore)."""
+        self._next_id = max(self._next_id, last_id + 1)
+
+    def _maybe_compact(self):
+        """Let the journal rewrite itself as a snapshot once it grew large."""
+        if self.journal.should_compact(len(self._items)):
+            self.journal.compact(self._items.values())
 
     def remove_item(self, item_id: str) -> bool:
         """Remove an item from the queue."""
-        for i, item in enumerate(self.items):
-            if item.id == item_id:
-                # Only allow removal if not currently processing
-                if item.status != QueueItemStatus.PROCESSING:
-                    del self.items[i]
-                    return True
-                return False
-        return False
+        item = self._items.get(item_id)
+        # Only allow removal if not currently processing
+        if item is None or item.status == QueueItemStatus.PROCESSING:
+            return False
+        self._forget(item)
+        return True
 
     def remove_items(self, item_ids: List[str]) -> int:
         """Remove multiple items from the queue. Returns count of removed items."""
@@ -158,39 +462,121 @@ class ConversionQueue:
 
     def clear_queue(self) -> None:
         """Clear all items from the queue (except currently processing)."""
-        self.items = [
-            item for item in self.items
-            if item.status == QueueItemStatus.PROCESSING
-        ]
+        for status in QueueItemStatus:
+            if status != QueueItemStatus.PROCESSING:
+                self._clear_bucket(status)
 
     def clear_completed(self) -> None:
         """Remove all completed and failed items."""
-        self.items = [
-            item for item in self.items
-            if item.status not in (QueueItemStatus.COMPLETED, QueueItemStatus.FAILED)
-        ]
+        self._clear_bucket(QueueItemStatus.COMPLETED)
+        self._clear_bucket(QueueItemStatus.FAILED)
+
+    def _forget(self, item: QueueItem, record: bool = True):
+        """Drop an item from the index and its status bucket."""
+        del self._items[item.id]
+        del self._position[item.id]
+        self._bucket_remove(item)
+        self._priorities.pop(item.id, None)
+        self._duplicate_count -= len(item.duplicate_paths)
+        if record and self.journal is not None:
+            self.journal.record_remove(item.id)
+
+    def _clear_bucket(self, status: QueueItemStatus):
+        """Remove every item with a status."""
+        bucket = self._buckets[status]
+        for item_id, item in bucket.items():
+            self._duplicate_count -= len(item.duplicate_paths)
+            del self._items[item_id]
+            del self._position[item_id]
+            self._priorities.pop(item_id, None)
+            if self.journal is not None:
+                self.journal.record_remove(item_id)
+        bucket.clear()
+        if status == QueueItemStatus.PENDING:
+            self._pending_heap = []
+            self._heap_entry = {}
+
+    def _bucket_insert(self, item: QueueItem):
+        """Add an item to its status bucket (and to the heap if it is pending)."""
+        self._buckets[item.status][item.id] = item
+        if item.status != QueueItemStatus.PENDING:
+            return
+
+        priority = self._priorities.get(item.id)
+        if priority is None:
+            priority = self._priorities[item.id] = self._priority(item)
+        entry = (priority, self._position[item.id], item.id)
+        self._heap_entry[item.id] = entry
+        heapq.heappush(self._pending_heap, entry)
+        if len(self._pending_heap) > 2 * len(self._heap_entry) + 64:
+            # Mostly stale entries (e.g. after cancelling many items): rebuild
+            self._pending_heap = list(self._heap_entry.values())
+            heapq.heapify(self._pending_heap)
+
+    def _bucket_remove(self, item: QueueItem):
+        """Take an item out of its status bucket; its heap entry goes stale."""
+        del self._buckets[item.status][item.id]
+        if item.status == QueueItemStatus.PENDING:
+            del self._heap_entry[item.id]
+
+    def get_pending_items_after(self, item_id: int) -> List[QueueItem]:
+        """Get the pending items added after the item with ID ``item_id``, in insertion order."""
+        items = (self._items.get(str(next_id)) for next_id in range(item_id + 1, self._next_id))
+        return [item for item in items
+                if item is not None and item.status == QueueItemStatus.PENDING]
+
+    @property
+    def last_id(self) -> int:
+        """ID of the most recently added item (0 if none was added)."""
+        return self._next_id - 1
+
+    def _pending_in_order(self) -> Iterator[Tuple[float, int, str]]:
+        """Yield the live heap entries in order without popping them (O(log n) each)."""
+        heap = self._pending_heap
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            entry, index = heapq.heappop(frontier)
+            if self._heap_entry.get(entry[2]) is entry:
+                yield entry
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
 
     def get_item(self, item_id: str) -> Optional[QueueItem]:
         """Get a specific queue item by ID."""
-        for item in self.items:
-            if item.id == item_id:
-                return item
-        return None
+        return self._items.get(item_id)
+
+    def get_items(self, item_ids: Iterable[str]) -> Dict[str, QueueItem]:
+        """Get several queue items by ID. Returns ID -> item for the IDs still in the queue."""
+        return {item_id: self._items[item_id] for item_id in item_ids if item_id in self._items}
 
     def get_next_pending(self) -> Optional[QueueItem]:
         """Get the next pending item to process."""
-        for item in self.items:
-            if item.status == QueueItemStatus.PENDING:
-                return item
-        return None
+        heap = self._pending_heap
+        while heap and self._heap_entry.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+        return self._items[heap[0][2]] if heap else None
+
+    def get_pending_items(self, limit: Optional[int] = None) -> List[QueueItem]:
+        """Get pending items in processing order (at most ``limit`` items)."""
+        if limit is None:
+            return [self._items[entry[2]] for entry in sorted(self._heap_entry.values())]
+        return [self._items[entry[2]] for entry in islice(self._pending_in_order(), limit)]
 
     def update_status(self, item_id: str, status: QueueItemStatus,
                       error_message: Optional[str] = None) -> bool:
         """Update the status of a queue item."""
         item = self.get_item(item_id)
         if item:
-            item.status = status
+            changed = item.status != status or item.error_message != error_message
+            if item.status != status:
+                self._bucket_remove(item)
+                item.status = status
+                self._bucket_insert(item)
             item.error_message = error_message
+            if changed and self.journal is not None:
+                self.journal.record_status(item)
+                self._maybe_compact()
 
             # Update timestamps
             if status == QueueItemStatus.PROCESSING:
@@ -204,27 +590,27 @@ class ConversionQueue:
 
     def get_statistics(self) -> dict:
         """Get queue statistics."""
-        total = len(self.items)
-        pending = sum(1 for item in self.items if item.status == QueueItemStatus.PENDING)
-        processing = sum(1 for item in self.items if item.status == QueueItemStatus.PROCESSING)
-        completed = sum(1 for item in self.items if item.status == QueueItemStatus.COMPLETED)
-        failed = sum(1 for item in self.items if item.status == QueueItemStatus.FAILED)
-        cancelled = sum(1 for item in self.items if item.status == QueueItemStatus.CANCELLED)
+        counts = {status: len(bucket) for status, bucket in self._buckets.items()}
+        pending = counts[QueueItemStatus.PENDING]
+        processing = counts[QueueItemStatus.PROCESSING]
 
         return {
-            'total': total,
+            'total': len(self._items),
             'pending': pending,
             'processing': processing,
-            'completed': completed,
-            'failed': failed,
-            'cancelled': cancelled,
+            'completed': counts[QueueItemStatus.COMPLETED],
+            'failed': counts[QueueItemStatus.FAILED],
+            'cancelled': counts[QueueItemStatus.CANCELLED],
             'remaining': pending + processing
         }
 
     def __len__(self) -> int:
         """Return number of items in queue."""
-        return len(self.items)
+        return len(self._items)
 
     def __iter__(self):
-        """Iterate over queue items."""
+        """Iterate over queue items (a snapshot, safe to modify the queue meanwhile)."""
         return iter(self.items)
+
+    def close(self):
+        """Release the queue's resources (nothing to do for the in-memory queue)."""
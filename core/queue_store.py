@@ -0,0 +1,734 @@
+"""SQLite-backed conversion queue for batches too large to keep in memory."""
+
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.ordering import priority_fn
+from core.queue import QueueItem, QueueItemStatus, scan_supported_files
+from core.scanner import ScannedFile, ScanOptions
+from core.usage import ResourceUsage
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    added REAL,
+    started REAL,
+    ended REAL,
+    page_count INTEGER,
+    log_path TEXT,
+    log_size INTEGER NOT NULL DEFAULT 0,
+    usage TEXT,
+    duplicates TEXT,
+    content_hash TEXT,
+    device INTEGER,
+    inode INTEGER
+);
+CREATE INDEX IF NOT EXISTS items_order ON items (status, priority, id);
+"""
+
+# Only needed (and only kept up to date at a cost) with deduplication on
+_DEDUPE_INDEXES = """
+CREATE INDEX IF NOT EXISTS items_inode ON items (device, inode);
+CREATE INDEX IF NOT EXISTS items_size ON items (size);
+CREATE INDEX IF NOT EXISTS items_hash ON items (content_hash);
+"""
+
+_COLUMNS = ("id, path, size, status, error, added, started, ended, page_count, "
+            "log_path, log_size, usage, duplicates, content_hash")
+
+_INSERT = ("INSERT INTO items (id, path, size, status, priority, added, device, inode) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+_PENDING = QueueItemStatus.PENDING.value
+_PROCESSING = QueueItemStatus.PROCESSING.value
+
+# Rows read per query when items are iterated or looked up together
+_PAGE_ROWS = 256
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Convert a datetime to a column value."""
+    return value.timestamp() if value is not None else None
+
+
+def _datetime(value: Optional[float]) -> Optional[datetime]:
+    """Convert a column value to a datetime."""
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
+class SQLiteConversionQueue:
+    """
+    Conversion queue that keeps its items in an SQLite database.
+
+    Offers the ConversionQueue API (add_files, get_next_pending,
+    update_status, get_statistics, ...) for queues of millions of files:
+    items are rows, indexed by (status, priority, id), and become
+    QueueItem objects only when asked for. The UI reads the rows in view
+    with one get_items() call per redraw; the most recently used items are kept
+    (``cache_items``), and an item looked up earlier that someone still
+    holds (e.g. one that is converting) is returned as the same object.
+    Files are added in one transaction per call; the items the add methods
+    return are not tracked (look them up to follow their changes), and
+    add_scanned_count() returns only how many were added.
+
+    Status changes, duplicate paths and content hashes are written at
+    once. The fields the runner sets on an item it converts (page_count,
+    log_path, log_size, usage) are written by update_status() and when the
+    item leaves the cache; progress fields (stage, pages_done, shards) are
+    not stored.
+
+    The priority column holds the ordering policy's key: 0 for fifo (the
+    ID decides), the estimated cost for sjf and lpt, and the item's rank
+    among the pending items of its folder for round_robin (ties go in
+    insertion order).
+
+    A database file keeps the queue across sessions; items that were
+    processing when it was last closed are reset to pending. Without a
+    path, a temporary file is used and deleted by close(). The queue must
+    be used from the thread that created it.
+    """
+
+    def __init__(self, path: Optional[str] = None, cache_items: int = 2000):
+        """
+        Initialize SQLiteConversionQueue and open (or create) its database.
+
+        Args:
+            path: Database file (None = a temporary file)
+            cache_items: Recently used items kept in memory
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="docling_queue_", suffix=".sqlite3")
+            os.close(fd)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.cache_items = max(1, cache_items)
+
+        # Autocommit; bulk changes open their own transaction
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.execute("UPDATE items SET status = ? WHERE status = ?", (_PENDING, _PROCESSING))
+        # Priorities of an earlier session's ordering; the queue starts as fifo
+        self._db.execute("UPDATE items SET priority = 0 WHERE priority != 0")
+
+        self._loaded: "weakref.WeakValueDictionary[str, QueueItem]" = weakref.WeakValueDictionary()
+        self._recent: "OrderedDict[str, QueueItem]" = OrderedDict()  # LRU, most recent last
+        self._unsaved: Set[str] = set()  # Items whose runtime fields may have changed
+        self._counts: Dict[QueueItemStatus, int] = {status: 0 for status in QueueItemStatus}
+        for status, count in self._db.execute("SELECT status, COUNT(*) FROM items GROUP BY status"):
+            self._counts[QueueItemStatus(status)] = count
+        self._next_id = (self._db.execute("SELECT MAX(id) FROM items").fetchone()[0] or 0) + 1
+
+        self.ordering = "fifo"
+        self._priority: Callable[[QueueItem], float] = priority_fn("fifo")
+        # (count, ID): ``count`` items have an ID up to ``ID``; item_ids() pages from it
+        self._id_anchor: Tuple[int, int] = (0, 0)
+
+        self._deduplicate = False
+        self._hash_requests: List[str] = []
+        self._hash_requested: Set[str] = set()
+        self._duplicate_count = self._db.execute(
+            "SELECT COALESCE(SUM(json_array_length(duplicates)), 0) FROM items "
+            "WHERE duplicates IS NOT NULL").fetchone()[0]
+
+    @property
+    def deduplicate(self) -> bool:
+        """Collapse duplicate files onto one item (see ConversionQueue)."""
+        return self._deduplicate
+
+    @deduplicate.setter
+    def deduplicate(self, enabled: bool):
+        if enabled and not self._deduplicate:
+            self._db.executescript(_DEDUPE_INDEXES)
+        self._deduplicate = bool(enabled)
+
+    @property
+    def duplicate_count(self) -> int:
+        """Number of files recorded as duplicates of queued items."""
+        return self._duplicate_count
+
+    @property
+    def items(self) -> List[QueueItem]:
+        """All queue items in insertion order (loads every item; prefer item_ids or iteration)."""
+        return list(self)
+
+    def item_ids(self, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """
+        Get the IDs of queue items in insertion order.
+
+        A page is found by counting from the start, from the previous page
+        or from the end, whichever is nearest, so scrolling through the list
+        stays cheap deep into a large queue.
+
+        Args:
+            offset: Position of the first item to return
+            limit: Maximum number of IDs (None = all from ``offset`` on)
+
+        Returns:
+            List of item IDs
+        """
+        limit = -1 if limit is None else limit
+        total = len(self)
+        if offset >= total or limit == 0:
+            return []
+
+        # Find the first ID from whichever is nearest: the start, the previous page or the end
+        count, last_id = self._id_anchor
+        if total - offset <= min(offset, abs(offset - count)):
+            first = self._db.execute("SELECT id FROM items ORDER BY id DESC LIMIT 1 OFFSET ?",
+                                     (total - offset - 1,)).fetchone()
+        elif offset >= count:
+            first = self._db.execute("SELECT id FROM items WHERE id > ? ORDER BY id LIMIT 1 OFFSET ?",
+                                     (last_id, offset - count)).fetchone()
+        else:
+            first = self._db.execute(
+                "SELECT id FROM items WHERE id <= ? ORDER BY id DESC LIMIT 1 OFFSET ?",
+                (last_id, count - offset - 1)).fetchone()
+        if first is None:
+            return []
+
+        # ``offset`` items have an ID below the first one
+        self._id_anchor = (offset, first[0] - 1)
+        rows = self._db.execute("SELECT id FROM items WHERE id >= ? ORDER BY id LIMIT ?",
+                                (first[0], limit)).fetchall()
+        return [str(item_id) for (item_id,) in rows]
+
+    # Ordering
+
+    def set_ordering(self, policy: str, cost_fn: Optional[Callable[[QueueItem], float]] = None):
+        """
+        Choose the order pending items are processed in.
+
+        Rewrites the priority of every pending item (one pass over them).
+
+        Args:
+            policy: "fifo", "sjf", "lpt" or "round_robin" (see core.ordering)
+            cost_fn: Estimated cost of an item, used by "sjf" and "lpt"
+        """
+        previous = self.ordering
+        self.ordering = policy
+        self._priority = priority_fn(policy, cost_fn)
+        if policy != "round_robin" and (policy not in ("sjf", "lpt") or cost_fn is None):
+            if previous != "fifo":
+                self._db.execute("UPDATE items SET priority = 0 WHERE status = ?", (_PENDING,))
+            return
+
+        with self._transaction():
+            for page in self._pages("status = ?", (_PENDING,), track=False):
+                self._db.executemany("UPDATE items SET priority = ? WHERE id = ?",
+                                     [(self._priority(item), int(item.id)) for item in page])
+
+    # Adding
+
+    def add_file(self, file_path: str) -> QueueItem:
+        """
+        Add a single file to the queue.
+
+        Returns:
+            The new item, or with deduplication the pending item that
+            already converts the same file
+        """
+        path, st = self._stat(file_path)
+        with self._transaction():
+            item, _ = self._append(path, st.st_size, (st.st_dev, st.st_ino))
+        return item
+
+    def add_files(self, file_paths: List[str]) -> List[QueueItem]:
+        """Add multiple files to the queue (one transaction). Returns the new items."""
+        def entries():
+            for file_path in file_paths:
+                try:
+                    path, st = self._stat(file_path)
+                except (FileNotFoundError, ValueError) as e:
+                    print(f"Skipping {file_path}: {e}")
+                    continue
+                yield path, st.st_size, (st.st_dev, st.st_ino)
+
+        added_items: List[QueueItem] = []
+        self._add_entries(entries(), added_items)
+        return added_items
+
+    def add_scanned(self, files: Iterable[ScannedFile]) -> List[QueueItem]:
+        """Add files found by a folder scan, reusing the size the scan read. Returns the new items."""
+        added_items: List[QueueItem] = []
+        self._add_entries(((scanned.path, scanned.size, (scanned.device, scanned.inode))
+                           for scanned in files), added_items)
+        return added_items
+
+    def add_scanned_count(self, files: Iterable[ScannedFile]) -> int:
+        """
+        Add files found by a folder scan like add_scanned(), without keeping
+        the new items (adding a million paths does not hold a million items).
+
+        Returns:
+            Number of new items
+        """
+        return self._add_entries((scanned.path, scanned.size, (scanned.device, scanned.inode))
+                                 for scanned in files)
+
+    def add_folder(self, folder_path: str, recursive: bool = True,
+                   options: Optional[ScanOptions] = None) -> List[QueueItem]:
+        """Add all supported files from a folder."""
+        return self.add_scanned(scan_supported_files(folder_path, recursive, options))
+
+    def _stat(self, file_path: str) -> Tuple[str, os.stat_result]:
+        """Check and stat a path. Returns its absolute path and stat."""
+        try:
+            st = os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        if not stat.S_ISREG(st.st_mode):
+            raise ValueError(f"Not a file: {file_path}")
+        return os.path.abspath(file_path), st
+
+    def _add_entries(self, entries: Iterable[Tuple[str, int, Optional[Tuple[int, int]]]],
+                     added_items: Optional[List[QueueItem]] = None) -> int:
+        """
+        Add (path, size, identity) entries in one transaction.
+
+        Args:
+            entries: Entries to add
+            added_items: List the new items are appended to; without one,
+                         items are only built to compute their rows
+
+        Returns:
+            Number of new items
+        """
+        added = 0
+        with self._transaction():
+            if self._deduplicate:
+                for path, size, identity in entries:
+                    item, created = self._append(path, size, identity)
+                    if created:
+                        added += 1
+                        if added_items is not None:
+                            added_items.append(item)
+                return added
+
+            rows = []
+            now = datetime.now()
+            for path, size, identity in entries:
+                item = self._new_item(path, size, now)
+                rows.append(self._insert_row(item, identity))
+                if added_items is not None:
+                    added_items.append(item)
+                if len(rows) >= 10000:
+                    self._db.executemany(_INSERT, rows)
+                    added += len(rows)
+                    rows.clear()
+            self._db.executemany(_INSERT, rows)
+            added += len(rows)
+        return added
+
+    def _new_item(self, file_path: str, file_size: int,
+                  added_time: Optional[datetime] = None) -> QueueItem:
+        """Create a pending item with the next ID (not yet inserted)."""
+        item = QueueItem(
+            id=str(self._next_id),
+            file_path=file_path,
+            filename=os.path.basename(file_path),
+            file_size=file_size,
+            file_format=os.path.splitext(file_path)[1].lstrip('.').lower() or 'unknown',
+            added_time=added_time
+        )
+        self._next_id += 1
+        self._counts[QueueItemStatus.PENDING] += 1
+        return item
+
+    def _insert_row(self, item: QueueItem, identity: Optional[Tuple[int, int]]) -> tuple:
+        """Get the INSERT parameters of a new item."""
+        device, inode = identity if identity is not None and identity[1] else (None, None)
+        return (int(item.id), item.file_path, item.file_size, _PENDING, self._priority(item),
+                _timestamp(item.added_time), device, inode)
+
+    def _append(self, file_path: str, file_size: int,
+                identity: Optional[Tuple[int, int]] = None) -> Tuple[QueueItem, bool]:
+        """
+        Insert a pending item for an absolute path, or record it as a duplicate.
+
+        Returns:
+            The item and whether it was created (False if the file was
+            recorded as a duplicate of a pending item)
+        """
+        if self._deduplicate and identity is not None and identity[1]:
+            # st_ino is 0 where the platform does not report it (scandir on Windows)
+            row = self._db.execute(
+                "SELECT id FROM items WHERE device = ? AND inode = ? AND status = ? "
+                "ORDER BY id DESC LIMIT 1", (identity[0], identity[1], _PENDING)
+            ).fetchone()
+            if row is not None:
+                primary = self.get_item(str(row[0]))
+                if file_path != primary.file_path and file_path not in primary.duplicate_paths:
+                    primary.duplicate_paths.append(file_path)
+                    self._duplicate_count += 1
+                    self._save_duplicates(primary)
+                return primary, False
+
+        item = self._new_item(file_path, file_size)
+        self._db.execute(_INSERT, self._insert_row(item, identity))
+        if self._deduplicate:
+            self._request_hashes(item)
+        return item, True
+
+    # Duplicate detection
+
+    def _request_hashes(self, item: QueueItem):
+        """Request hashes of a new item and its pending peers of the same size."""
+        peers = [str(item_id) for (item_id,) in self._db.execute(
+            "SELECT id FROM items WHERE size = ? AND status = ? AND id != ?",
+            (item.file_size, _PENDING, int(item.id))
+        )]
+        if peers:
+            for item_id in (*peers, item.id):
+                if item_id not in self._hash_requested:
+                    self._hash_requested.add(item_id)
+                    self._hash_requests.append(item_id)
+
+    def take_hash_requests(self) -> List[QueueItem]:
+        """Get (and clear) the pending items whose files need a content hash."""
+        requests = [item for item in map(self.get_item, self._hash_requests) if item is not None]
+        self._hash_requests = []
+        return requests
+
+    def set_content_hash(self, item_id: str, digest: str) -> Optional[QueueItem]:
+        """
+        Record an item's content digest and collapse it with an identical pending item.
+
+        Of two pending items with the same content, the one queued later is
+        removed and its path (and its own duplicates) are added to the
+        earlier item's duplicate_paths.
+
+        Args:
+            item_id: Queue item ID
+            digest: Digest of the item's file
+
+        Returns:
+            The removed item, or None if nothing was collapsed
+        """
+        item = self.get_item(item_id)
+        if item is None:
+            return None
+        item.content_hash = digest
+        self._db.execute("UPDATE items SET content_hash = ? WHERE id = ?", (digest, int(item.id)))
+        if item.status != QueueItemStatus.PENDING:
+            return None
+
+        row = self._db.execute(
+            "SELECT id FROM items WHERE content_hash = ? AND status = ? AND id != ? "
+            "ORDER BY id LIMIT 1", (digest, _PENDING, int(item.id))
+        ).fetchone()
+        if row is None:
+            return None
+
+        other = self.get_item(str(row[0]))
+        primary, duplicate = (other, item) if int(other.id) < int(item.id) else (item, other)
+        primary.duplicate_paths.append(duplicate.file_path)
+        primary.duplicate_paths.extend(duplicate.duplicate_paths)
+        self._duplicate_count += 1 + len(duplicate.duplicate_paths)
+        with self._transaction():
+            self._save_duplicates(primary)
+            self._forget(duplicate)
+        return duplicate
+
+    def _save_duplicates(self, item: QueueItem):
+        """Write an item's duplicate paths."""
+        self._db.execute("UPDATE items SET duplicates = ? WHERE id = ?",
+                         (json.dumps(item.duplicate_paths, ensure_ascii=False), int(item.id)))
+
+    # Removing
+
+    def remove_item(self, item_id: str) -> bool:
+        """Remove an item from the queue."""
+        item = self.get_item(item_id)
+        # Only allow removal if not currently processing
+        if item is None or item.status == QueueItemStatus.PROCESSING:
+            return False
+        self._forget(item)
+        return True
+
+    def remove_items(self, item_ids: List[str]) -> int:
+        """Remove multiple items from the queue. Returns count of removed items."""
+        count = 0
+        with self._transaction():
+            for item_id in item_ids:
+                if self.remove_item(item_id):
+                    count += 1
+        return count
+
+    def clear_queue(self) -> None:
+        """Clear all items from the queue (except currently processing)."""
+        self._clear_statuses([status for status in QueueItemStatus
+                              if status != QueueItemStatus.PROCESSING])
+
+    def clear_completed(self) -> None:
+        """Remove all completed and failed items."""
+        self._clear_statuses([QueueItemStatus.COMPLETED, QueueItemStatus.FAILED])
+
+    def _forget(self, item: QueueItem):
+        """Delete an item's row and drop it from the caches."""
+        self._db.execute("DELETE FROM items WHERE id = ?", (int(item.id),))
+        self._id_anchor = (0, 0)
+        self._counts[item.status] -= 1
+        self._duplicate_count -= len(item.duplicate_paths)
+        self._loaded.pop(item.id, None)
+        self._recent.pop(item.id, None)
+        self._unsaved.discard(item.id)
+
+    def _clear_statuses(self, statuses: List[QueueItemStatus]):
+        """Remove every item with one of the statuses."""
+        values = [status.value for status in statuses]
+        placeholders = ", ".join("?" * len(values))
+        self._duplicate_count -= self._db.execute(
+            f"SELECT COALESCE(SUM(json_array_length(duplicates)), 0) FROM items "
+            f"WHERE status IN ({placeholders}) AND duplicates IS NOT NULL", values).fetchone()[0]
+        self._db.execute(f"DELETE FROM items WHERE status IN ({placeholders})", values)
+        self._id_anchor = (0, 0)
+        for status in statuses:
+            self._counts[status] = 0
+        for cache in (self._loaded, self._recent):
+            for item_id, item in list(cache.items()):
+                if item.status in statuses:
+                    cache.pop(item_id, None)
+
+    # Lookup
+
+    def get_item(self, item_id: str) -> Optional[QueueItem]:
+        """Get a specific queue item by ID (read from the database if not in memory)."""
+        return self.get_items([item_id]).get(item_id)
+
+    def get_items(self, item_ids: Iterable[str]) -> Dict[str, QueueItem]:
+        """
+        Get several queue items by ID, reading those not in memory in one query.
+
+        Args:
+            item_ids: Item IDs (e.g. the rows in view)
+
+        Returns:
+            ID -> item for the IDs still in the queue
+        """
+        items: Dict[str, QueueItem] = {}
+        missing = []
+        for item_id in item_ids:
+            item = self._loaded.get(item_id)
+            if item is not None:
+                items[item_id] = item
+            elif str(item_id).isdigit():
+                missing.append(int(item_id))
+
+        for start in range(0, len(missing), _PAGE_ROWS):
+            numbers = missing[start:start + _PAGE_ROWS]
+            placeholders = ", ".join("?" * len(numbers))
+            for item in self._select(f"WHERE id IN ({placeholders})", tuple(numbers)):
+                items[item.id] = item
+
+        for item in items.values():
+            self._touch(item)
+        return items
+
+    def get_next_pending(self) -> Optional[QueueItem]:
+        """Get the next pending item to process."""
+        items = self._select("WHERE status = ? ORDER BY priority, id LIMIT 1", (_PENDING,))
+        return next(iter(items), None)
+
+    def get_pending_items(self, limit: Optional[int] = None) -> List[QueueItem]:
+        """Get pending items in processing order (at most ``limit`` items)."""
+        return self._select("WHERE status = ? ORDER BY priority, id LIMIT ?",
+                            (_PENDING, -1 if limit is None else limit))
+
+    def get_pending_items_after(self, item_id: int) -> List[QueueItem]:
+        """Get the pending items added after the item with ID ``item_id`` (untracked), in ID order."""
+        return [item for page in self._pages("status = ?", (_PENDING,), track=False, after=item_id)
+                for item in page]
+
+    @property
+    def last_id(self) -> int:
+        """ID of the most recently added item (0 if none was added)."""
+        return self._next_id - 1
+
+    def update_status(self, item_id: str, status: QueueItemStatus,
+                      error_message: Optional[str] = None) -> bool:
+        """Update the status of a queue item."""
+        item = self.get_item(item_id)
+        if item is None:
+            return False
+
+        self._counts[item.status] -= 1
+        self._counts[status] += 1
+        item.status = status
+        item.error_message = error_message
+
+        # Update timestamps
+        if status == QueueItemStatus.PROCESSING:
+            item.start_time = datetime.now()
+        elif status in (QueueItemStatus.COMPLETED, QueueItemStatus.FAILED,
+                        QueueItemStatus.CANCELLED):
+            item.end_time = datetime.now()
+
+        self._db.execute(
+            "UPDATE items SET status = ?, error = ?, started = ?, ended = ?, "
+            "page_count = ?, log_path = ?, log_size = ?, usage = ? WHERE id = ?",
+            (status.value, error_message, _timestamp(item.start_time), _timestamp(item.end_time),
+             *self._runtime_fields(item), int(item.id))
+        )
+        # The runner keeps setting fields (log size, usage) after this
+        self._unsaved.add(item.id)
+        return True
+
+    def get_statistics(self) -> dict:
+        """Get queue statistics."""
+        counts = self._counts
+        pending = counts[QueueItemStatus.PENDING]
+        processing = counts[QueueItemStatus.PROCESSING]
+
+        return {
+            'total': len(self),
+            'pending': pending,
+            'processing': processing,
+            'completed': counts[QueueItemStatus.COMPLETED],
+            'failed': counts[QueueItemStatus.FAILED],
+            'cancelled': counts[QueueItemStatus.CANCELLED],
+            'remaining': pending + processing
+        }
+
+    def __len__(self) -> int:
+        """Return number of items in queue."""
+        return sum(self._counts.values())
+
+    def __iter__(self) -> Iterator[QueueItem]:
+        """Iterate over queue items in insertion order, reading a page of rows at a time."""
+        for page in self._pages():
+            yield from page
+
+    def close(self):
+        """Write the runtime fields of cached items and close the database."""
+        if self._db is None:
+            return
+        with self._transaction():
+            for item_id in self._unsaved:
+                item = self._loaded.get(item_id)
+                if item is not None:
+                    self._save_runtime(item)
+        self._unsaved.clear()
+        self._db.close()
+        self._db = None
+        self._recent.clear()
+        if self._temporary:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+
+    # Rows and cache
+
+    def _pages(self, condition: str = "1", parameters: tuple = (),
+               track: bool = True, after: int = 0) -> Iterator[List[QueueItem]]:
+        """Read the items a condition selects, above ID ``after`` in insertion order, a page at a time."""
+        last = after
+        while True:
+            # NOT INDEXED: walk the rowids; the status index would sort every page
+            page = self._select(f"NOT INDEXED WHERE id > ? AND ({condition}) ORDER BY id LIMIT ?",
+                                (last, *parameters, _PAGE_ROWS), track)
+            if not page:
+                return
+            yield page
+            last = int(page[-1].id)
+
+    def _select(self, clause: str, parameters: tuple = (), track: bool = True) -> List[QueueItem]:
+        """
+        Get the items of the rows a query selects.
+
+        Items already in memory are reused; others are built from their
+        rows and, with ``track``, registered so later lookups return them.
+        """
+        items = []
+        for row in self._db.execute(f"SELECT {_COLUMNS} FROM items {clause}", parameters):
+            item = self._loaded.get(str(row[0]))
+            if item is None:
+                item = self._row_item(row)
+                if track:
+                    self._loaded[item.id] = item
+            items.append(item)
+        return items
+
+    @staticmethod
+    def _row_item(row: tuple) -> QueueItem:
+        """Build an item from a row (columns as in _COLUMNS)."""
+        (item_id, path, size, status, error, added, started, ended, page_count,
+         log_path, log_size, usage, duplicates, content_hash) = row
+        return QueueItem(
+            id=str(item_id),
+            file_path=path,
+            filename=os.path.basename(path),
+            file_size=size,
+            file_format=os.path.splitext(path)[1].lstrip('.').lower() or 'unknown',
+            status=QueueItemStatus(status),
+            error_message=error,
+            added_time=_datetime(added),
+            start_time=_datetime(started),
+            end_time=_datetime(ended),
+            page_count=page_count,
+            log_path=log_path,
+            log_size=log_size,
+            usage=ResourceUsage(**json.loads(usage)) if usage else None,
+            duplicate_paths=json.loads(duplicates) if duplicates else [],
+            content_hash=content_hash
+        )
+
+    def _touch(self, item: QueueItem):
+        """Mark an item as recently used, evicting the least recently used beyond the limit."""
+        self._recent[item.id] = item
+        self._recent.move_to_end(item.id)
+        while len(self._recent) > self.cache_items:
+            _, evicted = self._recent.popitem(last=False)
+            if evicted.id in self._unsaved:
+                self._unsaved.discard(evicted.id)
+                self._save_runtime(evicted)
+
+    def _save_runtime(self, item: QueueItem):
+        """Write the fields the runner sets on an item it converts."""
+        self._db.execute(
+            "UPDATE items SET page_count = ?, log_path = ?, log_size = ?, usage = ? WHERE id = ?",
+            (*self._runtime_fields(item), int(item.id))
+        )
+
+    @staticmethod
+    def _runtime_fields(item: QueueItem) -> tuple:
+        """Get the page_count, log_path, log_size and usage column values of an item."""
+        usage = json.dumps(asdict(item.usage)) if item.usage is not None else None
+        return item.page_count, item.log_path, item.log_size, usage
+
+    @contextmanager
+    def _transaction(self):
+        """Group the statements of a block into one transaction (nested blocks join it)."""
+        if self._db.in_transaction:
+            yield
+            return
+        self._db.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
@@ -0,0 +1,242 @@
+"""Resource estimates, admission control and process priority for conversions."""
+
+import os
+import shutil
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from core.queue import QueueItem
+
+
+# Formats converted by the layout/OCR/TableFormer PDF pipeline
+PAGE_FORMATS = {'pdf', 'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff'}
+AUDIO_VIDEO_FORMATS = {'mp3', 'mp4', 'wav', 'avi', 'mov'}
+
+# Rough resident-memory model (MB): models loaded once per job plus
+# rendered page images held while a document converts
+_PIPELINE_BASE_MB = {'standard': 1500, 'vlm': 6000, 'asr': 3000}
+_OCR_MB = 600
+_PAGE_MB = {'standard': 8, 'vlm': 24, 'asr': 0}
+_SIMPLE_BASE_MB = 300  # docx/pptx/html/md/csv/xlsx backends (no models)
+_SIMPLE_SIZE_FACTOR = 8  # in-memory expansion of office/markup documents
+_MERGE_PAGE_MB = 2  # shard DoclingDocuments held while they are merged
+
+# CPU slots one job keeps busy (torch uses several threads per job)
+_PIPELINE_CPU = {'standard': 2, 'vlm': 4, 'asr': 4}
+_SIMPLE_CPU = 1
+
+# Page count guess for PDFs whose pages have not been counted
+_BYTES_PER_PAGE = 100 * 1024
+
+
+@dataclass(frozen=True)
+class JobCost:
+    """Estimated resources one conversion job holds while it runs."""
+
+    cpu: int
+    memory_mb: int
+
+    def __add__(self, other: "JobCost") -> "JobCost":
+        return JobCost(self.cpu + other.cpu, self.memory_mb + other.memory_mb)
+
+
+def estimate_pages(item: QueueItem) -> int:
+    """Get an item's page count, guessing from file size if unknown."""
+    if item.page_count:
+        return item.page_count
+    if item.file_format == 'pdf':
+        return max(1, item.file_size // _BYTES_PER_PAGE)
+    return 1
+
+
+def estimate_cost(items: Iterable[QueueItem], params: Dict[str, Any],
+                  pages: Optional[int] = None) -> JobCost:
+    """
+    Estimate the CPU and memory one job needs.
+
+    Models are loaded once per job, so a batch costs one pipeline base plus
+    the per-document share of every item.
+
+    Args:
+        items: Items converted by the job
+        params: DoclingConverter.convert keyword arguments
+        pages: Page count of a page-range shard (overrides the items' pages)
+
+    Returns:
+        Estimated job cost
+    """
+    pipeline = params.get('pipeline', 'standard')
+    if pipeline not in _PIPELINE_BASE_MB:
+        pipeline = 'standard'
+
+    uses_models = False
+    memory = 0
+    for item in items:
+        if pipeline != 'standard' or item.file_format in PAGE_FORMATS \
+                or item.file_format in AUDIO_VIDEO_FORMATS:
+            uses_models = True
+            item_pages = pages if pages is not None else estimate_pages(item)
+            memory += item_pages * _PAGE_MB[pipeline]
+        else:
+            memory += item.file_size * _SIMPLE_SIZE_FACTOR // (1024 * 1024)
+
+    if not uses_models:
+        return JobCost(_SIMPLE_CPU, _SIMPLE_BASE_MB + memory)
+
+    if any(item.file_format in AUDIO_VIDEO_FORMATS for item in items):
+        pipeline = 'asr'
+    memory += _PIPELINE_BASE_MB[pipeline]
+    if pipeline == 'standard' and params.get('ocr_enabled', True):
+        memory += _OCR_MB
+    return JobCost(_PIPELINE_CPU[pipeline], memory)
+
+
+def estimate_merge_cost(pages: int) -> JobCost:
+    """
+    Estimate the CPU and memory of merging a sharded document.
+
+    The merge loads every shard's DoclingDocument and exports the result;
+    it loads no models.
+
+    Args:
+        pages: Page count of the sharded document
+
+    Returns:
+        Estimated job cost
+    """
+    return JobCost(_SIMPLE_CPU, _SIMPLE_BASE_MB + pages * _MERGE_PAGE_MB)
+
+
+def total_memory_mb() -> Optional[int]:
+    """Get the machine's physical memory in MB, or None if unknown."""
+    try:
+        import psutil
+        return psutil.virtual_memory().total // (1024 * 1024)
+    except ImportError:
+        pass
+
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class AdmissionController:
+    """
+    Admits jobs while their combined estimated cost fits the budgets.
+
+    A job is always admitted when nothing else is running, so a single
+    document larger than the budget still converts (alone).
+    """
+
+    def __init__(self, cpu_slots: int, memory_budget_mb: Optional[int]):
+        """
+        Initialize AdmissionController.
+
+        Args:
+            cpu_slots: CPU slots shared by running jobs
+            memory_budget_mb: Memory shared by running jobs (None = unlimited)
+        """
+        self.cpu_slots = max(1, cpu_slots)
+        self.memory_budget_mb = memory_budget_mb
+        self._admitted: Dict[str, JobCost] = {}
+
+    @classmethod
+    def from_config(cls, config) -> "AdmissionController":
+        """Create a controller from the ``resources`` config section (0 = auto)."""
+        cpu_slots = config.get("resources", "cpuSlots", default=0) or (os.cpu_count() or 1)
+        memory_budget = config.get("resources", "memoryBudgetMB", default=0)
+        if not memory_budget:
+            total = total_memory_mb()
+            memory_budget = int(total * 0.75) if total else None
+        return cls(cpu_slots, memory_budget)
+
+    @property
+    def in_use(self) -> JobCost:
+        """Combined cost of admitted jobs."""
+        total = JobCost(0, 0)
+        for cost in self._admitted.values():
+            total = total + cost
+        return total
+
+    def try_admit(self, ticket: str, cost: JobCost) -> bool:
+        """
+        Reserve resources for a job.
+
+        Args:
+            ticket: Key identifying the reservation (released with release())
+            cost: Estimated job cost
+
+        Returns:
+            True if the job may start
+        """
+        if self._admitted:
+            used = self.in_use + cost
+            if used.cpu > self.cpu_slots:
+                return False
+            if self.memory_budget_mb is not None and used.memory_mb > self.memory_budget_mb:
+                return False
+        self._admitted[ticket] = cost
+        return True
+
+    def release(self, ticket: Optional[str]):
+        """Release a reservation (unknown tickets are ignored)."""
+        if ticket is not None:
+            self._admitted.pop(ticket, None)
+
+    def clear(self):
+        """Release every reservation."""
+        self._admitted.clear()
+
+
+# Process priority
+
+if sys.platform == "win32":
+    # Start children below normal priority; Windows has no nice/ionice
+    LOW_PRIORITY_CREATIONFLAGS = getattr(subprocess, "BELOW_NORMAL_PRIORITY_CLASS", 0)
+else:
+    LOW_PRIORITY_CREATIONFLAGS = 0
+
+_NICE_INCREMENT = 10
+_IONICE_LEVEL = 7  # lowest level of the best-effort class
+
+
+def lower_process_priority(pid: int):
+    """
+    Give a child process lower CPU and I/O priority (best effort).
+
+    Uses setpriority for CPU and the lowest best-effort I/O level (psutil,
+    or the ionice tool on Linux) so conversions yield to the UI and the
+    rest of the host. The idle I/O class is avoided: it can starve a
+    conversion indefinitely on a busy disk.
+
+    Args:
+        pid: Process ID
+    """
+    if sys.platform == "win32":
+        return
+
+    try:
+        os.setpriority(os.PRIO_PROCESS, pid, os.getpriority(os.PRIO_PROCESS, pid) + _NICE_INCREMENT)
+    except (AttributeError, OSError):
+        pass
+
+    try:
+        import psutil
+        if hasattr(psutil, "IOPRIO_CLASS_BE"):
+            psutil.Process(pid).ionice(psutil.IOPRIO_CLASS_BE, _IONICE_LEVEL)
+        return
+    except ImportError:
+        pass
+    except Exception:
+        return
+
+    ionice = shutil.which("ionice") if sys.platform.startswith("linux") else None
+    if ionice:
+        try:
+            subprocess.run([ionice, "-c", "2", "-n", str(_IONICE_LEVEL), "-p", str(pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            pass
@@ -0,0 +1,779 @@
+"""Queue runner that drives conversions through a pool of worker slots."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from core.batching import next_batch
+from core.cache import ResultCache, normalized_args
+from core.converter import DoclingConverter
+from core.item_logs import ItemLogStore
+from core.outputs import fan_out_output, output_written_since
+from core.progress import DoclingProgressParser, ProgressEvent, RunProgress
+from core.queue import ConversionQueue, QueueItem, QueueItemStatus
+from core.resources import (AdmissionController, estimate_cost, estimate_merge_cost,
+                            estimate_pages)
+from core.sharding import ShardPlan, count_pdf_pages, plan_page_ranges
+from core.usage import ResourceUsage, UsageSummary
+
+
+@dataclass
+class _Job:
+    """A running converter job and the queue items it works on."""
+
+    job_id: str
+    item_ids: List[str]
+    kind: str = "items"  # "items", "lookup", "count", "shard" or "merge"
+    shard_index: int = -1
+    ticket: Optional[str] = None  # admission reservation held by the job
+    started_at: float = field(default_factory=time.time)
+
+
+class QueueRunner:
+    """
+    Processes a ConversionQueue with up to ``max_workers`` concurrent jobs.
+
+    With ``batch_size`` > 1 and the CLI engine, pending items that share
+    identical conversion parameters are grouped into one docling call;
+    per-item success is then determined from the outputs it produced.
+
+    With ``shard_pages`` > 0 and the in-process engine, PDFs of at least
+    ``shard_min_pages`` pages are split into page-range shards that run on
+    separate workers and are merged back into one output in page order.
+
+    With a ``cache``, each item's input is hashed before conversion (on a
+    background thread, holding a worker slot); items whose result is
+    already cached are restored instead of converted, and new results are
+    added to the cache once their item completes.
+
+    With an ``admission`` controller, a job only starts when its estimated
+    CPU and memory cost fits the controller's budgets; otherwise the queue
+    waits (in order) until running jobs finish.
+
+    With ``item_logs``, each item's output is also written to its own log
+    file (batched items share their call's output).
+
+    ``progress`` tracks the run's expected and finished pages for a batch
+    progress bar and ETA; single-item jobs also report their stage and
+    pages through ``on_item_progress``.
+
+    Each conversion's wall time, CPU time, peak memory and I/O are stored
+    on its items (``QueueItem.usage``; shards and the merge add up, batched
+    items get a share by input size) and collected in ``usage`` for the
+    end-of-run summary.
+
+    All queue state changes happen on the caller's thread: converter
+    callbacks arrive on worker threads and are handed to ``dispatch``,
+    which must run the given function on the owning thread (for the GUI
+    this is ``lambda fn: widget.after(0, fn)``).
+    """
+
+    def __init__(
+        self,
+        queue: ConversionQueue,
+        converter: DoclingConverter,
+        dispatch: Callable[[Callable[[], None]], None],
+        max_workers: int = 1,
+        batch_size: int = 1,
+        batch_max_bytes: int = 256 * 1024 * 1024,
+        shard_pages: int = 0,
+        shard_min_pages: int = 200,
+        cache: Optional[ResultCache] = None,
+        admission: Optional[AdmissionController] = None,
+        item_logs: Optional[ItemLogStore] = None,
+        on_item_started: Optional[Callable[[QueueItem], None]] = None,
+        on_item_finished: Optional[Callable[[QueueItem], None]] = None,
+        on_item_progress: Optional[Callable[[QueueItem], None]] = None,
+        on_output: Optional[Callable[[str, str], None]] = None,
+        on_queue_complete: Optional[Callable[[Dict[str, int]], None]] = None
+    ):
+        """
+        Initialize QueueRunner.
+
+        Args:
+            queue: Queue to process
+            converter: Converter used to run each item
+            dispatch: Schedules a callable on the thread that owns the queue
+            max_workers: Number of concurrent conversions
+            batch_size: Maximum number of files per docling CLI call
+            batch_max_bytes: Maximum total input size per docling CLI call
+            shard_pages: Pages per shard for large PDFs (0 disables sharding)
+            shard_min_pages: Minimum page count before a PDF is sharded
+            cache: Result cache to consult before converting (None disables it)
+            admission: Resource budgets jobs are admitted against (None = only
+                       max_workers limits concurrency)
+            item_logs: Store for per-item logs (None disables them)
+            on_item_started: Callback when an item starts processing
+            on_item_finished: Callback when an item reaches a final status
+            on_item_progress: Callback when an item's stage, pages or shards change
+            on_output: Callback for conversion output (receives job_id, text;
+                       the job ID is the queue item ID unless items are batched
+                       or sharded). Called from worker threads.
+            on_queue_complete: Callback when no pending or running items remain
+                               (receives queue statistics)
+        """
+        self.queue = queue
+        self.converter = converter
+        self.dispatch = dispatch
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_max_bytes = batch_max_bytes
+        self.shard_pages = shard_pages
+        self.shard_min_pages = shard_min_pages
+        self.cache = cache
+        self.admission = admission
+        self.item_logs = item_logs
+        self.on_item_started = on_item_started
+        self.on_item_finished = on_item_finished
+        self.on_item_progress = on_item_progress
+        self.on_output = on_output
+        self.on_queue_complete = on_queue_complete
+
+        self.active_items: Dict[str, QueueItem] = {}
+        self._jobs: Dict[str, _Job] = {}
+        self._shard_plans: Dict[str, ShardPlan] = {}
+        self._item_callbacks: Dict[str, Callable[[Optional[int], Optional[str], float], None]] = {}
+        self._cache_keys: Dict[str, str] = {}
+        self._params_for: Optional[Callable[[QueueItem], Dict[str, Any]]] = None
+        self._running = False
+        self._holds = 0
+        self._tracked_id = 0  # Highest item ID the run's progress has seen
+        self.progress = RunProgress()
+        self.usage = UsageSummary()
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the runner is processing the queue."""
+        return self._running
+
+    def start(self, params_for: Callable[[QueueItem], Dict[str, Any]]):
+        """
+        Start processing pending items.
+
+        Args:
+            params_for: Returns the DoclingConverter.convert keyword arguments
+                        (everything except input_path) for a queue item
+        """
+        self._params_for = params_for
+        self._running = True
+        if self.cache is not None:
+            self.cache.reset_counters()
+        self.converter.max_jobs = self.max_workers
+        self.progress = RunProgress()
+        self.usage = UsageSummary()
+        self._tracked_id = 0
+        self._track_pending()
+        self._fill_slots()
+
+    def wake(self):
+        """Pick up items added to the queue while the runner is running."""
+        if self._running:
+            self._track_pending()
+            self._fill_slots()
+
+    def hold(self):
+        """Keep a run open while items are still being added (e.g. by a folder scan)."""
+        self._holds += 1
+
+    def release(self):
+        """End a hold(); the run completes once no holds remain and the queue is done."""
+        self._holds = max(0, self._holds - 1)
+        self.wake()
+
+    def _track_pending(self):
+        """
+        Add the pending items queued since the last call to the run's expected pages.
+
+        Only items added after the last call are read (wake() runs once per
+        ingested chunk); an older item that is re-queued while the run goes
+        on is not expected unless the run already tracked it.
+        """
+        for item in self.queue.get_pending_items_after(self._tracked_id):
+            self.progress.add_item(item.id, estimate_pages(item))
+        self._tracked_id = self.queue.last_id
+
+    def cancel_all(self):
+        """Stop every running conversion and mark those items cancelled."""
+        self._running = False
+        self.converter.cancel()
+
+        self._jobs.clear()
+        if self.admission is not None:
+            self.admission.clear()
+        for plan in self._shard_plans.values():
+            plan.cleanup()
+        self._shard_plans.clear()
+        self._cache_keys.clear()
+        for item_id in list(self.active_items):
+            self._finish_item(item_id, status=QueueItemStatus.CANCELLED)
+
+    def cancel_item(self, item_id: str) -> bool:
+        """
+        Cancel one pending or running item.
+
+        Items that were batched into the same docling call as the cancelled
+        item are returned to the queue and converted again later.
+
+        Args:
+            item_id: Queue item ID
+
+        Returns:
+            True if the item was cancelled
+        """
+        item = self.queue.get_item(item_id)
+        if item is None:
+            return False
+
+        if item.status == QueueItemStatus.PENDING:
+            self.queue.update_status(item_id, QueueItemStatus.CANCELLED)
+            self.progress.finish_item(item_id)
+            if self.on_item_finished:
+                self.on_item_finished(item)
+            return True
+
+        if item_id not in self.active_items:
+            return False
+
+        for job in list(self._jobs.values()):
+            # Lookups are not interrupted; results for finished items are ignored
+            if item_id not in job.item_ids or job.kind == "lookup":
+                continue
+            self._jobs.pop(job.job_id)
+            self._release(job.ticket)
+            self.converter.cancel(job.job_id)
+            for other_id in job.item_ids:
+                if other_id != item_id and self.active_items.pop(other_id, None) is not None:
+                    self._item_callbacks.pop(other_id, None)
+                    self.queue.update_status(other_id, QueueItemStatus.PENDING)
+
+        plan = self._shard_plans.pop(item_id, None)
+        if plan is not None:
+            plan.cleanup()
+        self._cache_keys.pop(item_id, None)
+        self._finish_item(item_id, QueueItemStatus.CANCELLED)
+
+        if self._running:
+            self._fill_slots()
+        return True
+
+    def _fill_slots(self):
+        """Start pending work until all worker slots are busy."""
+        while self._running and len(self._jobs) < self.max_workers:
+            # Finish started documents first: shards and merges of sharded items
+            plan = next((p for p in self._shard_plans.values()
+                         if p.has_pending or p.ready_to_merge), None)
+            if plan is not None and plan.ready_to_merge:
+                ticket = f"{plan.item_id}.merge"
+                if self.admission is not None and not self.admission.try_admit(
+                        ticket, estimate_merge_cost(self.active_items[plan.item_id].page_count)):
+                    break
+                self._launch_merge(plan, ticket)
+                continue
+            if plan is not None:
+                start, end = plan.page_ranges[plan.next_index]
+                ticket = f"{plan.item_id}.{plan.next_index + 1}"
+                if not self._admit(ticket, [self.active_items[plan.item_id]], end - start + 1):
+                    break
+                self._launch_shard(plan)
+                continue
+
+            items = self._take_next_job()
+            if not items:
+                break
+
+            ticket = f"run-{items[0].id}"
+            if not self._admit(ticket, items):
+                # Wait for running jobs to free resources; keep queue order
+                break
+
+            self._begin_items(items)
+            if self.cache is not None:
+                self._launch_lookup(items, ticket)
+            else:
+                self._run_items(items, ticket)
+
+        if (self._running and not self._jobs and not self._shard_plans and not self._holds
+                and self.queue.get_next_pending() is None):
+            self._running = False
+            if self.cache is not None:
+                self.cache.flush()
+            if self.item_logs is not None:
+                self._save_item_logs()
+            if self.on_queue_complete:
+                self.on_queue_complete(self.queue.get_statistics())
+
+    def _take_next_job(self) -> List[QueueItem]:
+        """Select the items for the next job (one item unless batching)."""
+        first = self.queue.get_next_pending()
+        if first is None:
+            return []
+
+        if self.batch_size <= 1 or self._params_for(first).get('engine', 'cli') != 'cli':
+            return [first]
+
+        # Look a bounded distance ahead so planning stays cheap on huge queues
+        candidates = self.queue.get_pending_items(limit=self.batch_size * 8)
+        return next_batch(candidates, self._params_for, self.batch_size, self.batch_max_bytes)
+
+    def _admit(self, ticket: str, items: List[QueueItem], pages: Optional[int] = None) -> bool:
+        """Reserve resources for a job (always succeeds without admission control)."""
+        if self.admission is None:
+            return True
+        cost = estimate_cost(items, self._params_for(items[0]), pages)
+        return self.admission.try_admit(ticket, cost)
+
+    def _release(self, ticket: Optional[str]):
+        """Release a job's resource reservation."""
+        if self.admission is not None:
+            self.admission.release(ticket)
+
+    def _begin_items(self, items: List[QueueItem]):
+        """Mark items as processing and announce them."""
+        for item in items:
+            self.queue.update_status(item.id, QueueItemStatus.PROCESSING)
+            self.active_items[item.id] = item
+            item.pages_done = 0
+            item.stage = ""
+            item.usage = None
+            if self.item_logs is not None:
+                self.item_logs.begin(item)
+
+        for item in items:
+            if self.on_item_started:
+                self.on_item_started(item)
+
+    def _run_items(self, items: List[QueueItem], ticket: Optional[str] = None):
+        """Convert started items: sharded if large enough, else in one job."""
+        if len(items) == 1 and self._may_shard(items[0]) and items[0].page_count is None:
+            # Sharding depends on the page count; count it off this thread first
+            self._launch_count(items[0], ticket)
+            return
+        if len(items) == 1 and self._start_sharded(items[0]):
+            # Shards are admitted individually
+            self._release(ticket)
+            return
+        self._launch(items, ticket)
+
+    def _launch(self, items: List[QueueItem], ticket: Optional[str] = None):
+        """Start converting one item, or several items in a single call."""
+        first = items[0]
+        job_id = first.id if len(items) == 1 else f"batch-{first.id}"
+
+        for item in items:
+            self._item_callbacks[item.id] = self._make_item_callback(item.id, len(items) > 1)
+        self._jobs[job_id] = _Job(job_id, [item.id for item in items], ticket=ticket)
+
+        params = dict(self._params_for(first))
+        if len(items) == 1:
+            params['input_path'] = first.file_path
+        else:
+            params['input_path'] = [item.file_path for item in items]
+
+        # The CLI only reports progress through its output text
+        parse_output = len(items) == 1 and params.get('engine', 'cli') == 'cli'
+        job = self.converter.convert(
+            **params,
+            job_id=job_id,
+            on_output=self._make_output_callback(job_id, [item.id for item in items],
+                                                 parse_progress=parse_output),
+            on_progress=self._make_progress_callback(job_id),
+            on_usage=self._make_usage_callback(job_id),
+            on_complete=lambda return_code, job_id=job_id: self._report(job_id, return_code, None),
+            on_error=lambda error, job_id=job_id: self._report(job_id, None, error)
+        )
+
+        if job is None:
+            # No free converter slot (e.g. a model download is running)
+            self._jobs.pop(job_id, None)
+            self._release(ticket)
+            for item in items:
+                self._finish_item(item.id, QueueItemStatus.FAILED,
+                                  "Conversion already in progress")
+
+    def _make_output_callback(self, job_id: str, item_ids: List[str],
+                              parse_progress: bool = False) -> Optional[Callable[[str], None]]:
+        """
+        Create an output callback tagged with the job ID that also feeds the
+        items' logs and, with ``parse_progress``, reads progress from the text.
+        """
+        on_output = self.on_output
+        item_logs = self.item_logs
+        parser = DoclingProgressParser() if parse_progress else None
+        on_progress = self._make_progress_callback(job_id) if parse_progress else None
+        if on_output is None and item_logs is None and parser is None:
+            return None
+
+        def output(text: str):
+            if item_logs is not None:
+                for item_id in item_ids:
+                    item_logs.write(item_id, text)
+            if on_output is not None:
+                on_output(job_id, text)
+            if parser is not None:
+                for event in parser.feed(text):
+                    on_progress(event)
+        return output
+
+    def _make_progress_callback(self, job_id: str) -> Callable[[ProgressEvent], None]:
+        """Create a progress callback that hands events to the owning thread."""
+        def progress(event: ProgressEvent):
+            self.dispatch(lambda: self._on_job_progress(job_id, event))
+        return progress
+
+    def _on_job_progress(self, job_id: str, event: ProgressEvent):
+        """Apply a job's progress event to its item and the run totals."""
+        job = self._jobs.get(job_id)
+        if job is None or len(job.item_ids) != 1 or job.kind not in ("items", "shard"):
+            # Batched calls interleave documents; they are credited per item on completion
+            return
+        item = self.active_items.get(job.item_ids[0])
+        if item is None:
+            return
+
+        if event.stage:
+            item.stage = event.stage
+        if event.pages_total and job.kind == "items":
+            item.page_count = event.pages_total
+            self.progress.set_item_pages(item.id, event.pages_total)
+        if event.pages:
+            pages_done = item.pages_done + event.pages
+            item.pages_done = min(pages_done, item.page_count) if item.page_count else pages_done
+            self.progress.advance(item.id, event.pages)
+
+        if self.on_item_progress:
+            self.on_item_progress(item)
+
+    def _make_usage_callback(self, job_id: str) -> Callable[[ResourceUsage], None]:
+        """Create a resource usage callback that hands the usage to the owning thread."""
+        def on_usage(usage: ResourceUsage):
+            self.dispatch(lambda: self._on_job_usage(job_id, usage))
+        return on_usage
+
+    def _on_job_usage(self, job_id: str, usage: ResourceUsage):
+        """Attribute a job's resource usage to its items."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        items = [self.active_items[item_id] for item_id in job.item_ids
+                 if item_id in self.active_items]
+        total_size = sum(item.file_size for item in items)
+
+        for item in items:
+            if len(job.item_ids) > 1:
+                fraction = item.file_size / total_size if total_size else 1 / len(items)
+                item_usage = usage.share(fraction)
+            else:
+                item_usage = usage
+            item.usage = item_usage if item.usage is None else item.usage.combine(item_usage)
+
+    def _save_item_logs(self):
+        """Save the item log index in the background."""
+        def save():
+            try:
+                self.item_logs.save()
+            except OSError:
+                pass
+        threading.Thread(target=save, daemon=True).start()
+
+    def _make_item_callback(self, item_id: str, batched: bool
+                            ) -> Callable[[Optional[int], Optional[str], float], None]:
+        """Create the completion handler for one queue item."""
+        def on_item_done(return_code: Optional[int], error: Optional[str], started_at: float):
+            item = self.active_items.get(item_id)
+            if item is None:
+                return
+
+            if batched and error is None:
+                # One call converted several files: judge each by its own output
+                params = self._params_for(item)
+                if output_written_since(params['output_dir'], item.file_path,
+                                        params['output_format'], started_at):
+                    self._finish_item(item_id, QueueItemStatus.COMPLETED)
+                else:
+                    self._finish_item(item_id, QueueItemStatus.FAILED,
+                                      f"no output produced in batch (exit code: {return_code})")
+            elif error is not None:
+                self._finish_item(item_id, QueueItemStatus.FAILED, error)
+            elif return_code == 0:
+                self._finish_item(item_id, QueueItemStatus.COMPLETED)
+            else:
+                self._finish_item(item_id, QueueItemStatus.FAILED,
+                                  f"exit code: {return_code}")
+        return on_item_done
+
+    def _report(self, job_id: str, return_code: Optional[int], error: Optional[str]):
+        """Called from worker threads; hands the result to the owning thread."""
+        def handle():
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                # Late result for a job that was already cancelled
+                return
+
+            self._release(job.ticket)
+            if job.kind == "shard":
+                self._on_shard_done(job, return_code, error)
+            elif job.kind == "merge":
+                self._on_merge_done(job, return_code, error)
+            else:
+                for item_id in job.item_ids:
+                    callback = self._item_callbacks.get(item_id)
+                    if callback:
+                        callback(return_code, error, job.started_at)
+            self._fill_slots()
+        self.dispatch(handle)
+
+    def _finish_item(self, item_id: str, status: QueueItemStatus,
+                     error_message: Optional[str] = None):
+        """Record an item's final status."""
+        item = self.active_items.pop(item_id, None)
+        self._item_callbacks.pop(item_id, None)
+        if item is None:
+            # Late result for an item that was already cancelled
+            return
+
+        if status == QueueItemStatus.COMPLETED and item.duplicate_paths:
+            error_message = self._fan_out(item)
+            if error_message is not None:
+                status = QueueItemStatus.FAILED
+
+        self.queue.update_status(item_id, status, error_message)
+        item.stage = ""
+        self.progress.finish_item(item_id)
+        if item.usage is not None:
+            self.usage.add(item.id, item.filename, item.usage)
+        if self.item_logs is not None:
+            self.item_logs.finish(item)
+
+        cache_key = self._cache_keys.pop(item_id, None)
+        if cache_key is not None and status == QueueItemStatus.COMPLETED:
+            self._store_in_cache(item, cache_key)
+
+        if self.on_item_finished:
+            self.on_item_finished(item)
+
+    def _fan_out(self, item: QueueItem) -> Optional[str]:
+        """Write a completed item's output under its duplicates' names. Returns an error, if any."""
+        params = self._params_for(item)
+        try:
+            fan_out_output(params['output_dir'], item.file_path, params['output_format'],
+                           item.duplicate_paths)
+        except OSError as e:
+            return f"Could not write outputs of duplicates: {e}"
+        return None
+
+    # Result cache
+
+    def _launch_lookup(self, items: List[QueueItem], ticket: Optional[str] = None):
+        """Hash started items on a background thread and restore cached results."""
+        job_id = f"lookup-{items[0].id}"
+        self._jobs[job_id] = _Job(job_id, [item.id for item in items], kind="lookup",
+                                  ticket=ticket)
+        lookups = [(item.id, item.file_path, item.content_hash, dict(self._params_for(item)))
+                   for item in items]
+        cache = self.cache
+        output_callback = self._make_output_callback(job_id, [item.id for item in items])
+
+        def lookup():
+            results = {}
+            for item_id, file_path, content_hash, params in lookups:
+                try:
+                    # Reuses the digest duplicate detection took, if any
+                    key = cache.make_key(file_path, normalized_args(self.converter, params),
+                                         content_hash)
+                    restored = cache.restore(key, file_path, params['output_dir'],
+                                             params['output_format'])
+                except OSError as e:
+                    # Unreadable input: let the conversion report the real error
+                    if output_callback:
+                        output_callback(f"Cache lookup failed: {e}\n")
+                    continue
+                results[item_id] = (key, restored)
+                if restored is not None and output_callback:
+                    output_callback(f"Restored from cache: {restored}\n")
+            self.dispatch(lambda: self._on_lookup_done(job_id, results))
+
+        threading.Thread(target=lookup, daemon=True).start()
+
+    def _on_lookup_done(self, job_id: str, results: Dict[str, Any]):
+        """Finish items restored from the cache and convert the rest."""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            # Lookup for a run that was already cancelled
+            return
+
+        misses = []
+        for item_id in job.item_ids:
+            item = self.active_items.get(item_id)
+            if item is None:
+                continue
+            key, restored = results.get(item_id, (None, None))
+            if restored is not None:
+                self._finish_item(item_id, QueueItemStatus.COMPLETED)
+                continue
+            if key is not None:
+                self._cache_keys[item_id] = key
+            misses.append(item)
+
+        if misses:
+            # The conversion inherits the lookup's reservation
+            self._run_items(misses, job.ticket)
+        else:
+            self._release(job.ticket)
+        self._fill_slots()
+
+    def _store_in_cache(self, item: QueueItem, key: str):
+        """Copy a completed item's outputs into the cache in the background."""
+        params = self._params_for(item)
+        threading.Thread(
+            target=self.cache.store,
+            args=(key, item.file_path, params['output_dir'], params['output_format']),
+            daemon=True
+        ).start()
+
+    # Sharding
+
+    def _may_shard(self, item: QueueItem) -> bool:
+        """Check whether an item is a PDF that sharding applies to."""
+        if self.shard_pages <= 0 or item.file_format != 'pdf':
+            return False
+        return self._params_for(item).get('engine', 'cli') == 'inprocess'
+
+    def _launch_count(self, item: QueueItem, ticket: Optional[str] = None):
+        """Count a started PDF's pages on a background thread, then convert it."""
+        job_id = f"count-{item.id}"
+        self._jobs[job_id] = _Job(job_id, [item.id], kind="count", ticket=ticket)
+        file_path = item.file_path
+
+        def count():
+            pages = count_pdf_pages(file_path)
+            self.dispatch(lambda: self._on_count_done(job_id, pages))
+
+        threading.Thread(target=count, daemon=True).start()
+
+    def _on_count_done(self, job_id: str, pages: Optional[int]):
+        """Shard or convert an item once its pages are counted."""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            # Count for an item that was already cancelled
+            return
+        item = self.active_items.get(job.item_ids[0])
+        if item is None:
+            self._release(job.ticket)
+        else:
+            # 0 marks an unreadable PDF so it is not counted again
+            item.page_count = pages or 0
+            # The conversion inherits the count's reservation
+            self._run_items([item], job.ticket)
+        self._fill_slots()
+
+    def _start_sharded(self, item: QueueItem) -> bool:
+        """Split a large PDF into page-range shards. Returns False if not sharded."""
+        if not self._may_shard(item):
+            return False
+
+        if not item.page_count or item.page_count < max(self.shard_min_pages, self.shard_pages + 1):
+            return False
+
+        plan = ShardPlan.create(item.id, plan_page_ranges(item.page_count, self.shard_pages))
+        self._shard_plans[item.id] = plan
+        self.progress.set_item_pages(item.id, item.page_count)
+        item.shards_total = plan.total
+        item.shards_done = 0
+
+        if self.on_item_progress:
+            self.on_item_progress(item)
+        return True
+
+    def _launch_shard(self, plan: ShardPlan):
+        """Start the next page-range shard of a sharded item."""
+        item = self.active_items[plan.item_id]
+        index, page_range, shard_path = plan.take_next()
+        job_id = f"{item.id}.{index + 1}"
+        self._jobs[job_id] = _Job(job_id, [item.id], kind="shard", shard_index=index,
+                                  ticket=job_id)
+
+        params = dict(self._params_for(item))
+        params['input_path'] = item.file_path
+
+        job = self.converter.convert(
+            **params,
+            job_id=job_id,
+            page_range=page_range,
+            shard_output=str(shard_path),
+            on_output=self._make_output_callback(job_id, [item.id]),
+            on_progress=self._make_progress_callback(job_id),
+            on_usage=self._make_usage_callback(job_id),
+            on_complete=lambda return_code, job_id=job_id: self._report(job_id, return_code, None),
+            on_error=lambda error, job_id=job_id: self._report(job_id, None, error)
+        )
+
+        if job is None:
+            job = self._jobs.pop(job_id)
+            self._release(job.ticket)
+            self._on_shard_done(job, None, "Conversion already in progress")
+
+    def _on_shard_done(self, job: _Job, return_code: Optional[int], error: Optional[str]):
+        """Record a finished shard and merge once all shards are done."""
+        item_id = job.item_ids[0]
+        plan = self._shard_plans.get(item_id)
+        item = self.active_items.get(item_id)
+        if plan is None or item is None:
+            return
+
+        plan.running -= 1
+        if error is None and return_code == 0:
+            plan.done += 1
+            item.shards_done = plan.done
+            if self.on_item_progress:
+                self.on_item_progress(item)
+        elif plan.error is None:
+            start, end = plan.page_ranges[job.shard_index]
+            reason = error if error is not None else f"exit code: {return_code}"
+            plan.error = f"pages {start}-{end} failed ({reason})"
+
+        if plan.error is not None and plan.running == 0:
+            self._shard_plans.pop(item_id)
+            plan.cleanup()
+            self._finish_item(item_id, QueueItemStatus.FAILED, plan.error)
+        # Once every shard is done, _fill_slots admits the merge
+
+    def _launch_merge(self, plan: ShardPlan, ticket: Optional[str] = None):
+        """Stitch the shard outputs of an item into its final output."""
+        item = self.active_items[plan.item_id]
+        plan.merging = True
+        job_id = f"{item.id}.merge"
+        self._jobs[job_id] = _Job(job_id, [item.id], kind="merge", ticket=ticket)
+
+        params = self._params_for(item)
+        job = self.converter.merge_shards(
+            shard_paths=[str(path) for path in plan.shard_paths],
+            input_path=item.file_path,
+            output_format=params['output_format'],
+            output_dir=params['output_dir'],
+            image_export_mode=params.get('image_export_mode', 'embedded'),
+            job_id=job_id,
+            on_output=self._make_output_callback(job_id, [item.id]),
+            on_usage=self._make_usage_callback(job_id),
+            on_complete=lambda return_code, job_id=job_id: self._report(job_id, return_code, None),
+            on_error=lambda error, job_id=job_id: self._report(job_id, None, error)
+        )
+
+        if job is None:
+            job = self._jobs.pop(job_id)
+            self._release(job.ticket)
+            self._on_merge_done(job, None, "Conversion already in progress")
+
+    def _on_merge_done(self, job: _Job, return_code: Optional[int], error: Optional[str]):
+        """Finish a sharded item after its merge job."""
+        item_id = job.item_ids[0]
+        plan = self._shard_plans.pop(item_id, None)
+        if plan is not None:
+            plan.cleanup()
+
+        if error is not None:
+            self._finish_item(item_id, QueueItemStatus.FAILED, error)
+        elif return_code == 0:
+            self._finish_item(item_id, QueueItemStatus.COMPLETED)
+        else:
+            self._finish_item(item_id, QueueItemStatus.FAILED, f"merge failed (exit code: {return_code})")
@@ -0,0 +1,216 @@
+"""Single-pass folder scanning for supported input files."""
+
+import fnmatch
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+
+# Symlink policies
+SYMLINKS_SKIP = "skip"  # ignore every symlink
+SYMLINKS_FILES = "files"  # follow links to files, not into linked directories
+SYMLINKS_FOLLOW = "follow"  # follow links to files and directories (loops are skipped)
+SYMLINK_POLICIES = (SYMLINKS_SKIP, SYMLINKS_FILES, SYMLINKS_FOLLOW)
+
+
+@dataclass(frozen=True)
+class ScannedFile:
+    """A file found by a scan, with the stat fields taken from its directory entry."""
+
+    path: str  # Absolute path
+    size: int  # Size in bytes
+    mtime_ns: int  # Modification time (nanoseconds since the epoch)
+    device: int  # st_dev of the file (the link target for followed symlinks)
+    inode: int  # st_ino of the file
+
+
+@dataclass
+class ScanOptions:
+    """What a folder scan visits and which files it reports."""
+
+    recursive: bool = True
+    extensions: Optional[Set[str]] = None  # Lowercase, without dot (None = any)
+    include: List[str] = field(default_factory=list)  # Globs a file must match (empty = all)
+    exclude: List[str] = field(default_factory=list)  # Globs that drop files and prune folders
+    min_size: int = 0  # Bytes
+    max_size: int = 0  # Bytes (0 = no limit)
+    symlinks: str = SYMLINKS_FILES
+    workers: int = 1  # Threads listing directories in parallel
+
+    @classmethod
+    def from_config(cls, config, extensions: Optional[Iterable[str]] = None,
+                    recursive: bool = True) -> "ScanOptions":
+        """Create options from the ``scan`` config section."""
+        symlinks = config.get("scan", "symlinks", default=SYMLINKS_FILES)
+        return cls(
+            recursive=recursive,
+            extensions=set(extensions) if extensions is not None else None,
+            include=list(config.get("scan", "includeGlobs", default=[]) or []),
+            exclude=list(config.get("scan", "excludeGlobs", default=[]) or []),
+            min_size=int(config.get("scan", "minSizeKB", default=0) or 0) * 1024,
+            max_size=int(config.get("scan", "maxSizeMB", default=0) or 0) * 1024 * 1024,
+            symlinks=symlinks if symlinks in SYMLINK_POLICIES else SYMLINKS_FILES,
+            workers=max(1, int(config.get("scan", "workers", default=1) or 1)),
+        )
+
+
+def _matches(patterns: List[str], name: str, relative: str) -> bool:
+    """
+    Check a path against globs.
+
+    Patterns containing a slash match the path relative to the scanned
+    folder (with forward slashes); others match the file or folder name.
+    """
+    for pattern in patterns:
+        if fnmatch.fnmatch(relative if "/" in pattern else name, pattern):
+            return True
+    return False
+
+
+class FolderScanner:
+    """
+    Walks a folder tree once with ``os.scandir`` and reports matching files.
+
+    Extensions are classified from the entry name (case-insensitively)
+    before anything is stat-ed, so unsupported files cost no system call
+    beyond the directory listing, and the one stat taken for each match is
+    returned with it for the queue to reuse. With more than one worker,
+    subdirectories are listed on a thread pool, which hides the latency of
+    network file systems; files are then reported in the order their
+    directories finish.
+    """
+
+    def __init__(self, options: Optional[ScanOptions] = None):
+        """
+        Initialize FolderScanner.
+
+        Args:
+            options: Scan options (default: recursive, any extension)
+        """
+        self.options = options or ScanOptions()
+        self._lock = threading.Lock()  # guards the visited set across listing threads
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop running scans before they list another directory (thread-safe)."""
+        self._stopped.set()
+
+    def scan(self, folder_path: str) -> Iterator[ScannedFile]:
+        """
+        Scan a folder, yielding matching files as they are found.
+
+        Args:
+            folder_path: Folder to scan
+
+        Returns:
+            Iterator of the files found (unreadable subfolders are skipped)
+
+        Raises:
+            ValueError: If folder_path is not a folder
+        """
+        root = os.path.abspath(folder_path)
+        if not os.path.isdir(root):
+            raise ValueError(f"Invalid folder: {folder_path}")
+        return self._walk(root)
+
+    def _walk(self, root: str) -> Iterator[ScannedFile]:
+        """Yield the matching files below root."""
+        visited: Set[Tuple[int, int]] = set()
+        if self.options.symlinks == SYMLINKS_FOLLOW:
+            stat = os.stat(root)
+            visited.add((stat.st_dev, stat.st_ino))
+
+        if self.options.workers <= 1:
+            pending = [root]
+            while pending and not self._stopped.is_set():
+                files, subdirs = self._list(root, pending.pop(), visited)
+                yield from files
+                pending.extend(reversed(subdirs))
+            return
+
+        with ThreadPoolExecutor(max_workers=self.options.workers,
+                                thread_name_prefix="scan") as executor:
+            running: Set[Future] = {executor.submit(self._list, root, root, visited)}
+            try:
+                while running:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        files, subdirs = future.result()
+                        for subdir in subdirs:
+                            running.add(executor.submit(self._list, root, subdir, visited))
+                        yield from files
+            finally:
+                # Stopped early (or failed): don't list the rest of the tree
+                for future in running:
+                    future.cancel()
+
+    def _list(self, root: str, directory: str,
+              visited: Set[Tuple[int, int]]) -> Tuple[List[ScannedFile], List[str]]:
+        """List one directory: its matching files and the subdirectories to visit."""
+        options = self.options
+        if self._stopped.is_set():
+            return [], []
+        patterns = bool(options.include or options.exclude)
+        prefix = len(os.path.join(root, ""))
+        files: List[ScannedFile] = []
+        subdirs: List[str] = []
+
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            return files, subdirs
+
+        for entry in entries:
+            try:
+                is_link = entry.is_symlink()
+                if is_link and options.symlinks == SYMLINKS_SKIP:
+                    continue
+
+                relative = entry.path[prefix:].replace(os.sep, "/") if patterns else ""
+                if options.exclude and _matches(options.exclude, entry.name, relative):
+                    continue
+
+                if entry.is_dir():
+                    if not options.recursive:
+                        continue
+                    if options.symlinks == SYMLINKS_FOLLOW:
+                        stat = entry.stat()
+                        key = (stat.st_dev, stat.st_ino)
+                        with self._lock:
+                            if key in visited:
+                                continue
+                            visited.add(key)
+                    elif is_link:
+                        continue
+                    subdirs.append(entry.path)
+                    continue
+
+                if options.extensions is not None:
+                    extension = os.path.splitext(entry.name)[1][1:].lower()
+                    if extension not in options.extensions:
+                        continue
+                if options.include and not _matches(options.include, entry.name, relative):
+                    continue
+                if not entry.is_file():
+                    continue
+
+                stat = entry.stat()
+                if stat.st_size < options.min_size:
+                    continue
+                if options.max_size and stat.st_size > options.max_size:
+                    continue
+                files.append(ScannedFile(entry.path, stat.st_size, stat.st_mtime_ns,
+                                         stat.st_dev, stat.st_ino))
+            except OSError:
+                # Vanished or unreadable entry (e.g. a dangling symlink)
+                continue
+
+        return files, subdirs
+
+
+def scan_folder(folder_path: str, options: Optional[ScanOptions] = None) -> Iterator[ScannedFile]:
+    """Scan a folder with a FolderScanner (see FolderScanner.scan)."""
+    return FolderScanner(options).scan(folder_path)
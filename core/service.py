@@ -0,0 +1,513 @@
+"""
+Local HTTP job service.
+
+Exposes one warm conversion backend (queue, runner and converter) to other
+tools on the same host::
+
+    python main.py --serve --port 8765 --engine inprocess
+    python -m core.service -c profile.json
+
+Endpoints (JSON unless noted):
+
+    GET    /stats                 Queue statistics
+    GET    /jobs                  All jobs
+    POST   /jobs                  Submit {"path": ..., "options": {...}}, or
+                                  upload raw bytes with ?filename=name.pdf
+    GET    /jobs/<id>             Job status
+    GET    /jobs/<id>/output      Converted output (file bytes)
+    DELETE /jobs/<id>             Cancel a pending or running job
+
+Each job writes to its own subdirectory of the output directory so equally
+named files from different clients do not overwrite each other. A finished
+job is forgotten (and its upload deleted) once its output was downloaded,
+or ``service.jobTtl`` seconds after it finished; its output stays on disk. Requests
+are served on separate threads; queue state is only touched on the
+service's own thread, which never waits for a conversion, so status
+polling stays responsive while documents convert.
+"""
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from config import Config
+from core.batch import (configure_runner, conversion_kwargs, create_result_cache,
+                        params_from_config)
+from core.converter import DoclingConverter
+from core.ordering import estimate_seconds
+from core.outputs import expected_output_path
+from core.queue import ConversionQueue, QueueItem, QueueItemStatus
+from core.runner import QueueRunner
+
+
+class ServiceError(Exception):
+    """A request the service cannot fulfil (carries the HTTP status)."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ConversionService:
+    """Owns a queue, runner and converter and serializes access to them."""
+
+    # Per-job options clients may override
+    OVERRIDABLE_OPTIONS = {
+        'output_format', 'ocr_enabled', 'force_ocr', 'ocr_lang', 'ocr_engine',
+        'pipeline', 'vlm_model', 'extract_tables', 'enrich_code', 'enrich_formula',
+        'enrich_picture_classes', 'enrich_picture_description', 'image_export_mode',
+        'pdf_backend', 'pdf_password', 'table_mode'
+    }
+
+    # Seconds between checks for expired jobs while the service is idle
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(self, config: Config, run_params: Dict[str, Any], max_workers: int = 1,
+                 upload_dir: Optional[str] = None, job_ttl: float = 3600):
+        """
+        Initialize ConversionService.
+
+        Args:
+            config: Application config (batching, sharding and cache settings)
+            run_params: Default DoclingConverter.convert keyword arguments;
+                        ``output_dir`` is the root for per-job output folders
+            max_workers: Number of concurrent conversions
+            upload_dir: Directory for uploaded files (default: a temporary one)
+            job_ttl: Seconds a finished job is kept when its output is never fetched
+        """
+        self.run_params = run_params
+        self.output_root = Path(run_params['output_dir'])
+        self.upload_dir = Path(upload_dir or tempfile.mkdtemp(prefix="docling_uploads_"))
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.job_ttl = job_ttl
+
+        self.queue = ConversionQueue()
+        # Items are prioritized as they are queued, before their per-job
+        # options are recorded, so ordering estimates use the defaults
+        self.queue.set_ordering(config.get("processing", "ordering", default="fifo"),
+                                lambda item: estimate_seconds(item, self.run_params))
+        self.converter = DoclingConverter()
+        cli_path = config.get("processing", "doclingCliPath", default="auto")
+        if cli_path and cli_path != "auto":
+            self.converter.docling_path = cli_path
+
+        self._events: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue()
+        self._item_params: Dict[str, Dict[str, Any]] = {}
+        # Upload folder of each job submitted as an upload
+        self._uploads: Dict[str, Path] = {}
+        # Finished jobs in the order they finished, with the time they did
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self.runner = QueueRunner(
+            self.queue,
+            self.converter,
+            dispatch=self._events.put,
+            max_workers=max_workers,
+            cache=create_result_cache(config),
+            on_item_finished=self._on_item_finished
+        )
+        configure_runner(self.runner, config)
+        self._thread = threading.Thread(target=self._run_events, daemon=True)
+
+    def start(self):
+        """Start the thread that owns the queue."""
+        self._thread.start()
+
+    def stop(self):
+        """Cancel running conversions and stop the owner thread."""
+        self.call(self.runner.cancel_all)
+        self._events.put(None)
+        self._thread.join(timeout=10)
+        self.converter.shutdown()
+
+    def _run_events(self):
+        """Run queued functions until stop() posts None."""
+        while True:
+            try:
+                fn = self._events.get(timeout=self.SWEEP_INTERVAL)
+            except queue.Empty:
+                fn = self._evict_expired
+            if fn is None:
+                break
+            try:
+                fn()
+            except Exception as e:
+                print(f"Service error: {e}")
+
+    def call(self, fn: Callable[[], Any], timeout: float = 30) -> Any:
+        """Run ``fn`` on the owner thread and return its result."""
+        future: Future = Future()
+
+        def run():
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+        self._events.put(run)
+        return future.result(timeout=timeout)
+
+    # Operations (called from request threads)
+
+    def submit(self, file_path: str, options: Optional[Dict[str, Any]] = None,
+               upload: bool = False) -> Dict[str, Any]:
+        """
+        Queue a file for conversion and return its job description.
+
+        Args:
+            file_path: File to convert
+            options: Per-job overrides of OVERRIDABLE_OPTIONS
+            upload: ``file_path`` was written by save_upload; its folder is
+                    deleted with the job, or right away if the job is rejected
+        """
+        options = options or {}
+        unknown = set(options) - self.OVERRIDABLE_OPTIONS
+        if unknown:
+            if upload:
+                shutil.rmtree(Path(file_path).parent, ignore_errors=True)
+            raise ServiceError(400, f"Unsupported options: {', '.join(sorted(unknown))}")
+        if not os.path.isfile(file_path):
+            raise ServiceError(404, f"File not found: {file_path}")
+
+        def add():
+            item = self.queue.add_file(file_path)
+            if upload:
+                self._uploads[item.id] = Path(file_path).parent
+            params = dict(self.run_params)
+            params.update(options)
+            params['output_dir'] = str(self.output_root / item.id)
+            Path(params['output_dir']).mkdir(parents=True, exist_ok=True)
+            self._item_params[item.id] = params
+            if self.runner.is_running:
+                self.runner.wake()
+            else:
+                self.runner.start(lambda queued: self._item_params[queued.id])
+            return self._describe(item)
+        return self.call(add)
+
+    def save_upload(self, filename: str, stream, length: int) -> str:
+        """Write an uploaded file to the upload directory and return its path."""
+        name = os.path.basename(filename)
+        if not name:
+            raise ServiceError(400, "Missing filename")
+        target_dir = self.upload_dir / uuid.uuid4().hex
+        target_dir.mkdir(parents=True)
+        target = target_dir / name
+        remaining = length
+        with open(target, 'wb') as f:
+            while remaining > 0:
+                chunk = stream.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+        if remaining:
+            shutil.rmtree(target_dir, ignore_errors=True)
+            raise ServiceError(400, "Incomplete upload")
+        return str(target)
+
+    def job(self, item_id: str) -> Dict[str, Any]:
+        """Get a job description."""
+        def get():
+            item = self.queue.get_item(item_id)
+            if item is None:
+                raise ServiceError(404, f"Unknown job: {item_id}")
+            return self._describe(item)
+        return self.call(get)
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """Get all job descriptions."""
+        return self.call(lambda: [self._describe(item) for item in self.queue])
+
+    def statistics(self) -> Dict[str, int]:
+        """Get queue statistics."""
+        return self.call(self.queue.get_statistics)
+
+    def cancel(self, item_id: str) -> Dict[str, Any]:
+        """Cancel a job."""
+        def cancel():
+            item = self.queue.get_item(item_id)
+            if item is None:
+                raise ServiceError(404, f"Unknown job: {item_id}")
+            if not self.runner.cancel_item(item_id):
+                raise ServiceError(409, f"Job {item_id} already finished")
+            return self._describe(item)
+        return self.call(cancel)
+
+    def output_path(self, item_id: str) -> Path:
+        """Get the output file of a completed job."""
+        def get():
+            item = self.queue.get_item(item_id)
+            if item is None:
+                raise ServiceError(404, f"Unknown job: {item_id}")
+            if item.status != QueueItemStatus.COMPLETED:
+                raise ServiceError(409, f"Job {item_id} is {item.status.value}")
+            return self._output_path(item)
+        path = self.call(get)
+        if not path.exists():
+            raise ServiceError(404, f"Output missing: {path.name}")
+        return path
+
+    def release(self, item_id: str):
+        """Forget a job whose output was downloaded."""
+        def forget():
+            if item_id in self._finished:
+                self._evict(item_id)
+        self.call(forget)
+
+    # Job retention (owner thread)
+
+    def _on_item_finished(self, item: QueueItem):
+        """Start a finished job's time to live."""
+        self._finished[item.id] = time.monotonic()
+        self._evict_expired()
+
+    def _evict_expired(self):
+        """Forget jobs that finished more than job_ttl seconds ago."""
+        deadline = time.monotonic() - self.job_ttl
+        while self._finished:
+            item_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > deadline:
+                break
+            self._evict(item_id)
+
+    def _evict(self, item_id: str):
+        """Drop a finished job's queue item, options and upload."""
+        self._finished.pop(item_id, None)
+        self.queue.remove_item(item_id)
+        self._item_params.pop(item_id, None)
+        upload = self._uploads.pop(item_id, None)
+        if upload is not None:
+            shutil.rmtree(upload, ignore_errors=True)
+
+    def _output_path(self, item: QueueItem) -> Path:
+        """Get where a job's output is written."""
+        params = self._item_params[item.id]
+        return expected_output_path(params['output_dir'], item.file_path, params['output_format'])
+
+    def _describe(self, item: QueueItem) -> Dict[str, Any]:
+        """Build the JSON description of a job (owner thread)."""
+        return {
+            'id': item.id,
+            'file_path': item.file_path,
+            'filename': item.filename,
+            'status': item.status.value,
+            'error_message': item.error_message,
+            'output_path': str(self._output_path(item)),
+            'added_time': item.added_time.isoformat() if item.added_time else None,
+            'start_time': item.start_time.isoformat() if item.start_time else None,
+            'end_time': item.end_time.isoformat() if item.end_time else None,
+            'usage': asdict(item.usage) if item.usage else None,
+        }
+
+
+def _parse_query_value(value: str) -> Any:
+    """Interpret a query option as JSON (true, 3, null) or else as a string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Maps HTTP requests onto ConversionService operations."""
+
+    service: ConversionService = None
+    server_version = "DoclingGUIService/1.0"
+
+    def log_message(self, format: str, *args):
+        """Log requests to stdout instead of stderr."""
+        print(f"{self.address_string()} - {format % args}", flush=True)
+
+    def _route(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Split the request path into segments and query parameters."""
+        url = urlparse(self.path)
+        return [part for part in url.path.split('/') if part], parse_qs(url.query)
+
+    def _send_json(self, status: int, payload: Any):
+        """Write a JSON response."""
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, handler: Callable[[], Tuple[int, Any]]):
+        """Run a handler and translate errors into JSON responses."""
+        try:
+            status, payload = handler()
+            if payload is not None:
+                self._send_json(status, payload)
+        except ServiceError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+
+    def do_GET(self):
+        """Handle status, listing and output requests."""
+        def handle():
+            parts, _ = self._route()
+            if parts == ['stats']:
+                return 200, self.service.statistics()
+            if parts == ['jobs']:
+                return 200, self.service.jobs()
+            if len(parts) == 2 and parts[0] == 'jobs':
+                return 200, self.service.job(parts[1])
+            if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'output':
+                self._send_file(self.service.output_path(parts[1]))
+                self.service.release(parts[1])
+                return 200, None
+            raise ServiceError(404, "Not found")
+        self._handle(handle)
+
+    def do_POST(self):
+        """Handle job submission."""
+        def handle():
+            parts, query = self._route()
+            if parts != ['jobs']:
+                raise ServiceError(404, "Not found")
+
+            header = self.headers.get("Content-Length")
+            try:
+                length = int(header) if header is not None else 0
+            except ValueError:
+                raise ServiceError(400, "Invalid Content-Length")
+            if length < 0:
+                raise ServiceError(400, "Invalid Content-Length")
+            content_type = self.headers.get("Content-Type", "")
+            if content_type.startswith("application/json"):
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    raise ServiceError(400, "Invalid JSON")
+                if not isinstance(request, dict):
+                    raise ServiceError(400, "Request body must be a JSON object")
+                if not isinstance(request.get('path'), str):
+                    raise ServiceError(400, "Missing 'path'")
+                options = request.get('options')
+                if options is not None and not isinstance(options, dict):
+                    raise ServiceError(400, "'options' must be a JSON object")
+                return 201, self.service.submit(request['path'], options)
+
+            if header is None:
+                raise ServiceError(411, "Content-Length required")
+            filename = query.get('filename', [""])[0]
+            file_path = self.service.save_upload(filename, self.rfile, length)
+            options = {key: _parse_query_value(values[0])
+                       for key, values in query.items() if key != 'filename'}
+            return 201, self.service.submit(file_path, options, upload=True)
+        self._handle(handle)
+
+    def do_DELETE(self):
+        """Handle job cancellation."""
+        def handle():
+            parts, _ = self._route()
+            if len(parts) == 2 and parts[0] == 'jobs':
+                return 200, self.service.cancel(parts[1])
+            raise ServiceError(404, "Not found")
+        self._handle(handle)
+
+    def _send_file(self, path: Path):
+        """Stream a file as the response body."""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            raise ServiceError(404, f"Output missing: {path.name}")
+        with f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("Content-Disposition", f'attachment; filename="{path.name}"')
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile)
+
+
+def create_server(service: ConversionService, host: str, port: int) -> ThreadingHTTPServer:
+    """Create an HTTP server bound to ``service`` (one thread per request)."""
+    handler = type("ServiceRequestHandler", (_RequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the job service until interrupted.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m core.service",
+        description="Serve the Docling conversion queue over local HTTP."
+    )
+    parser.add_argument("--host", help="Address to bind (default: from config)")
+    parser.add_argument("--port", type=int, help="Port to listen on (default: from config)")
+    parser.add_argument("-c", "--config", help="Settings profile in the config.json schema")
+    parser.add_argument("-o", "--output-dir", help="Root directory for job outputs")
+    parser.add_argument("--engine", choices=["cli", "inprocess"], help="Conversion engine")
+    parser.add_argument("-w", "--workers", type=int, help="Number of concurrent conversions")
+    args = parser.parse_args(argv)
+
+    config = Config(args.config)
+    params = params_from_config(config)
+    if args.output_dir:
+        params['output_dir'] = args.output_dir
+    if args.engine:
+        params['engine'] = args.engine
+    artifacts_path = None
+    if params['processing_mode'] == "offline":
+        artifacts_path = config.get("processing", "artifactsPath")
+
+    try:
+        Path(params['output_dir']).mkdir(parents=True, exist_ok=True)
+        service = ConversionService(
+            config,
+            conversion_kwargs(params, artifacts_path),
+            max_workers=args.workers or config.get("processing", "maxWorkers", default=1),
+            upload_dir=config.get("service", "uploadDir", default="") or None,
+            job_ttl=config.get("service", "jobTtl", default=3600)
+        )
+    except OSError as e:
+        print(f"Error: {e}")
+        return 2
+
+    host = args.host or config.get("service", "host", default="127.0.0.1")
+    port = args.port if args.port is not None else config.get("service", "port", default=8765)
+    try:
+        server = create_server(service, host, port)
+    except OSError as e:
+        print(f"Error: could not listen on {host}:{port}: {e}")
+        return 2
+
+    service.start()
+    print(f"Serving Docling conversions on http://{host}:{server.server_address[1]} "
+          f"(engine: {params['engine']}, outputs: {params['output_dir']})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Page-range sharding of large PDFs across conversion workers."""
+
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+# Matches page objects but not the /Pages tree nodes
+_PAGE_OBJECT_PATTERN = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+
+
+def count_pdf_pages(file_path: str) -> Optional[int]:
+    """
+    Count the pages of a PDF file.
+
+    Uses pypdfium2 (installed with docling) when available and falls back to
+    counting page objects in the raw file.
+
+    Args:
+        file_path: Path to the PDF
+
+    Returns:
+        Number of pages, or None if the file could not be read
+    """
+    try:
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    try:
+        count = 0
+        tail = b""
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(1024 * 1024)
+                if not chunk:
+                    break
+                data = tail + chunk
+                count += len(_PAGE_OBJECT_PATTERN.findall(data))
+                # Keep a short overlap so matches spanning chunks are found;
+                # matches fully inside it are counted in the next round instead
+                tail = data[-32:]
+                count -= len(_PAGE_OBJECT_PATTERN.findall(tail))
+        count += len(_PAGE_OBJECT_PATTERN.findall(tail))
+        return count or None
+    except OSError:
+        return None
+
+
+def plan_page_ranges(page_count: int, pages_per_shard: int) -> List[Tuple[int, int]]:
+    """
+    Split a document into page ranges.
+
+    Args:
+        page_count: Total number of pages
+        pages_per_shard: Pages per shard
+
+    Returns:
+        List of 1-based inclusive (start, end) page ranges in page order
+    """
+    pages_per_shard = max(1, pages_per_shard)
+    return [
+        (start, min(start + pages_per_shard - 1, page_count))
+        for start in range(1, page_count + 1, pages_per_shard)
+    ]
+
+
+@dataclass
+class ShardPlan:
+    """Tracks the page-range sub-jobs of one sharded queue item."""
+
+    item_id: str
+    page_ranges: List[Tuple[int, int]]
+    shard_dir: Path
+    next_index: int = 0
+    running: int = 0
+    done: int = 0
+    error: Optional[str] = None
+    merging: bool = False
+    shard_paths: List[Path] = field(default_factory=list)
+
+    @classmethod
+    def create(cls, item_id: str, page_ranges: List[Tuple[int, int]]) -> "ShardPlan":
+        """Create a plan with a fresh temporary directory for shard outputs."""
+        shard_dir = Path(tempfile.mkdtemp(prefix=f"docling_shards_{item_id}_"))
+        paths = [shard_dir / f"shard_{index:05d}.json" for index in range(len(page_ranges))]
+        return cls(item_id=item_id, page_ranges=page_ranges, shard_dir=shard_dir,
+                   shard_paths=paths)
+
+    @property
+    def total(self) -> int:
+        """Number of shards."""
+        return len(self.page_ranges)
+
+    @property
+    def has_pending(self) -> bool:
+        """Check if shards remain to be started."""
+        return self.error is None and self.next_index < self.total
+
+    @property
+    def ready_to_merge(self) -> bool:
+        """Check if every shard finished successfully."""
+        return self.error is None and self.done == self.total and not self.merging
+
+    def take_next(self) -> Tuple[int, Tuple[int, int], Path]:
+        """Reserve the next shard: returns (index, page range, output path)."""
+        index = self.next_index
+        self.next_index += 1
+        self.running += 1
+        return index, self.page_ranges[index], self.shard_paths[index]
+
+    def cleanup(self):
+        """Remove intermediate shard outputs."""
+        shutil.rmtree(self.shard_dir, ignore_errors=True)
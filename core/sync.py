@@ -0,0 +1,265 @@
+"""Incremental folder sync: track converted files so re-runs skip them."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from core.batching import freeze_params
+from core.dedupe import content_digest
+from core.outputs import expected_output_path
+from core.scanner import ScannedFile
+
+
+# Conversion parameters that do not change the produced output
+_IGNORED_OPTIONS = {'verbose', 'engine', 'artifacts_path'}
+
+
+def options_hash(params: Dict[str, Any]) -> str:
+    """
+    Hash the conversion parameters that determine a file's output.
+
+    Args:
+        params: DoclingConverter.convert keyword arguments
+
+    Returns:
+        Hex digest of the relevant parameters
+    """
+    relevant = {key: value for key, value in params.items() if key not in _IGNORED_OPTIONS}
+    return hashlib.sha256(repr(freeze_params(relevant)).encode()).hexdigest()
+
+
+def output_paths(input_path: str, output_dir: str, output_format: str) -> List[str]:
+    """Get the files and directories a conversion wrote for one input."""
+    output_path = expected_output_path(output_dir, input_path, output_format)
+    paths = [str(output_path)]
+    artifacts_dir = output_path.parent / f"{output_path.stem}_artifacts"
+    if artifacts_dir.is_dir():
+        paths.append(str(artifacts_dir))
+    return paths
+
+
+class SyncManifest:
+    """
+    Persistent record of converted source files.
+
+    Each entry maps an absolute source path to its size, modification time,
+    content hash, options hash, output paths and last status. Files are
+    considered up to date when size and mtime are unchanged; the content
+    hash is only computed when they differ, so a re-scan of a large,
+    mostly unchanged tree costs one ``stat`` per file (none for files a
+    folder scan already stat-ed) plus one listing per output directory.
+    """
+
+    VERSION = 1
+
+    def __init__(self, manifest_path: str):
+        """
+        Initialize SyncManifest.
+
+        Args:
+            manifest_path: JSON file holding the manifest
+        """
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._snapshots: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load the manifest from disk."""
+        if not self.manifest_path.exists():
+            return
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError) as e:
+            print(f"Error loading sync manifest: {e}. Starting with an empty manifest.")
+
+    def save(self):
+        """Write the manifest to disk."""
+        with self._lock:
+            data = {'version': self.VERSION, 'entries': self.entries}
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(".tmp")
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp_path, self.manifest_path)
+            except OSError as e:
+                print(f"Error saving sync manifest: {e}")
+
+    def plan(self, files: Iterable[Union[str, ScannedFile]], opts_hash: str) -> List[str]:
+        """
+        Select the files that need converting.
+
+        A file is stale if it has no entry, its last conversion did not
+        complete, it was converted with different options, one of its
+        outputs is missing, or its content changed. Outputs are looked up
+        in one listing per output directory rather than stat-ed one by one.
+
+        Args:
+            files: Candidate source files: paths (stat-ed here) or files
+                   found by a folder scan (their size and mtime are reused)
+            opts_hash: options_hash() of the settings the run will use
+
+        Returns:
+            Absolute paths of stale files, in input order
+        """
+        stale = []
+        listings: Dict[str, Set[str]] = {}
+        for file in files:
+            if isinstance(file, ScannedFile):
+                path, size, mtime_ns = file.path, file.size, file.mtime_ns
+            else:
+                path = os.path.abspath(file)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                size, mtime_ns = st.st_size, st.st_mtime_ns
+
+            if self._is_stale(path, size, mtime_ns, opts_hash, listings):
+                self._snapshots[path] = (size, mtime_ns)
+                stale.append(path)
+        return stale
+
+    def _is_stale(self, path: str, size: int, mtime_ns: int, opts_hash: str,
+                  listings: Dict[str, Set[str]]) -> bool:
+        """Check one file against its manifest entry."""
+        entry = self.entries.get(path)
+        if entry is None or entry['status'] != 'completed' or entry['options'] != opts_hash:
+            return True
+        if not all(self._output_exists(output, listings) for output in entry['outputs']):
+            return True
+        if entry['size'] == size and entry['mtime_ns'] == mtime_ns:
+            return False
+
+        # Size or mtime changed: only the content hash can tell (e.g. a touch)
+        if entry['hash'] is None or entry['size'] != size:
+            return True
+        try:
+            if content_digest(path) != entry['hash']:
+                return True
+        except OSError:
+            return True
+
+        with self._lock:
+            entry['mtime_ns'] = mtime_ns
+        return False
+
+    @staticmethod
+    def _output_exists(output: str, listings: Dict[str, Set[str]]) -> bool:
+        """Check for an output in its directory's (cached) listing."""
+        directory, name = os.path.split(output)
+        names = listings.get(directory)
+        if names is None:
+            try:
+                names = set(os.listdir(directory or os.curdir))
+            except OSError:
+                names = set()
+            listings[directory] = names
+        return name in names
+
+    def record(self, file_path: str, opts_hash: str, outputs: List[str], status: str,
+               content_hash: Optional[str] = None):
+        """
+        Record the result of converting a file returned by plan().
+
+        Hashes the file, so callers on a UI thread should run this in the
+        background. Safe to call from several threads.
+
+        Args:
+            file_path: Source file path
+            opts_hash: options_hash() of the settings used
+            outputs: Paths written for the file (see output_paths)
+            status: Final queue status value ("completed", "failed", ...)
+            content_hash: content_digest() of the file, if already known
+                          (then it is not read again)
+        """
+        path = os.path.abspath(file_path)
+        snapshot = self._snapshots.pop(path, None)
+
+        if status != 'completed':
+            content_hash = None
+        else:
+            try:
+                if content_hash is None:
+                    content_hash = content_digest(path)
+                st = os.stat(path)
+                if snapshot is not None and snapshot != (st.st_size, st.st_mtime_ns):
+                    # Modified while converting: the output may not match it
+                    content_hash = None
+            except OSError:
+                content_hash = None
+
+        if snapshot is None:
+            try:
+                st = os.stat(path)
+                snapshot = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                return
+
+        with self._lock:
+            self.entries[path] = {
+                'size': snapshot[0],
+                'mtime_ns': snapshot[1],
+                'hash': content_hash,
+                'options': opts_hash,
+                'outputs': outputs,
+                'status': status
+            }
+
+    def is_tracked(self, file_path: str) -> bool:
+        """Check if a file was selected by plan() and not yet recorded."""
+        return os.path.abspath(file_path) in self._snapshots
+
+    def prune(self, folder_path: str) -> List[str]:
+        """
+        Remove outputs of sources under a folder that no longer exist.
+
+        Sources with the same file name share an output name, so an output
+        another remaining entry records is kept.
+
+        Args:
+            folder_path: Folder whose entries to check
+
+        Returns:
+            Output paths that were deleted
+
+        Raises:
+            OSError: If an output could not be deleted (the others are)
+        """
+        root = os.path.join(os.path.abspath(folder_path), "")
+        removed = []
+        with self._lock:
+            gone = [path for path in self.entries
+                    if path.startswith(root) and not os.path.exists(path)]
+            if not gone:
+                return removed
+            outputs = [output for path in gone for output in self.entries.pop(path)['outputs']]
+            in_use: Set[str] = {output for entry in self.entries.values()
+                                for output in entry['outputs']}
+            error: Optional[OSError] = None
+            for output in outputs:
+                if output in in_use or output in removed:
+                    continue
+                try:
+                    if os.path.isdir(output):
+                        shutil.rmtree(output)
+                    elif os.path.exists(output):
+                        os.remove(output)
+                    else:
+                        continue
+                except OSError as e:
+                    error = error or e
+                    continue
+                removed.append(output)
+        if error is not None:
+            raise error
+        return removed
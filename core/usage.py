@@ -0,0 +1,287 @@
+"""Resource accounting for conversion jobs: wall time, CPU time, peak memory and I/O."""
+
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.progress import format_duration
+
+
+@dataclass
+class ResourceUsage:
+    """Resources one conversion used (None where the platform cannot tell)."""
+
+    wall_seconds: float = 0.0
+    user_seconds: Optional[float] = None
+    system_seconds: Optional[float] = None
+    peak_rss_bytes: Optional[int] = None
+    read_bytes: Optional[int] = None
+    write_bytes: Optional[int] = None
+
+    @property
+    def cpu_seconds(self) -> Optional[float]:
+        """User plus system CPU time."""
+        if self.user_seconds is None:
+            return None
+        return self.user_seconds + (self.system_seconds or 0.0)
+
+    def combine(self, other: "ResourceUsage") -> "ResourceUsage":
+        """
+        Add up the usage of two jobs of the same item (shards, merge).
+
+        Times and I/O are summed; the peak is the larger of both peaks.
+        """
+        return ResourceUsage(
+            wall_seconds=self.wall_seconds + other.wall_seconds,
+            user_seconds=_add(self.user_seconds, other.user_seconds),
+            system_seconds=_add(self.system_seconds, other.system_seconds),
+            peak_rss_bytes=_max(self.peak_rss_bytes, other.peak_rss_bytes),
+            read_bytes=_add(self.read_bytes, other.read_bytes),
+            write_bytes=_add(self.write_bytes, other.write_bytes),
+        )
+
+    def share(self, fraction: float) -> "ResourceUsage":
+        """
+        Get one item's share of a job that converted several items.
+
+        Times and I/O are split by ``fraction``; the peak memory belongs
+        to the whole call and is kept.
+        """
+        return ResourceUsage(
+            wall_seconds=self.wall_seconds * fraction,
+            user_seconds=_scale(self.user_seconds, fraction),
+            system_seconds=_scale(self.system_seconds, fraction),
+            peak_rss_bytes=self.peak_rss_bytes,
+            read_bytes=_scale_int(self.read_bytes, fraction),
+            write_bytes=_scale_int(self.write_bytes, fraction),
+        )
+
+    def describe(self) -> str:
+        """Multi-line description, e.g. for a tooltip."""
+        lines = [f"Wall time: {format_duration(self.wall_seconds, tenths=True)}"]
+        if self.cpu_seconds is not None:
+            lines.append(f"CPU time: {format_duration(self.cpu_seconds, tenths=True)} "
+                         f"(user {format_duration(self.user_seconds, tenths=True)}, "
+                         f"sys {format_duration(self.system_seconds or 0.0, tenths=True)})")
+        if self.peak_rss_bytes is not None:
+            lines.append(f"Peak memory: {format_bytes(self.peak_rss_bytes)}")
+        if self.read_bytes is not None:
+            lines.append(f"Disk I/O: {format_bytes(self.read_bytes)} read, "
+                         f"{format_bytes(self.write_bytes or 0)} written")
+        return "\n".join(lines)
+
+
+def _add(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a + b
+
+
+def _max(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _scale(value: Optional[float], fraction: float) -> Optional[float]:
+    return None if value is None else value * fraction
+
+
+def _scale_int(value: Optional[int], fraction: float) -> Optional[int]:
+    return None if value is None else int(value * fraction)
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count as e.g. "512.0 KB"."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
+
+
+# Measuring processes
+
+def read_proc_io(pid: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """
+    Read a process's storage I/O counters (Linux only).
+
+    Args:
+        pid: Process ID (None = this process)
+
+    Returns:
+        Tuple of (read_bytes, write_bytes), or None if unavailable
+    """
+    path = f"/proc/{pid if pid is not None else 'self'}/io"
+    try:
+        with open(path, 'r') as f:
+            counters = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(counters['read_bytes']), int(counters['write_bytes'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _maxrss_bytes(maxrss: int) -> int:
+    """Convert ru_maxrss to bytes (kilobytes everywhere but macOS)."""
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def wait_measured(process: subprocess.Popen, started_at: float) -> Tuple[int, ResourceUsage]:
+    """
+    Wait for a child process and measure what it used.
+
+    On POSIX the child's own rusage comes from ``os.wait4``; on Linux its
+    I/O counters are read from ``/proc/<pid>/io`` while it is still a
+    zombie. Elsewhere (or if another thread reaped the child) only the
+    wall time is measured.
+
+    Args:
+        process: Child process (its output should already be drained)
+        started_at: time.monotonic() when the child was started
+
+    Returns:
+        Tuple of (return code, usage)
+    """
+    if not hasattr(os, "wait4"):
+        return_code = process.wait()
+        return return_code, ResourceUsage(wall_seconds=time.monotonic() - started_at)
+
+    io = None
+    try:
+        if hasattr(os, "waitid"):
+            # Wait for exit without reaping, so /proc/<pid> is still there
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+            io = read_proc_io(process.pid)
+        _, status, rusage = os.wait4(process.pid, 0)
+    except ChildProcessError:
+        # Already reaped (e.g. by a cancel); fall back to Popen's bookkeeping
+        return_code = process.wait()
+        return return_code, ResourceUsage(wall_seconds=time.monotonic() - started_at)
+
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, ResourceUsage(
+        wall_seconds=time.monotonic() - started_at,
+        user_seconds=rusage.ru_utime,
+        system_seconds=rusage.ru_stime,
+        peak_rss_bytes=_maxrss_bytes(rusage.ru_maxrss),
+        read_bytes=io[0] if io else None,
+        write_bytes=io[1] if io else None,
+    )
+
+
+class SelfUsageMeter:
+    """
+    Measures the resources a long-lived process uses for one job.
+
+    CPU time and I/O are differences of the process counters. The peak
+    memory counter is reset at start() where Linux allows it
+    (``/proc/self/clear_refs``); otherwise it is the process's lifetime peak.
+    """
+
+    def start(self):
+        """Begin measuring a job."""
+        try:
+            with open("/proc/self/clear_refs", 'w') as f:
+                f.write("5")
+        except OSError:
+            pass
+        self._started_at = time.monotonic()
+        self._times = os.times()
+        self._io = read_proc_io()
+
+    def stop(self) -> ResourceUsage:
+        """Get the resources used since start()."""
+        times = os.times()
+        io = read_proc_io()
+        usage = ResourceUsage(
+            wall_seconds=time.monotonic() - self._started_at,
+            user_seconds=times.user - self._times.user,
+            system_seconds=times.system - self._times.system,
+            peak_rss_bytes=_peak_rss_self(),
+        )
+        if io is not None and self._io is not None:
+            usage.read_bytes = io[0] - self._io[0]
+            usage.write_bytes = io[1] - self._io[1]
+        return usage
+
+
+def _peak_rss_self() -> Optional[int]:
+    """Get this process's peak resident memory in bytes."""
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        return _maxrss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    except (ImportError, OSError):
+        return None
+
+
+class UsageSummary:
+    """Resource totals of a queue run and its most expensive items."""
+
+    def __init__(self):
+        self.items: Dict[str, Tuple[str, ResourceUsage]] = {}  # Item ID -> (filename, usage)
+
+    def add(self, item_id: str, filename: str, usage: ResourceUsage):
+        """Record a finished item's usage."""
+        self.items[item_id] = (filename, usage)
+
+    def __len__(self) -> int:
+        """Return number of measured items."""
+        return len(self.items)
+
+    @property
+    def total(self) -> ResourceUsage:
+        """Combined usage of all measured items."""
+        total = ResourceUsage()
+        for _, usage in self.items.values():
+            total = total.combine(usage)
+        return total
+
+    def most_expensive(self, count: int = 3) -> List[Tuple[str, ResourceUsage]]:
+        """Get the items that used the most CPU time (wall time if unknown)."""
+        ranked = sorted(
+            self.items.values(),
+            key=lambda entry: (entry[1].cpu_seconds if entry[1].cpu_seconds is not None
+                               else entry[1].wall_seconds),
+            reverse=True
+        )
+        return ranked[:count]
+
+    def summary_lines(self) -> List[str]:
+        """Summary for the end of a run (empty if nothing was measured)."""
+        if not self.items:
+            return []
+
+        total = self.total
+        line = f"Resources: {format_duration(total.wall_seconds, tenths=True)} worker time"
+        if total.cpu_seconds is not None:
+            line += f", {format_duration(total.cpu_seconds, tenths=True)} CPU"
+        if total.peak_rss_bytes is not None:
+            line += f", peak {format_bytes(total.peak_rss_bytes)}"
+        if total.read_bytes is not None:
+            line += (f", {format_bytes(total.read_bytes)} read"
+                     f", {format_bytes(total.write_bytes or 0)} written")
+        lines = [line, "Most expensive:"]
+
+        for filename, usage in self.most_expensive():
+            if usage.cpu_seconds is not None:
+                cost = f"{format_duration(usage.cpu_seconds, tenths=True)} CPU"
+            else:
+                cost = format_duration(usage.wall_seconds, tenths=True)
+            if usage.peak_rss_bytes is not None:
+                cost += f", peak {format_bytes(usage.peak_rss_bytes)}"
+            lines.append(f"  {filename}: {cost}")
+        return lines
@@ -5,14 +5,26 @@ Docling GUI - A graphical user interface for the Docling document converter.
 This application provides an easy-to-use interface for converting various
 document formats (PDF, DOCX, PPTX, HTML, images, etc.) to different output
 formats (Markdown, JSON, HTML, text) using the Docling library.
+
+Run ``python main.py --headless --help`` for batch conversion without the GUI,
+or ``python main.py --serve --help`` for the local HTTP job service.
 """
 
 import sys
-from ui.main_window import MainWindow
 
 
 def main():
     """Main entry point for the application."""
+    if "--headless" in sys.argv[1:]:
+        # Batch mode for servers: no Tk, customtkinter or tkinterdnd2
+        from core.batch import main as batch_main
+        sys.exit(batch_main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+    if "--serve" in sys.argv[1:]:
+        # Local HTTP job service, also without any GUI imports
+        from core.service import main as service_main
+        sys.exit(service_main([arg for arg in sys.argv[1:] if arg != "--serve"]))
+
+    from ui.main_window import MainWindow
     app = MainWindow()
     app.mainloop()
 
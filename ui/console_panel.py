@@ -5,6 +5,21 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 from config import Config
+from core.console_history import ConsoleHistory
+from core.log_writer import AsyncLogWriter
+from core.output_buffer import OutputBuffer
+
+
+# Interval between console refreshes of buffered worker output (ms)
+REFRESH_INTERVAL_MS = 50
+# Characters inserted per refresh; the rest waits for the next one
+MAX_CHARS_PER_REFRESH = 64 * 1024
+# Buffered characters before worker output is no longer shown (and counted)
+MAX_BUFFERED_CHARS = 2 * 1024 * 1024
+# Search results shown by the filter box
+MAX_SEARCH_RESULTS = 1000
+# Delay after the last keystroke before the filter runs (ms)
+SEARCH_DELAY_MS = 250
 
 
 class ConsolePanel(ctk.CTkFrame):
@@ -16,6 +31,12 @@ class ConsolePanel(ctk.CTkFrame):
     - Save to log file option
     - Clear console button
     - Auto-scroll to bottom
+    - Thread-safe write() for worker output, shown in one batch per refresh;
+      the log file and history receive it as it is written, so output the
+      widget cannot keep up with is only skipped on screen
+    - Line cap (``console.maxLines``): the oldest lines are trimmed in chunks,
+      while the full history is kept in an on-disk store
+    - Filter box that searches the stored history
     """
 
     def __init__(self, parent, config: Config):
@@ -29,10 +50,15 @@ class ConsolePanel(ctk.CTkFrame):
         super().__init__(parent)
 
         self.config = config
-        self._log_file_handle = None
+        self._log_writer: Optional[AsyncLogWriter] = None
         self._current_log_file: Optional[Path] = None
+        self._output_buffer = OutputBuffer(max_chars=MAX_BUFFERED_CHARS)
+        self._max_lines = self.config.get("console", "maxLines", default=10000)
+        self._history = self._create_history()
+        self._search_job = None
 
         self._create_widgets()
+        self.after(REFRESH_INTERVAL_MS, self._refresh)
 
         # Auto-start logging if enabled
         if self._enable_log_var.get():
@@ -55,9 +81,30 @@ class ConsolePanel(ctk.CTkFrame):
             font=ctk.CTkFont(size=14, weight="bold")
         ).grid(row=0, column=0, sticky="w")
 
+        # Filter box (searches the full history)
+        self._search_entry = ctk.CTkEntry(
+            header_frame,
+            placeholder_text="Filter output...",
+            width=180,
+            height=26,
+            font=ctk.CTkFont(size=11)
+        )
+        self._search_entry.grid(row=0, column=1, padx=(0, 10), sticky="e")
+        self._search_entry.bind("<KeyRelease>", self._on_search_key)
+
         # Buttons container
         btn_container = ctk.CTkFrame(header_frame, fg_color="transparent")
-        btn_container.grid(row=0, column=1, sticky="e")
+        btn_container.grid(row=0, column=2, sticky="e")
+
+        # Back to live output (shown while filter results or an item log are shown)
+        self._live_btn = ctk.CTkButton(
+            btn_container,
+            text="Live Output",
+            command=self._on_live_click,
+            width=90,
+            height=26,
+            font=ctk.CTkFont(size=11)
+        )
 
         # Save log checkbox
         enable_logging = self.config.get("general", "enableLogging", default=False)
@@ -95,39 +142,183 @@ class ConsolePanel(ctk.CTkFrame):
         )
         self._console_text.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
 
+        # Filter results (replaces the live output while a filter is set)
+        self._results_text = ctk.CTkTextbox(
+            self,
+            font=ctk.CTkFont(family="Courier", size=11),
+            fg_color="gray10",
+            text_color="gray80",
+            wrap="word"
+        )
+        self._results_text.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
+        self._results_text.grid_remove()
+
         # Welcome message
         self.append("Docling GUI v1.5.2 initialized.\nReady to convert documents.\n")
 
     def append(self, text: str):
         """
-        Append text to console output.
+        Append text to console output (UI thread only).
+
+        Worker output buffered by write() is shown first, so messages keep
+        their order.
+
+        Args:
+            text: Text to append
+        """
+        self._flush_buffer()
+        self._show(text)
+        self._record(text)
+
+    def write(self, text: str):
+        """
+        Queue text for the console (safe to call from any thread).
+
+        The text appears on the next refresh. When writers outrun the
+        console, excess output is not shown and the number of skipped
+        lines is reported in its place; the log file and the history
+        still receive all of it.
 
         Args:
             text: Text to append
         """
+        self._record(text)
+        self._output_buffer.write(text)
+
+    def _refresh(self):
+        """Show buffered worker output, at most one batch per interval."""
+        self._flush_buffer(MAX_CHARS_PER_REFRESH)
+        if self._log_writer is not None and self._log_writer.error is not None:
+            self._on_log_write_error(self._log_writer.error)
+        if self._history is not None and self._history.error is not None:
+            self._on_history_error(self._history.error)
+        self.after(REFRESH_INTERVAL_MS, self._refresh)
+
+    def _flush_buffer(self, max_chars: Optional[int] = None):
+        """Show buffered worker output in one insert (all of it by default)."""
+        text, dropped = self._output_buffer.drain(max_chars)
+        if dropped:
+            text += f"[... {dropped} line(s) of output not shown ...]\n"
+        if text:
+            self._show(text)
+
+    def _show(self, text: str):
+        """Insert text at the end of the widget and scroll to it."""
         self._console_text.insert("end", text)
+        self._trim()
         self._console_text.see("end")
 
-        # Write to log file if enabled
-        if self._enable_log_var.get() and self._log_file_handle:
-            try:
-                self._log_file_handle.write(text)
-                self._log_file_handle.flush()
-            except Exception as e:
-                # Disable logging on error
-                self._enable_log_var.set(False)
-                self.config.set("general", "enableLogging", value=False)
-                self._close_log_file()
-                self._console_text.insert("end", f"\n[ERROR] Log file write failed: {str(e)}\n")
+    def _record(self, text: str):
+        """Add text to the history and the log file (safe to call from any thread)."""
+        history = self._history
+        if history is not None:
+            history.append(text)
+
+        # The writer only exists while logging is enabled (written on its thread)
+        log_writer = self._log_writer
+        if log_writer is not None:
+            log_writer.write(text)
+
+    def _on_log_write_error(self, error: Exception):
+        """Disable logging after the log writer failed."""
+        self._enable_log_var.set(False)
+        self.config.set("general", "enableLogging", value=False)
+        self._close_log_file()
+        self._console_text.insert("end", f"\n[ERROR] Log file write failed: {str(error)}\n")
+
+    def _on_history_error(self, error: Exception):
+        """Stop recording history after its writer failed (the filter is unavailable)."""
+        history = self._history
+        self._history = None
+        history.close()
+        self._console_text.insert("end", f"\n[ERROR] Console history write failed: {str(error)}\n")
+
+    def _trim(self):
+        """Drop the oldest lines once the widget holds a chunk more than the cap."""
+        if not self._max_lines:
+            return
+        lines = int(self._console_text.index("end-1c").split(".")[0])
+        chunk = max(1, self._max_lines // 10)
+        if lines > self._max_lines + chunk:
+            self._console_text.delete("1.0", f"{lines - self._max_lines + 1}.0")
 
     def clear(self):
         """Clear console output."""
+        self._output_buffer.clear()
         self._console_text.delete("1.0", "end")
+        if self._history is not None:
+            self._history.clear()
+        self._search_entry.delete(0, "end")
+        self.show_live()
         self.append("Console cleared.\n")
 
     def get_text(self) -> str:
-        """Get all console text."""
-        return self._console_text.get("1.0", "end")
+        """Get all console text (the full history, including trimmed lines)."""
+        if self._history is None:
+            self._flush_buffer()
+            return self._console_text.get("1.0", "end")
+        return "".join(self._history.iter_text())
+
+    def _create_history(self) -> Optional[ConsoleHistory]:
+        """Open the on-disk history (None if it cannot be created)."""
+        directory = self.config.get("console", "historyDirectory", default="")
+        path = None
+        try:
+            if directory:
+                Path(directory).mkdir(parents=True, exist_ok=True)
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                path = str(Path(directory) / f"console_{timestamp}.sqlite3")
+            return ConsoleHistory(path)
+        except Exception as e:
+            print(f"Console history disabled: {e}")
+            return None
+
+    def _on_search_key(self, event=None):
+        """Run the filter shortly after typing stops."""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        """Show the history lines matching the filter text."""
+        self._search_job = None
+        query = self._search_entry.get()
+        if not query or self._history is None:
+            self.show_live()
+            return
+
+        matches = self._history.search(query, limit=MAX_SEARCH_RESULTS)
+        if len(matches) == MAX_SEARCH_RESULTS:
+            header = f"Last {MAX_SEARCH_RESULTS} lines matching '{query}':\n"
+        else:
+            header = f"{len(matches)} line(s) matching '{query}':\n"
+        self.show_text(header + "".join(f"{number:>7}: {text}\n" for number, text in matches))
+
+    def show_text(self, text: str):
+        """
+        Show other text (filter results, an item's log) in place of the
+        live output until show_live() is called.
+
+        Args:
+            text: Text to show
+        """
+        self._results_text.delete("1.0", "end")
+        self._results_text.insert("end", text)
+        self._console_text.grid_remove()
+        self._results_text.grid()
+        self._live_btn.pack(side="left", padx=(0, 10), before=self._log_checkbox)
+
+    def show_live(self):
+        """Return to the live output."""
+        self._results_text.grid_remove()
+        self._live_btn.pack_forget()
+        self._console_text.grid()
+        self._console_text.see("end")
+
+    def _on_live_click(self):
+        """Handle Live Output button click."""
+        self._search_entry.delete(0, "end")
+        self.show_live()
 
     def _on_log_enable_change(self):
         """Handle log enable checkbox change."""
@@ -150,7 +341,7 @@ class ConsolePanel(ctk.CTkFrame):
         Returns:
             True if successful, False otherwise
         """
-        if self._log_file_handle:
+        if self._log_writer:
             self._close_log_file()
 
         log_dir = Path(self.config.get("general", "logDirectory",
@@ -163,12 +354,16 @@ class ConsolePanel(ctk.CTkFrame):
             log_filename = f"docling_log_{timestamp}.txt"
             self._current_log_file = log_dir / log_filename
 
-            self._log_file_handle = open(self._current_log_file, 'w', encoding='utf-8')
+            max_mb = self.config.get("general", "logMaxSizeMB", default=50)
+            self._log_writer = AsyncLogWriter(
+                str(self._current_log_file),
+                max_bytes=int(max_mb * 1024 * 1024),
+                compress=self.config.get("general", "logCompressRotated", default=True)
+            )
             header = f"Docling GUI Log File\n"
             header += f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
             header += "=" * 60 + "\n\n"
-            self._log_file_handle.write(header)
-            self._log_file_handle.flush()
+            self._log_writer.write(header)
             return True
 
         except Exception as e:
@@ -178,22 +373,22 @@ class ConsolePanel(ctk.CTkFrame):
             return False
 
     def _close_log_file(self):
-        """Close the current log file."""
-        if self._log_file_handle:
-            try:
-                footer = f"\n{'=' * 60}\n"
-                footer += f"Log ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                self._log_file_handle.write(footer)
-                self._log_file_handle.close()
-            except:
-                pass
-            finally:
-                self._log_file_handle = None
-                self._current_log_file = None
+        """Close the current log file (waits until everything is written)."""
+        if self._log_writer:
+            footer = f"\n{'=' * 60}\n"
+            footer += f"Log ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            self._log_writer.write(footer)
+            self._log_writer.close()
+            self._log_writer = None
+            self._current_log_file = None
 
     def close(self):
         """Close panel and cleanup resources."""
+        self._flush_buffer()
         self._close_log_file()
+        if self._history is not None:
+            self._history.close()
+            self._history = None
 
     @property
     def logging_enabled(self) -> bool:
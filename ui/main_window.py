@@ -5,10 +5,25 @@ from tkinter import filedialog, messagebox
 from pathlib import Path
 import os
 import platform
-from typing import Optional, List
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, List, Set
 
+from core.batch import (configure_runner, conversion_kwargs, create_item_log_store, create_queue,
+                        create_result_cache)
+from core.cache import ResultCache
 from core.converter import DoclingConverter
-from core.queue import ConversionQueue, QueueItem, QueueItemStatus
+from core.dedupe import ContentHasher
+from core.ingest import FolderIngest
+from core.item_logs import ItemLogStore
+from core.journal import QueueJournal
+from core.ordering import estimate_seconds
+from core.progress import format_duration
+from core.queue import ConversionQueue, QueueItem, QueueItemStatus, SUPPORTED_EXTENSIONS
+from core.queue_store import SQLiteConversionQueue
+from core.runner import QueueRunner
+from core.scanner import ScannedFile, ScanOptions
+from core.sync import SyncManifest, options_hash, output_paths
 from config import Config
 from ui.sidebar import Sidebar
 from ui.queue_panel import QueuePanel
@@ -41,6 +56,9 @@ class MainWindow(BaseWindow):
 
     VERSION = "1.5.5"
 
+    # Milliseconds between refreshes of the batch progress bar and ETA
+    PROGRESS_REFRESH_MS = 500
+
     def __init__(self):
         super().__init__()
 
@@ -50,7 +68,12 @@ class MainWindow(BaseWindow):
         # Initialize components
         self.config = Config()
         self.converter = DoclingConverter()
-        self.queue = ConversionQueue()
+        try:
+            self.queue = create_queue(self.config)
+        except sqlite3.Error as e:
+            print(f"Queue database unavailable, keeping the queue in memory: {e}")
+            self.queue = ConversionQueue()
+        self.queue.deduplicate = self.config.get("dedupe", "enabled", default=True)
 
         # Window setup
         self.title(f"Docling GUI v{self.VERSION} - Document Converter")
@@ -64,13 +87,50 @@ class MainWindow(BaseWindow):
         ctk.set_appearance_mode(theme)
         ctk.set_default_color_theme("blue")
 
+        # Queue runner (worker pool); callbacks are marshalled onto the Tk thread
+        self.runner = QueueRunner(
+            self.queue,
+            self.converter,
+            dispatch=lambda fn: self.after(0, fn),
+            max_workers=self.config.get("processing", "maxWorkers", default=1),
+            on_item_started=self._on_item_started,
+            on_item_finished=self._on_item_finished,
+            on_item_progress=self._on_item_progress,
+            on_output=self._on_item_output,
+            on_queue_complete=lambda stats: self._on_queue_complete()
+        )
+
         # State variables
         self.is_processing = False
-        self.current_queue_item: Optional[QueueItem] = None
+        self._run_params: Optional[dict] = None
+        self._status_text = ""  # "Processing i/n..." part of the status bar
+        self._progress_job: Optional[str] = None
+        self._sharding_logged: Set[str] = set()
+
+        # Incremental folder sync; manifest updates hash files, so they run
+        # in order on a background thread
+        self.sync_manifest: Optional[SyncManifest] = None
+        self._sync_executor = ThreadPoolExecutor(max_workers=1)
+
+        # Background folder scans adding files to the queue, and hashing of
+        # same-size files to find duplicates among them
+        self._ingests: List[FolderIngest] = []
+        self._hasher = ContentHasher(
+            dispatch=lambda fn: self.after(0, fn),
+            on_hashed=self._on_content_hashed,
+            workers=self.config.get("dedupe", "hashWorkers", default=4)
+        )
+
+        # Per-item conversion logs (created on the first run)
+        self.item_logs: Optional[ItemLogStore] = None
+
+        # Journal of queue changes, so a crashed batch resumes on the next start
+        self.journal: Optional[QueueJournal] = None
 
         # Create UI
         self._create_widgets()
         self._check_docling()
+        self._open_journal()
 
         # Window close handler
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
@@ -105,7 +165,9 @@ class MainWindow(BaseWindow):
         self.queue_panel = QueuePanel(
             main_area,
             queue=self.queue,
-            on_files_added=self._on_files_dropped
+            on_files_added=self._on_files_dropped,
+            on_item_selected=self._on_queue_item_selected,
+            on_cancel_scan=self._cancel_ingest
         )
         self.queue_panel.grid(row=0, column=0, sticky="nsew", padx=10, pady=(10, 5))
 
@@ -132,7 +194,7 @@ class MainWindow(BaseWindow):
         self._ready_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
 
         # Progress bar (hidden by default)
-        self._progress_bar = ctk.CTkProgressBar(status_frame, mode="indeterminate", width=200)
+        self._progress_bar = ctk.CTkProgressBar(status_frame, mode="determinate", width=200)
         self._progress_bar.grid(row=0, column=1, padx=10, pady=5)
         self._progress_bar.grid_remove()
 
@@ -179,6 +241,64 @@ class MainWindow(BaseWindow):
         else:
             self.console_panel.append("Drag-and-drop: Disabled (install tkinterdnd2 to enable)\n")
 
+    def _open_journal(self):
+        """Record queue changes and restore the items an earlier session left."""
+        if isinstance(self.queue, SQLiteConversionQueue):
+            # The queue database is kept across sessions itself
+            if len(self.queue):
+                self.queue_panel.refresh()
+                self._update_convert_button()
+                self._report_restored()
+            return
+        if not self.config.get("journal", "enabled", default=True):
+            return
+        path = self.config.get("journal", "path",
+                               default=str(self.config.config_dir / "queue_journal.jsonl"))
+        try:
+            self.journal = QueueJournal(
+                path, compact_min_records=self.config.get("journal", "compactMinRecords", default=10000)
+            )
+            # New items must not reuse IDs the replay is about to restore
+            self.queue.reserve_ids(self.journal.last_item_id())
+        except OSError as e:
+            self.console_panel.append(f"[WARNING] Queue journal disabled: {e}\n")
+            self.journal = None
+            return
+
+        self.queue.journal = self.journal
+        if self.journal.has_history:
+            self.runner.hold()
+            self.journal.replay(
+                dispatch=lambda fn: self.after(0, fn),
+                on_items=self._on_journal_items,
+                on_done=self._on_journal_replayed
+            )
+
+    def _on_journal_items(self, items: List[QueueItem], changes: List[tuple]):
+        """Put back a chunk of items from the journal."""
+        self.queue.restore(items)
+        self.queue.restore_changes(changes)
+        self.queue_panel.refresh()
+        self._update_convert_button()
+        self.runner.wake()
+
+    def _on_journal_replayed(self):
+        """Resume the run held while the journal was replayed."""
+        # Hashed only now: a later record may still have changed an item's status
+        self._hasher.submit(self.queue.take_hash_requests())
+        self._report_restored()
+        self.runner.release()
+
+    def _report_restored(self):
+        """Report the items restored from an earlier session."""
+        stats = self.queue.get_statistics()
+        if stats['total']:
+            self.console_panel.append(
+                f"Restored the queue of the previous session: {stats['total']} file(s), "
+                f"{stats['pending']} pending, {stats['completed']} completed, "
+                f"{stats['failed']} failed\n"
+            )
+
     # File/Queue Management
 
     def _add_files_to_queue(self):
@@ -208,27 +328,127 @@ class MainWindow(BaseWindow):
         )
 
         if folder:
-            try:
-                added_items = self.queue.add_folder(folder, recursive=True)
-                self.console_panel.append(f"Added {len(added_items)} file(s) from folder: {folder}\n")
-
-                for item in added_items:
-                    self.queue_panel.add_item(item)
+            self._start_ingest([folder], sync=self.config.get("sync", "enabled", default=False))
 
-                self._update_convert_button()
+    def _on_files_dropped(self, file_paths: List[str]):
+        """Handle files (or folders) added via drop zone or dialog."""
+        self._start_ingest(file_paths)
+
+    def _start_ingest(self, sources: List[str], sync: bool = False):
+        """
+        Scan files and folders in the background, adding them to the queue in chunks.
+
+        A running conversion picks up each chunk as it arrives and does not
+        complete before the scan ends.
+
+        Args:
+            sources: File and folder paths
+            sync: Only add files that are new or changed since the last sync
+        """
+        ingest = FolderIngest(
+            sources,
+            ScanOptions.from_config(self.config, SUPPORTED_EXTENSIONS),
+            dispatch=lambda fn: self.after(0, fn),
+            on_chunk=self._on_ingest_chunk,
+            on_done=self._on_ingest_done,
+            filter_chunk=self._sync_filter() if sync else None
+        )
+        self._ingests.append(ingest)
+        self.runner.hold()
+        ingest.start()
+        self._update_scan_status()
+
+    def _sync_filter(self) -> Callable[[List[ScannedFile]], List[ScannedFile]]:
+        """Get a chunk filter that keeps the files new or changed since the last sync."""
+        if self.sync_manifest is None:
+            manifest_path = self.config.get("sync", "manifestPath",
+                                            default=str(self.config.config_dir / "sync_manifest.json"))
+            self.sync_manifest = SyncManifest(manifest_path)
+
+        manifest = self.sync_manifest
+        opts_hash = options_hash(conversion_kwargs(self.sidebar.get_conversion_params(), None))
+
+        def keep_stale(files: List[ScannedFile]) -> List[ScannedFile]:
+            # Runs on the scan thread; the manifest is only touched on the sync thread
+            stale = set(self._sync_executor.submit(manifest.plan, files, opts_hash).result())
+            return [f for f in files if f.path in stale]
+
+        return keep_stale
+
+    def _on_ingest_chunk(self, files: List[ScannedFile]):
+        """Add a chunk of scanned files to the queue."""
+        self.queue.add_scanned_count(files)
+        self.queue_panel.refresh()
+        self._hasher.submit(self.queue.take_hash_requests())
+        self._update_convert_button()
+        self._update_scan_status()
+        self.runner.wake()
 
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not add folder:\n{str(e)}")
+    def _on_content_hashed(self, item_id: str, digest: Optional[str]):
+        """Collapse an item onto an identical pending item once its file was hashed."""
+        if digest is None:
+            return
+        duplicate = self.queue.set_content_hash(item_id, digest)
+        if duplicate is not None:
+            self.runner.progress.remove_item(duplicate.id)
+            self.queue_panel.refresh()
+            self._update_convert_button()
 
-    def _on_files_dropped(self, file_paths: List[str]):
-        """Handle files added via drop zone or dialog."""
-        added_items = self.queue.add_files(file_paths)
-        self.console_panel.append(f"Added {len(added_items)} file(s) to queue\n")
+    def _on_ingest_done(self, ingest: FolderIngest):
+        """Report a finished, cancelled or failed scan."""
+        self._ingests.remove(ingest)
+
+        folders = [source for source in ingest.sources if os.path.isdir(source)]
+        if ingest.error:
+            self.console_panel.append(f"[ERROR] Could not scan {', '.join(ingest.sources)}: {ingest.error}\n")
+        elif ingest.cancelled:
+            self.console_panel.append(f"Scan cancelled; added {ingest.delivered} file(s)\n")
+        elif len(folders) == 1 and len(ingest.sources) == 1:
+            self.console_panel.append(f"Added {ingest.delivered} file(s) from folder: {folders[0]}\n")
+        else:
+            self.console_panel.append(f"Added {ingest.delivered} file(s) to queue\n")
 
-        for item in added_items:
-            self.queue_panel.add_item(item)
+        if ingest.filter_chunk is not None and not ingest.error:
+            self.console_panel.append(
+                f"Sync: {ingest.accepted} of {ingest.discovered} file(s) are new or changed\n"
+            )
+            if self.config.get("sync", "pruneMissing", default=False) and not ingest.cancelled:
+                for folder in folders:
+                    future = self._sync_executor.submit(self.sync_manifest.prune, folder)
+                    future.add_done_callback(lambda f: self.after(0, lambda: self._on_sync_pruned(f)))
+                self._sync_executor.submit(self.sync_manifest.save)
 
+        self._update_scan_status()
         self._update_convert_button()
+        # Lets a running conversion complete if this scan was all it waited for
+        self.runner.release()
+
+    def _on_sync_pruned(self, future: Future):
+        """Report outputs removed because their source files were deleted."""
+        try:
+            removed = future.result()
+        except OSError as e:
+            self.console_panel.append(
+                f"[WARNING] Sync: could not remove an output of a deleted source file: {e}\n"
+            )
+            return
+        if removed:
+            self.console_panel.append(
+                f"Sync: removed {len(removed)} output(s) of deleted source files\n"
+            )
+
+    def _update_scan_status(self):
+        """Show the running scans' discovered file count in the queue header."""
+        if self._ingests:
+            discovered = sum(ingest.discovered for ingest in self._ingests)
+            self.queue_panel.show_scan_status(f"Scanning... {discovered:,} files found")
+        else:
+            self.queue_panel.hide_scan_status()
+
+    def _cancel_ingest(self):
+        """Cancel the running folder scans."""
+        for ingest in self._ingests:
+            ingest.cancel()
 
     def _update_convert_button(self):
         """Update convert button text based on queue."""
@@ -246,7 +466,7 @@ class MainWindow(BaseWindow):
 
     def _start_conversion(self):
         """Start processing the queue."""
-        if len(self.queue) == 0:
+        if len(self.queue) == 0 and not self._ingests:
             messagebox.showwarning("No Files", "Please add files to the queue first.")
             return
 
@@ -278,23 +498,56 @@ class MainWindow(BaseWindow):
                 messagebox.showerror("Models Required", error_msg)
                 return
 
+        # Snapshot parameters so every item in this run uses the same settings
+        artifacts_path = None
+        if params['processing_mode'] == "offline":
+            artifacts_path = self.config.get("processing", "artifactsPath")
+        run_params = conversion_kwargs(params, artifacts_path)
+        self._run_params = run_params
+
         # Start processing
         self._set_processing_state(True)
-        self._process_next_in_queue()
-
-    def _process_next_in_queue(self):
-        """Process the next pending item in queue."""
-        next_item = self.queue.get_next_pending()
+        self.runner.max_workers = self.sidebar.get_worker_count()
+        configure_runner(self.runner, self.config)
+        self.queue.set_ordering(self.sidebar.get_ordering_policy(),
+                                lambda item: estimate_seconds(item, run_params))
+        self.runner.cache = self._create_result_cache()
+        if self.item_logs is None and self.config.get("general", "itemLogs", default=True):
+            try:
+                self.item_logs = create_item_log_store(self.config)
+            except OSError as e:
+                self.console_panel.append(f"[WARNING] Per-item logs disabled: {e}\n")
+        self.runner.item_logs = self.item_logs
+        self.runner.start(lambda item: run_params)
+
+    def _create_result_cache(self) -> Optional[ResultCache]:
+        """Open the result cache if enabled in the config."""
+        try:
+            return create_result_cache(self.config)
+        except OSError as e:
+            self.console_panel.append(f"[WARNING] Result cache disabled: {e}\n")
+            return None
+
+    def _on_queue_item_selected(self, item_id: Optional[str]):
+        """Show the selected item's own log in the console."""
+        item = self.queue.get_item(item_id) if item_id else None
+        if item is None:
+            self.console_panel.show_live()
+            return
 
-        if next_item is None:
-            # Queue complete
-            self._on_queue_complete()
+        if self.item_logs is None or self.item_logs.log_path(item.id) is None:
+            self.console_panel.show_text(f"No log for {item.filename} yet.\n")
             return
 
-        # Update status
-        self.queue.update_status(next_item.id, QueueItemStatus.PROCESSING)
-        self.queue_panel.update_item_status(next_item.id, QueueItemStatus.PROCESSING)
-        self.current_queue_item = next_item
+        text, truncated = self.item_logs.read(item.id)
+        header = f"Log of {item.filename}: {self.item_logs.log_path(item.id)}\n"
+        if truncated:
+            header += "[... earlier output omitted, open the log file for all of it ...]\n"
+        self.console_panel.show_text(header + text)
+
+    def _on_item_started(self, item: QueueItem):
+        """Handle a queue item starting to process."""
+        self.queue_panel.update_item_status(item.id, QueueItemStatus.PROCESSING)
 
         # Log
         stats = self.queue.get_statistics()
@@ -302,110 +555,98 @@ class MainWindow(BaseWindow):
         total = stats['total']
 
         self.console_panel.append(f"\n{'=' * 60}\n")
-        self.console_panel.append(f"Processing [{current_index}/{total}]: {next_item.filename}\n")
+        self.console_panel.append(f"Processing [{current_index}/{total}]: {item.filename}\n")
         self.console_panel.append(f"{'=' * 60}\n")
 
-        self._ready_label.configure(text=f"Processing {current_index}/{total}...", text_color="orange")
+        if stats['processing'] > 1:
+            self._status_text = f"Processing {current_index}/{total} ({stats['processing']} running)..."
+        else:
+            self._status_text = f"Processing {current_index}/{total}..."
+        self._refresh_run_progress(reschedule=False)
+
+    def _on_item_progress(self, item: QueueItem):
+        """Handle stage, page or shard progress of an item."""
+        if item.shards_total > 0 and item.id not in self._sharding_logged:
+            self._sharding_logged.add(item.id)
+            self.console_panel.append(
+                f"Sharding {item.filename}: {item.page_count} pages into "
+                f"{item.shards_total} page ranges\n"
+            )
+        self.queue_panel.update_item_progress(item.id)
+
+    def _refresh_run_progress(self, reschedule: bool = True):
+        """Show the run's page progress, throughput and ETA in the status bar."""
+        if reschedule:
+            self._progress_job = None
+        if not self.is_processing or not self.runner.is_running:
+            # Model downloads show their own status
+            return
 
-        # Get conversion parameters
-        params = self.sidebar.get_conversion_params()
-        artifacts_path = None
-        if params['processing_mode'] == "offline":
-            artifacts_path = self.config.get("processing", "artifactsPath")
+        progress = self.runner.progress
+        self._progress_bar.set(progress.fraction)
 
-        # Start conversion
-        self.converter.convert(
-            input_path=next_item.file_path,
-            output_format=params['output_format'],
-            output_dir=params['output_dir'],
-            processing_mode=params['processing_mode'],
-            ocr_enabled=params['ocr_enabled'],
-            force_ocr=params['force_ocr'],
-            pipeline=params['pipeline'],
-            artifacts_path=artifacts_path,
-            ocr_lang=params['ocr_lang'],
-            ocr_engine=params.get('ocr_engine', 'auto'),
-            vlm_model=params['vlm_model'],
-            extract_tables=params['extract_tables'],
-            enrich_code=params['enrich_code'],
-            enrich_formula=params['enrich_formula'],
-            enrich_picture_classes=params['enrich_picture_classes'],
-            enrich_picture_description=params['enrich_picture_description'],
-            image_export_mode=params['image_export_mode'],
-            pdf_backend=params['pdf_backend'],
-            pdf_password=params['pdf_password'],
-            table_mode=params['table_mode'],
-            show_layout=params['show_layout'],
-            debug_visualize_layout=params['debug_visualize_layout'],
-            debug_visualize_cells=params['debug_visualize_cells'],
-            debug_visualize_ocr=params['debug_visualize_ocr'],
-            debug_visualize_tables=params['debug_visualize_tables'],
-            verbose=params['verbose'],
-            on_output=self._on_conversion_output,
-            on_complete=self._on_item_complete,
-            on_error=self._on_item_error
-        )
+        text = self._status_text or "Processing..."
+        rate = progress.pages_per_second()
+        if rate > 0:
+            text += f"  {rate:.1f} pages/s"
+            eta = progress.eta_seconds()
+            if eta is not None:
+                text += f" • ETA {format_duration(eta)}"
+        self._ready_label.configure(text=text, text_color="orange")
+
+        if reschedule:
+            self._progress_job = self.after(self.PROGRESS_REFRESH_MS, self._refresh_run_progress)
 
     def _cancel_conversion(self):
-        """Cancel current conversion."""
+        """Cancel all running conversions."""
         if messagebox.askyesno("Cancel", "Are you sure you want to cancel?"):
-            self.converter.cancel()
+            # Marks every running item as cancelled via _on_item_finished
+            self.runner.cancel_all()
             self.console_panel.append("\n[CANCELLED] Conversion cancelled by user.\n")
-
-            # Mark current item as cancelled
-            if self.current_queue_item:
-                self.queue.update_status(self.current_queue_item.id, QueueItemStatus.CANCELLED)
-                self.queue_panel.update_item_status(
-                    self.current_queue_item.id, QueueItemStatus.CANCELLED
-                )
+            if self.sync_manifest is not None:
+                self._sync_executor.submit(self.sync_manifest.save)
 
             self._set_processing_state(False)
 
     def _on_conversion_output(self, text: str):
-        """Handle conversion output."""
-        self.after(0, lambda: self.console_panel.append(text))
-
-    def _on_item_complete(self, return_code: int):
-        """Handle single item conversion completion."""
-        def update_ui():
-            if self.current_queue_item:
-                if return_code == 0:
-                    status = QueueItemStatus.COMPLETED
-                    self.console_panel.append(f"\n[SUCCESS] Completed: {self.current_queue_item.filename}\n")
-                else:
-                    status = QueueItemStatus.FAILED
-                    self.console_panel.append(f"\n[FAILED] {self.current_queue_item.filename} (exit code: {return_code})\n")
-
-                self.queue.update_status(self.current_queue_item.id, status)
-                self.queue_panel.update_item_status(self.current_queue_item.id, status)
-                self.current_queue_item = None
-
-            # Process next item
-            self._process_next_in_queue()
-
-        self.after(0, update_ui)
-
-    def _on_item_error(self, error: str):
-        """Handle item conversion error."""
-        def update_ui():
-            if self.current_queue_item:
-                self.queue.update_status(
-                    self.current_queue_item.id,
-                    QueueItemStatus.FAILED,
-                    error
-                )
-                self.queue_panel.update_item_status(
-                    self.current_queue_item.id,
-                    QueueItemStatus.FAILED,
-                    error
-                )
-                self.console_panel.append(f"\n[ERROR] {self.current_queue_item.filename}: {error}\n")
-                self.current_queue_item = None
-
-            # Process next item
-            self._process_next_in_queue()
-
-        self.after(0, update_ui)
+        """Handle conversion output (called from worker threads)."""
+        self.console_panel.write(text)
+
+    def _on_item_output(self, job_id: str, text: str):
+        """Handle output from a conversion job (called from worker threads)."""
+        if self.runner.max_workers > 1:
+            # Tag lines so interleaved output from parallel workers stays readable
+            text = "".join(f"[{job_id}] {line}" for line in text.splitlines(keepends=True))
+        self._on_conversion_output(text)
+
+    def _on_item_finished(self, item: QueueItem):
+        """Handle single item reaching a final status."""
+        if item.status == QueueItemStatus.COMPLETED:
+            self.console_panel.append(f"\n[SUCCESS] Completed: {item.filename}\n")
+        elif item.status == QueueItemStatus.FAILED:
+            if item.error_message and item.error_message.startswith("exit code"):
+                self.console_panel.append(f"\n[FAILED] {item.filename} ({item.error_message})\n")
+            else:
+                self.console_panel.append(f"\n[ERROR] {item.filename}: {item.error_message}\n")
+
+        self.queue_panel.update_item_status(item.id, item.status, item.error_message)
+
+        if self.sync_manifest is not None and item.status != QueueItemStatus.CANCELLED:
+            # Duplicates collapsed onto this item share its result
+            for file_path in [item.file_path, *item.duplicate_paths]:
+                if self.sync_manifest.is_tracked(file_path):
+                    self._record_sync(item, file_path)
+
+    def _record_sync(self, item: QueueItem, file_path: str):
+        """Record a finished folder-sync file in the manifest."""
+        run_params = self._run_params
+        outputs = []
+        if item.status == QueueItemStatus.COMPLETED:
+            outputs = output_paths(file_path, run_params['output_dir'],
+                                   run_params['output_format'])
+        self._sync_executor.submit(self.sync_manifest.record, file_path,
+                                   options_hash(run_params), outputs, item.status.value,
+                                   item.content_hash)
 
     def _on_queue_complete(self):
         """Handle entire queue completion."""
@@ -416,6 +657,13 @@ class MainWindow(BaseWindow):
         self.console_panel.append(f"Total files processed: {stats['total']}\n")
         self.console_panel.append(f"Completed successfully: {stats['completed']}\n")
         self.console_panel.append(f"Failed: {stats['failed']}\n")
+        if self.runner.cache is not None:
+            cache = self.runner.cache
+            self.console_panel.append(f"Cache: {cache.hits} hits, {cache.misses} misses\n")
+        for line in self.runner.usage.summary_lines():
+            self.console_panel.append(f"{line}\n")
+        if self.sync_manifest is not None:
+            self._sync_executor.submit(self.sync_manifest.save)
         params = self.sidebar.get_conversion_params()
         self.console_panel.append(f"Output directory: {params['output_dir']}\n")
         self.console_panel.append(f"{'=' * 60}\n")
@@ -443,11 +691,17 @@ class MainWindow(BaseWindow):
         self.sidebar.set_processing_state(is_processing)
 
         if is_processing:
+            self._status_text = ""
+            self._sharding_logged.clear()
+            self._progress_bar.set(0)
             self._progress_bar.grid()
-            self._progress_bar.start()
             self._ready_label.configure(text="Processing...", text_color="orange")
+            if self._progress_job is None:
+                self._progress_job = self.after(self.PROGRESS_REFRESH_MS, self._refresh_run_progress)
         else:
-            self._progress_bar.stop()
+            if self._progress_job is not None:
+                self.after_cancel(self._progress_job)
+                self._progress_job = None
             self._progress_bar.grid_remove()
             self._ready_label.configure(text="Ready", text_color="green")
             self._update_convert_button()
@@ -620,8 +874,25 @@ class MainWindow(BaseWindow):
             if not messagebox.askyesno("Quit", "Processing in progress. Are you sure you want to quit?"):
                 return
 
+        # Stop folder scans, running conversions and in-process engine workers
+        self._cancel_ingest()
+        self._hasher.shutdown()
+        self.converter.shutdown()
+
+        # Flush pending sync manifest updates
+        if self.sync_manifest is not None:
+            self._sync_executor.submit(self.sync_manifest.save)
+        self._sync_executor.shutdown(wait=True)
+
+        # Write the last queue changes
+        if self.journal is not None:
+            self.journal.close(timeout=5)
+        self.queue.close()
+
         # Close console panel (closes log file)
         self.console_panel.close()
+        if self.item_logs is not None:
+            self.item_logs.close()
 
         # Save window size
         geometry = self.geometry().split('+')[0]
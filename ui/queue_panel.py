@@ -1,9 +1,9 @@
 """Queue panel component for batch file management."""
 
 import customtkinter as ctk
-from typing import Callable, Dict, List, Optional
-from core.queue import ConversionQueue, QueueItem, QueueItemStatus
-from ui.widgets import FileDropZone, QueueItemWidget
+from typing import Callable, List, Optional
+from core.queue import ConversionQueue, QueueItemStatus
+from ui.widgets import FileDropZone, VirtualQueueList
 
 
 class QueuePanel(ctk.CTkFrame):
@@ -18,7 +18,9 @@ class QueuePanel(ctk.CTkFrame):
         self,
         parent,
         queue: ConversionQueue,
-        on_files_added: Optional[Callable[[List[str]], None]] = None
+        on_files_added: Optional[Callable[[List[str]], None]] = None,
+        on_item_selected: Optional[Callable[[Optional[str]], None]] = None,
+        on_cancel_scan: Optional[Callable[[], None]] = None
     ):
         """
         Initialize QueuePanel.
@@ -26,13 +28,20 @@ class QueuePanel(ctk.CTkFrame):
         Args:
             parent: Parent widget
             queue: The ConversionQueue to visualize
-            on_files_added: Callback when files are added via drop zone
+            on_files_added: Callback when files or folders are added via drop zone
+            on_item_selected: Callback when an item is selected (receives the
+                              item_id, or None when the selection is cleared)
+            on_cancel_scan: Callback for the Cancel button shown while a
+                            folder is being scanned
         """
         super().__init__(parent)
 
         self.queue = queue
         self._on_files_added = on_files_added
-        self._item_widgets: Dict[str, QueueItemWidget] = {}
+        self._on_item_selected = on_item_selected
+        self._on_cancel_scan = on_cancel_scan
+        self._header_pending = False
+        self._scan_shown = False
 
         self._create_widgets()
 
@@ -67,6 +76,26 @@ class QueuePanel(ctk.CTkFrame):
         btn_container = ctk.CTkFrame(header_frame, fg_color="transparent")
         btn_container.grid(row=0, column=2, sticky="e")
 
+        # Folder scan status and its Cancel button (shown while scanning)
+        self._scan_frame = ctk.CTkFrame(btn_container, fg_color="transparent")
+        self._scan_label = ctk.CTkLabel(
+            self._scan_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="orange"
+        )
+        self._scan_label.pack(side="left", padx=(0, 5))
+        ctk.CTkButton(
+            self._scan_frame,
+            text="Cancel",
+            command=self._on_cancel_scan_click,
+            width=60,
+            height=26,
+            font=ctk.CTkFont(size=11),
+            fg_color="gray40",
+            hover_color="gray30"
+        ).pack(side="left")
+
         # Clear Completed button
         self._clear_completed_btn = ctk.CTkButton(
             btn_container,
@@ -107,13 +136,14 @@ class QueuePanel(ctk.CTkFrame):
         )
         self._drop_zone.grid(row=0, column=0, sticky="nsew")
 
-        # Queue list (shows when queue has items)
-        self._queue_list = ctk.CTkScrollableFrame(
+        # Queue list (shows when queue has items); only visible rows get widgets
+        self._queue_list = VirtualQueueList(
             content_frame,
-            fg_color="transparent"
+            self.queue,
+            on_remove=self._on_item_remove,
+            on_select=self._on_item_selected
         )
         self._queue_list.grid(row=0, column=0, sticky="nsew")
-        self._queue_list.grid_columnconfigure(0, weight=1)
 
         # Initially show drop zone, hide list
         self._queue_list.grid_remove()
@@ -126,150 +156,74 @@ class QueuePanel(ctk.CTkFrame):
         if self._on_files_added:
             self._on_files_added(file_paths)
 
-    def add_item(self, item: QueueItem):
+    def update_item_status(self, item_id: str, status: QueueItemStatus,
+                          error_message: Optional[str] = None):
         """
-        Add a queue item to the display.
+        Update the status of an item.
 
         Args:
-            item: QueueItem to add
+            item_id: ID of item to update
+            status: New status
+            error_message: Optional error message
         """
-        # Create widget
-        widget = QueueItemWidget(
-            self._queue_list,
-            item,
-            on_remove=self._on_item_remove
-        )
-        widget.grid(row=len(self._item_widgets), column=0, sticky="ew", pady=2)
+        row = self._queue_list.get_row(item_id)
+        if row is not None:
+            row.update_status(status, error_message)
+        self._schedule_header_update()
 
-        # Store reference
-        self._item_widgets[item.id] = widget
-
-        # Show list, hide drop zone
-        self._drop_zone.grid_remove()
-        self._queue_list.grid()
-
-        # Update header
-        self._update_header()
-
-    def add_items(self, items: List[QueueItem]):
+    def update_item_progress(self, item_id: str):
         """
-        Add multiple queue items to the display.
+        Update the progress (stage, pages or shards) shown for an item.
 
         Args:
-            items: List of QueueItems to add
+            item_id: ID of item to update
         """
-        for item in items:
-            self.add_item(item)
+        row = self._queue_list.get_row(item_id)
+        if row is not None:
+            row.update_progress()
 
-    def remove_item(self, item_id: str):
+    def show_scan_status(self, text: str):
         """
-        Remove an item from the display.
+        Show folder scan progress with a Cancel button in the header.
 
         Args:
-            item_id: ID of item to remove
-        """
-        if item_id in self._item_widgets:
-            self._item_widgets[item_id].destroy()
-            del self._item_widgets[item_id]
-
-            # Reposition remaining items
-            self._reposition_items()
-
-            # Show drop zone if empty
-            if len(self._item_widgets) == 0:
-                self._queue_list.grid_remove()
-                self._drop_zone.grid()
-
-            # Update header
-            self._update_header()
-
-    def update_item_status(self, item_id: str, status: QueueItemStatus,
-                          error_message: Optional[str] = None):
+            text: Status text, e.g. "Scanning... 1,200 files found"
         """
-        Update the status of an item.
+        self._scan_label.configure(text=text)
+        if not self._scan_shown:
+            self._scan_shown = True
+            self._scan_frame.pack(side="left", padx=(0, 10), before=self._clear_completed_btn)
 
-        Args:
-            item_id: ID of item to update
-            status: New status
-            error_message: Optional error message
-        """
-        if item_id in self._item_widgets:
-            self._item_widgets[item_id].update_status(status, error_message)
-            self._update_header()
+    def hide_scan_status(self):
+        """Hide the folder scan progress."""
+        self._scan_shown = False
+        self._scan_frame.pack_forget()
 
     def refresh(self):
-        """Refresh the entire queue display from queue data."""
-        # Clear existing widgets
-        for widget in self._item_widgets.values():
-            widget.destroy()
-        self._item_widgets.clear()
-
-        # Add items from queue
-        for item in self.queue.items:
-            widget = QueueItemWidget(
-                self._queue_list,
-                item,
-                on_remove=self._on_item_remove
-            )
-            widget.grid(row=len(self._item_widgets), column=0, sticky="ew", pady=2)
-            self._item_widgets[item.id] = widget
-
-        # Update visibility
-        if len(self._item_widgets) == 0:
-            self._queue_list.grid_remove()
-            self._drop_zone.grid()
-        else:
-            self._drop_zone.grid_remove()
-            self._queue_list.grid()
-
-        self._update_header()
+        """Show the queue's current items (call after items were added or removed)."""
+        self._queue_list.refresh()
+        self._update_visibility()
+        self._schedule_header_update()
 
     def clear_completed(self):
         """Clear completed and failed items."""
-        # Get IDs to remove
-        ids_to_remove = [
-            item_id for item_id, widget in self._item_widgets.items()
-            if widget.queue_item.status in (QueueItemStatus.COMPLETED, QueueItemStatus.FAILED)
-        ]
-
-        # Remove widgets
-        for item_id in ids_to_remove:
-            self._item_widgets[item_id].destroy()
-            del self._item_widgets[item_id]
-
-        # Also clear from queue
         self.queue.clear_completed()
-
-        # Reposition
-        self._reposition_items()
-
-        # Update visibility
-        if len(self._item_widgets) == 0:
-            self._queue_list.grid_remove()
-            self._drop_zone.grid()
-
-        self._update_header()
+        self.refresh()
 
     def clear_all(self):
-        """Clear all items."""
-        # Remove all widgets
-        for widget in self._item_widgets.values():
-            widget.destroy()
-        self._item_widgets.clear()
-
-        # Clear queue
+        """Clear all items (except currently processing)."""
         self.queue.clear_queue()
-
-        # Show drop zone
-        self._queue_list.grid_remove()
-        self._drop_zone.grid()
-
-        self._update_header()
+        self.refresh()
 
     def _on_item_remove(self, item_id: str):
         """Handle item remove button click."""
         if self.queue.remove_item(item_id):
-            self.remove_item(item_id)
+            self.refresh()
+
+    def _on_cancel_scan_click(self):
+        """Handle scan Cancel button click."""
+        if self._on_cancel_scan:
+            self._on_cancel_scan()
 
     def _on_clear_completed(self):
         """Handle clear completed button click."""
@@ -282,13 +236,24 @@ class QueuePanel(ctk.CTkFrame):
             if messagebox.askyesno("Confirm", "Clear all items from queue?"):
                 self.clear_all()
 
-    def _reposition_items(self):
-        """Reposition items after removal."""
-        for idx, widget in enumerate(self._item_widgets.values()):
-            widget.grid(row=idx, column=0, sticky="ew", pady=2)
+    def _update_visibility(self):
+        """Show the drop zone when the list is empty, the list otherwise."""
+        if len(self._queue_list) == 0:
+            self._queue_list.grid_remove()
+            self._drop_zone.grid()
+        else:
+            self._drop_zone.grid_remove()
+            self._queue_list.grid()
+
+    def _schedule_header_update(self):
+        """Update the header once the current burst of changes is done."""
+        if not self._header_pending:
+            self._header_pending = True
+            self.after_idle(self._update_header)
 
     def _update_header(self):
         """Update header with current queue stats."""
+        self._header_pending = False
         stats = self.queue.get_statistics()
         total = stats['total']
 
@@ -1,8 +1,10 @@
 """Sidebar component with all conversion options."""
 
+import os
 import customtkinter as ctk
-from typing import Callable, Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, List
 from config import Config
+from core.ordering import ORDERING_POLICIES
 from ui.widgets import CollapsibleSection
 
 
@@ -69,6 +71,22 @@ class Sidebar(ctk.CTkFrame):
             value=self.config.get("processing", "mode", default="online")
         )
 
+        # Engine
+        self.engine_var = ctk.StringVar(
+            value=self.config.get("processing", "engine", default="cli")
+        )
+
+        # Parallel workers
+        self.max_workers_var = ctk.StringVar(
+            value=str(self.config.get("processing", "maxWorkers", default=1))
+        )
+
+        # Queue ordering (shown by label, stored by policy name)
+        ordering = self.config.get("processing", "ordering", default="fifo")
+        self.ordering_var = ctk.StringVar(
+            value=ORDERING_POLICIES.get(ordering, ORDERING_POLICIES["fifo"])
+        )
+
         # Pipeline
         self.pipeline_var = ctk.StringVar(
             value=self.config.get("defaults", "pipeline", default="standard")
@@ -301,6 +319,66 @@ class Sidebar(ctk.CTkFrame):
             command=lambda v: self.processing_mode_var.set(v)
         ).pack(side="left")
 
+        # Engine dropdown
+        engine_mode_frame = ctk.CTkFrame(content, fg_color="transparent")
+        engine_mode_frame.pack(fill="x", pady=5)
+
+        ctk.CTkLabel(
+            engine_mode_frame,
+            text="Engine:",
+            font=ctk.CTkFont(size=12),
+            width=80,
+            anchor="w"
+        ).pack(side="left")
+
+        ctk.CTkOptionMenu(
+            engine_mode_frame,
+            variable=self.engine_var,
+            values=self.config.get("models", "engines", default=["cli", "inprocess"]),
+            width=150,
+            command=self._on_engine_change
+        ).pack(side="left")
+
+        # Workers dropdown
+        workers_frame = ctk.CTkFrame(content, fg_color="transparent")
+        workers_frame.pack(fill="x", pady=5)
+
+        ctk.CTkLabel(
+            workers_frame,
+            text="Workers:",
+            font=ctk.CTkFont(size=12),
+            width=80,
+            anchor="w"
+        ).pack(side="left")
+
+        ctk.CTkOptionMenu(
+            workers_frame,
+            variable=self.max_workers_var,
+            values=self._worker_count_options(),
+            width=150,
+            command=self._on_max_workers_change
+        ).pack(side="left")
+
+        # Queue order dropdown
+        order_frame = ctk.CTkFrame(content, fg_color="transparent")
+        order_frame.pack(fill="x", pady=5)
+
+        ctk.CTkLabel(
+            order_frame,
+            text="Order:",
+            font=ctk.CTkFont(size=12),
+            width=80,
+            anchor="w"
+        ).pack(side="left")
+
+        ctk.CTkOptionMenu(
+            order_frame,
+            variable=self.ordering_var,
+            values=list(ORDERING_POLICIES.values()),
+            width=150,
+            command=self._on_ordering_change
+        ).pack(side="left")
+
         # Pipeline dropdown
         self.pipeline_frame = ctk.CTkFrame(content, fg_color="transparent")
         self.pipeline_frame.pack(fill="x", pady=5)
@@ -720,6 +798,26 @@ class Sidebar(ctk.CTkFrame):
             self.vlm_model_frame.pack_forget()
 
 
+    def _worker_count_options(self) -> List[str]:
+        """Get worker count choices up to the number of CPU cores."""
+        cpu_count = os.cpu_count() or 1
+        counts = {n for n in (1, 2, 4, 8, 16, 32, 64) if n <= cpu_count}
+        counts.add(cpu_count)
+        counts.add(int(self.max_workers_var.get() or 1))
+        return [str(n) for n in sorted(counts)]
+
+    def _on_max_workers_change(self, value: str):
+        """Handle workers dropdown change."""
+        self.config.set("processing", "maxWorkers", value=int(value))
+
+    def _on_ordering_change(self, label: str):
+        """Handle queue order dropdown change."""
+        self.config.set("processing", "ordering", value=self.get_ordering_policy())
+
+    def _on_engine_change(self, engine: str):
+        """Handle engine dropdown change."""
+        self.config.set("processing", "engine", value=engine)
+
     def _on_ocr_lang_change(self, display_name: str):
         """Handle OCR language dropdown change."""
         if display_name in self._ocr_lang_options:
@@ -751,6 +849,21 @@ class Sidebar(ctk.CTkFrame):
         """Update convert button text."""
         self._convert_btn.configure(text=text)
 
+    def get_worker_count(self) -> int:
+        """Get the number of concurrent conversion workers."""
+        try:
+            return max(1, int(self.max_workers_var.get()))
+        except ValueError:
+            return 1
+
+    def get_ordering_policy(self) -> str:
+        """Get the selected queue ordering policy name."""
+        label = self.ordering_var.get()
+        for policy, policy_label in ORDERING_POLICIES.items():
+            if policy_label == label:
+                return policy
+        return "fifo"
+
     def get_conversion_params(self) -> Dict[str, Any]:
         """
         Get all conversion parameters from sidebar controls.
@@ -762,6 +875,7 @@ class Sidebar(ctk.CTkFrame):
             'output_format': self.output_format_var.get(),
             'output_dir': self.output_dir_var.get(),
             'processing_mode': self.processing_mode_var.get(),
+            'engine': self.engine_var.get(),
             'pipeline': self.pipeline_var.get(),
             'ocr_enabled': self.ocr_var.get(),
             'force_ocr': self.force_ocr_var.get(),
@@ -3,5 +3,7 @@
 from .collapsible_section import CollapsibleSection
 from .file_drop_zone import FileDropZone
 from .queue_item_widget import QueueItemWidget
+from .tooltip import Tooltip
+from .virtual_queue_list import VirtualQueueList
 
-__all__ = ['CollapsibleSection', 'FileDropZone', 'QueueItemWidget']
+__all__ = ['CollapsibleSection', 'FileDropZone', 'QueueItemWidget', 'Tooltip', 'VirtualQueueList']
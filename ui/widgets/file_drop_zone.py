@@ -44,7 +44,8 @@ class FileDropZone(ctk.CTkFrame):
 
         Args:
             parent: Parent widget
-            on_files_added: Callback when files are added (receives list of paths)
+            on_files_added: Callback when files are added (receives list of paths;
+                            folders are passed as they are, not expanded)
             height: Height of the drop zone
             placeholder_text: Text shown in empty state
             allow_folders: Whether to allow folder selection
@@ -194,12 +195,11 @@ class FileDropZone(ctk.CTkFrame):
         # Parse the dropped data
         file_paths = self._parse_dnd_data(event.data)
 
-        # Filter to supported files and expand folders
+        # Filter to supported files; folders are passed on to be scanned by the receiver
         valid_files = []
         for path in file_paths:
             if os.path.isdir(path):
-                # Scan folder for supported files
-                valid_files.extend(self._scan_folder(path))
+                valid_files.append(path)
             elif os.path.isfile(path):
                 ext = Path(path).suffix.lower().lstrip('.')
                 if ext in self.SUPPORTED_EXTENSIONS:
@@ -308,33 +308,7 @@ class FileDropZone(ctk.CTkFrame):
         )
 
         if folder:
-            # Find all supported files in folder
-            files = self._scan_folder(folder)
-            if files:
-                self._on_files_added(files)
-
-    def _scan_folder(self, folder_path: str, recursive: bool = True) -> List[str]:
-        """
-        Scan a folder for supported files.
-
-        Args:
-            folder_path: Path to folder
-            recursive: Whether to scan recursively
-
-        Returns:
-            List of file paths
-        """
-        path = Path(folder_path)
-        files = []
-
-        if recursive:
-            for ext in self.SUPPORTED_EXTENSIONS:
-                files.extend(str(f) for f in path.rglob(f"*.{ext}"))
-        else:
-            for ext in self.SUPPORTED_EXTENSIONS:
-                files.extend(str(f) for f in path.glob(f"*.{ext}"))
-
-        return sorted(files)
+            self._on_files_added([folder])
 
     def set_drag_over(self, is_over: bool):
         """
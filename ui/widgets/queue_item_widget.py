@@ -1,8 +1,23 @@
 """Queue item widget for displaying individual files in the queue."""
 
 import customtkinter as ctk
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 from core.queue import QueueItem, QueueItemStatus
+from .tooltip import Tooltip
+
+
+# Height of one queue row in pixels (rows are recycled, so all share it)
+ROW_HEIGHT = 44
+
+# Fonts shared by every row (created on first use, after the root window)
+_FONTS: Dict[int, ctk.CTkFont] = {}
+
+
+def _font(size: int) -> ctk.CTkFont:
+    """Get the shared row font of a size."""
+    if size not in _FONTS:
+        _FONTS[size] = ctk.CTkFont(size=size)
+    return _FONTS[size]
 
 
 class QueueItemWidget(ctk.CTkFrame):
@@ -10,14 +25,16 @@ class QueueItemWidget(ctk.CTkFrame):
     Visual representation of a single queue item.
 
     Shows file name, size, status, and provides a remove button.
-    Status is indicated by both icon and color.
+    Status is indicated by both icon and color. A widget can be re-bound
+    to another item with set_item(), so a list can recycle its rows.
     """
 
     def __init__(
         self,
         parent,
         queue_item: QueueItem,
-        on_remove: Optional[Callable[[str], None]] = None
+        on_remove: Optional[Callable[[str], None]] = None,
+        on_select: Optional[Callable[[str], None]] = None
     ):
         """
         Initialize QueueItemWidget.
@@ -26,56 +43,54 @@ class QueueItemWidget(ctk.CTkFrame):
             parent: Parent widget
             queue_item: The QueueItem data to display
             on_remove: Callback when remove button is clicked (receives item_id)
+            on_select: Callback when the row is clicked (receives item_id)
         """
-        super().__init__(parent, fg_color="gray25", corner_radius=6)
+        super().__init__(parent, fg_color="gray25", corner_radius=6, height=ROW_HEIGHT)
 
         self.queue_item = queue_item
         self._on_remove = on_remove
+        self._on_select = on_select
+        self._selected = False
 
         self._create_widgets()
+        self.set_item(queue_item)
 
     def _create_widgets(self):
         """Create the item widgets."""
+        self.grid_propagate(False)
+        self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(2, weight=1)
 
         # Status icon
-        self._status_icon = ctk.CTkLabel(
-            self,
-            text=self.queue_item.get_status_icon(),
-            font=ctk.CTkFont(size=16),
-            text_color=self.queue_item.get_status_color(),
-            width=30
-        )
-        self._status_icon.grid(row=0, column=0, padx=(10, 5), pady=8)
+        self._status_icon = ctk.CTkLabel(self, text="", font=_font(16), width=30)
+        self._status_icon.grid(row=0, column=0, padx=(10, 5))
 
         # Filename
-        self._filename_label = ctk.CTkLabel(
-            self,
-            text=self.queue_item.filename,
-            font=ctk.CTkFont(size=12),
-            anchor="w"
-        )
-        self._filename_label.grid(row=0, column=1, padx=5, pady=8, sticky="w")
+        self._filename_label = ctk.CTkLabel(self, text="", font=_font(12), anchor="w")
+        self._filename_label.grid(row=0, column=1, padx=5, sticky="w")
 
         # File info (format and size)
-        info_text = f"{self.queue_item.file_format.upper()} • {self.queue_item.get_size_string()}"
-        self._info_label = ctk.CTkLabel(
-            self,
-            text=info_text,
-            font=ctk.CTkFont(size=10),
+        self._info_label = ctk.CTkLabel(self, text="", font=_font(10), text_color="gray60")
+        self._info_label.grid(row=0, column=2, padx=5, sticky="w")
+
+        # Conversion progress (stage, pages or shards; only while processing)
+        self._progress_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self._progress_frame.grid(row=0, column=3, padx=5)
+
+        self._progress_label = ctk.CTkLabel(
+            self._progress_frame,
+            text="",
+            font=_font(10),
             text_color="gray60"
         )
-        self._info_label.grid(row=0, column=2, padx=5, pady=8, sticky="w")
+        self._progress_label.grid(row=0, column=0, padx=(0, 5), sticky="w")
+
+        self._progress_bar = ctk.CTkProgressBar(self._progress_frame, width=80, height=8)
+        self._progress_bar.grid(row=0, column=1)
 
         # Status text
-        self._status_text = ctk.CTkLabel(
-            self,
-            text=self.queue_item.status.value.capitalize(),
-            font=ctk.CTkFont(size=10),
-            text_color=self.queue_item.get_status_color(),
-            width=80
-        )
-        self._status_text.grid(row=0, column=3, padx=5, pady=8)
+        self._status_text = ctk.CTkLabel(self, text="", font=_font(10), width=80)
+        self._status_text.grid(row=0, column=4, padx=5)
 
         # Remove button
         self._remove_btn = ctk.CTkButton(
@@ -83,16 +98,59 @@ class QueueItemWidget(ctk.CTkFrame):
             text="✕",
             width=28,
             height=24,
-            font=ctk.CTkFont(size=12),
+            font=_font(12),
             fg_color="gray40",
             hover_color="gray30",
             command=self._on_remove_click
         )
-        self._remove_btn.grid(row=0, column=4, padx=(5, 10), pady=8)
+        self._remove_btn.grid(row=0, column=5, padx=(5, 10))
+
+        # Clicking anywhere but the remove button selects the row
+        for widget in (self, self._status_icon, self._filename_label,
+                       self._info_label, self._status_text):
+            widget.bind("<Button-1>", self._on_click)
+
+        # Hovering a finished item shows the resources its conversion used
+        self._tooltip = Tooltip(
+            self, self._get_tooltip_text,
+            children=(self._status_icon, self._filename_label, self._info_label,
+                      self._progress_label, self._status_text)
+        )
 
-        # Disable remove button if processing
-        if self.queue_item.status == QueueItemStatus.PROCESSING:
-            self._remove_btn.configure(state="disabled")
+    def set_item(self, queue_item: QueueItem):
+        """
+        Show another queue item in this widget.
+
+        Args:
+            queue_item: The QueueItem data to display
+        """
+        self.queue_item = queue_item
+        self._tooltip.hide()
+        self._filename_label.configure(text=queue_item.filename)
+        self._info_label.configure(
+            text=f"{queue_item.file_format.upper()} • {queue_item.get_size_string()}"
+        )
+        self.update_status(queue_item.status, queue_item.error_message)
+        self.update_progress()
+
+    def _get_tooltip_text(self) -> str:
+        """Describe the item's duplicates and resource usage (empty if neither is known)."""
+        lines = []
+        duplicates = self.queue_item.duplicate_paths
+        if duplicates:
+            lines.append(f"Also writes the output of {len(duplicates)} identical file(s):")
+            lines.extend(f"  {path}" for path in duplicates[:5])
+            if len(duplicates) > 5:
+                lines.append(f"  ... and {len(duplicates) - 5} more")
+        usage = self.queue_item.usage
+        if usage is not None:
+            lines.append(usage.describe())
+        return "\n".join(lines)
+
+    def _on_click(self, event=None):
+        """Handle a click on the row."""
+        if self._on_select:
+            self._on_select(self.queue_item.id)
 
     def _on_remove_click(self):
         """Handle remove button click."""
@@ -103,13 +161,13 @@ class QueueItemWidget(ctk.CTkFrame):
         """
         Update the displayed status.
 
+        The queue item itself is updated by ConversionQueue.update_status;
+        the widget only renders it.
+
         Args:
             status: New status
             error_message: Optional error message for failed items
         """
-        self.queue_item.status = status
-        self.queue_item.error_message = error_message
-
         # Update visuals
         self._status_icon.configure(
             text=self.queue_item.get_status_icon(),
@@ -127,12 +185,41 @@ class QueueItemWidget(ctk.CTkFrame):
             self._remove_btn.configure(state="normal")
 
         # Update background for completed/failed
-        if status == QueueItemStatus.COMPLETED:
-            self.configure(fg_color="gray30")
-        elif status == QueueItemStatus.FAILED:
-            self.configure(fg_color="#3d2020")
+        self.set_selected(self._selected)
+
+    def update_progress(self):
+        """
+        Update the progress display from the queue item.
+
+        Sharded items show their shards, other items the pages converted
+        so far (or just the stage while no pages were reported).
+        """
+        item = self.queue_item
+        if item.status != QueueItemStatus.PROCESSING and item.shards_total <= 0:
+            self._progress_frame.grid_remove()
+            return
+
+        if item.shards_total > 0:
+            pages = f" • {item.page_count} pages" if item.page_count else ""
+            text = f"Shards {item.shards_done}/{item.shards_total}{pages}"
+            fraction = item.shards_done / item.shards_total
+        elif item.pages_done and item.page_count:
+            text = f"Page {item.pages_done}/{item.page_count}"
+            fraction = item.pages_done / item.page_count
+        elif item.stage:
+            text = item.stage
+            fraction = None
+        else:
+            self._progress_frame.grid_remove()
+            return
+
+        self._progress_label.configure(text=text)
+        if fraction is None:
+            self._progress_bar.grid_remove()
         else:
-            self.configure(fg_color="gray25")
+            self._progress_bar.set(fraction)
+            self._progress_bar.grid()
+        self._progress_frame.grid()
 
     def set_selected(self, selected: bool):
         """
@@ -141,6 +228,7 @@ class QueueItemWidget(ctk.CTkFrame):
         Args:
             selected: Whether item is selected
         """
+        self._selected = selected
         if selected:
             self.configure(fg_color="#1f538d")
         else:
@@ -0,0 +1,81 @@
+"""Hover tooltip for widgets."""
+
+import tkinter as tk
+from typing import Callable, Iterable, Optional
+
+
+class Tooltip:
+    """
+    Shows a small text popup while the pointer rests on a widget.
+
+    The text is fetched when the popup opens, so a widget that is re-bound
+    to other data (e.g. a recycled queue row) always shows current text.
+    An empty text shows nothing.
+    """
+
+    DELAY_MS = 600
+
+    def __init__(self, widget, text_fn: Callable[[], str], children: Iterable = ()):
+        """
+        Initialize Tooltip.
+
+        Args:
+            widget: Widget the tooltip belongs to
+            text_fn: Returns the text to show
+            children: Child widgets that also count as hovering the widget
+        """
+        self.widget = widget
+        self._text_fn = text_fn
+        self._after_id: Optional[str] = None
+        self._window: Optional[tk.Toplevel] = None
+
+        for target in (widget, *children):
+            target.bind("<Enter>", self._on_enter, add="+")
+            target.bind("<Leave>", self._on_leave, add="+")
+
+    def _on_enter(self, event=None):
+        """Start the delay before showing the popup."""
+        self._cancel()
+        self._after_id = self.widget.after(self.DELAY_MS, self._show)
+
+    def _on_leave(self, event=None):
+        """Hide the popup once the pointer left the widget and its children."""
+        if event is not None:
+            under = self.widget.winfo_containing(event.x_root, event.y_root)
+            if under is not None and str(under).startswith(str(self.widget)):
+                return
+        self.hide()
+
+    def _cancel(self):
+        """Cancel a pending show."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _show(self):
+        """Open the popup next to the pointer."""
+        self._after_id = None
+        text = self._text_fn()
+        if not text:
+            return
+
+        if self._window is None:
+            self._window = tk.Toplevel(self.widget)
+            self._window.wm_overrideredirect(True)
+            self._label = tk.Label(
+                self._window, justify="left", background="gray15", foreground="gray90",
+                relief="solid", borderwidth=1, padx=6, pady=4, font=("TkDefaultFont", 9)
+            )
+            self._label.pack()
+        self._label.configure(text=text)
+
+        x = self.widget.winfo_pointerx() + 12
+        y = self.widget.winfo_pointery() + 16
+        self._window.wm_geometry(f"+{x}+{y}")
+        self._window.deiconify()
+
+    def hide(self):
+        """Hide the popup."""
+        self._cancel()
+        if self._window is not None:
+            self._window.withdraw()
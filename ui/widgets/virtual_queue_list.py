@@ -0,0 +1,186 @@
+"""Virtualized list of queue items that only creates widgets for visible rows."""
+
+import sys
+import customtkinter as ctk
+from typing import Callable, Dict, List, Optional
+from core.queue import ConversionQueue
+from .queue_item_widget import QueueItemWidget, ROW_HEIGHT
+
+
+# Vertical distance between the tops of two rows
+ROW_STEP = ROW_HEIGHT + 4
+
+# Rows scrolled per mouse wheel notch
+_WHEEL_ROWS = 3
+
+
+class VirtualQueueList(ctk.CTkFrame):
+    """
+    Scrollable list of the queue's items, in insertion order.
+
+    Holds no item IDs of its own: each render asks the queue for the IDs at
+    the positions in view (a page query for a database-backed queue). Rows
+    on screen come from a small pool of QueueItemWidgets that are re-bound
+    to whichever items are scrolled into view, so adding, removing and
+    updating items costs the same whatever the queue length. Call refresh()
+    after items were added or removed.
+    """
+
+    def __init__(
+        self,
+        parent,
+        queue: ConversionQueue,
+        on_remove: Optional[Callable[[str], None]] = None,
+        on_select: Optional[Callable[[Optional[str]], None]] = None
+    ):
+        """
+        Initialize VirtualQueueList.
+
+        Args:
+            parent: Parent widget
+            queue: The ConversionQueue (or SQLiteConversionQueue) holding the items
+            on_remove: Callback when a row's remove button is clicked (receives item_id)
+            on_select: Callback when the selection changes (receives the selected
+                       item_id, or None when the selected row is clicked again)
+        """
+        super().__init__(parent, fg_color="transparent")
+
+        self.queue = queue
+        self._on_remove = on_remove
+        self._on_select = on_select
+        self._selected_id: Optional[str] = None
+        self._top = 0  # Scroll offset in pixels
+        self._visible: Dict[str, QueueItemWidget] = {}  # Item ID -> row on screen
+        self._pool: List[QueueItemWidget] = []  # Rows not currently shown
+        self._render_pending = False
+
+        self._create_widgets()
+
+    def _create_widgets(self):
+        """Create the viewport and scrollbar."""
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self._viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self._viewport.grid(row=0, column=0, sticky="nsew")
+        self._viewport.bind("<Configure>", lambda event: self._schedule_render())
+
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.bind_all("<MouseWheel>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_mouse_wheel, add="+")
+
+    def refresh(self):
+        """Show the queue's current items once the current burst of changes is done."""
+        self._schedule_render()
+
+    @property
+    def selected_id(self) -> Optional[str]:
+        """ID of the selected item, or None."""
+        return self._selected_id
+
+    def select(self, item_id: Optional[str]):
+        """
+        Select an item (None clears the selection).
+
+        Args:
+            item_id: ID of item to select
+        """
+        previous = self._visible.get(self._selected_id) if self._selected_id else None
+        if previous is not None:
+            previous.set_selected(False)
+        self._selected_id = item_id
+        row = self._visible.get(item_id) if item_id else None
+        if row is not None:
+            row.set_selected(True)
+
+    def _on_row_click(self, item_id: str):
+        """Toggle the selection of a clicked row."""
+        self.select(None if item_id == self._selected_id else item_id)
+        if self._on_select:
+            self._on_select(self._selected_id)
+
+    def get_row(self, item_id: str) -> Optional[QueueItemWidget]:
+        """Get the row showing an item, or None if it is scrolled out of view."""
+        return self._visible.get(item_id)
+
+    def __len__(self) -> int:
+        """Return number of listed items."""
+        return len(self.queue)
+
+    def _schedule_render(self):
+        """Render once the current burst of changes is done."""
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        """Bind and place rows for the items in view."""
+        self._render_pending = False
+
+        height = self._viewport.winfo_height()
+        content_height = len(self.queue) * ROW_STEP
+        self._top = max(0, min(self._top, content_height - height))
+
+        first = self._top // ROW_STEP
+        wanted = self.queue.item_ids(first, height // ROW_STEP + 2)
+
+        # Release rows whose items scrolled out of view (or were removed)
+        in_view = set(wanted)
+        for item_id in [item_id for item_id in self._visible if item_id not in in_view]:
+            row = self._visible.pop(item_id)
+            row.place_forget()
+            self._pool.append(row)
+
+        # One lookup for the rows in view (a single query for a database-backed queue)
+        items = self.queue.get_items(wanted)
+        for offset, item_id in enumerate(wanted):
+            item = items.get(item_id)
+            if item is None:
+                continue
+            row = self._visible.get(item_id)
+            if row is None:
+                if self._pool:
+                    row = self._pool.pop()
+                    row.set_item(item)
+                else:
+                    row = QueueItemWidget(self._viewport, item, on_remove=self._on_remove,
+                                          on_select=self._on_row_click)
+                row.set_selected(item_id == self._selected_id)
+                self._visible[item_id] = row
+            row.place(x=0, y=(first + offset) * ROW_STEP - self._top, relwidth=1.0)
+
+        if content_height > height:
+            self._scrollbar.set(self._top / content_height, (self._top + height) / content_height)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _scroll_to(self, top: int):
+        """Scroll so the given pixel offset is at the top of the viewport."""
+        self._top = max(0, int(top))
+        self._render()
+
+    def _on_scrollbar(self, action: str, value: str, unit: Optional[str] = None):
+        """Handle scrollbar drags and clicks (Tk yview protocol)."""
+        if action == "moveto":
+            self._scroll_to(float(value) * len(self.queue) * ROW_STEP)
+        elif action == "scroll":
+            step = self._viewport.winfo_height() if unit == "pages" else ROW_STEP
+            self._scroll_to(self._top + int(value) * step)
+
+    def _on_mouse_wheel(self, event):
+        """Scroll when the wheel turns over the list."""
+        if not str(event.widget).startswith(str(self._viewport)):
+            return
+
+        if event.num == 4:
+            rows = -_WHEEL_ROWS
+        elif event.num == 5:
+            rows = _WHEEL_ROWS
+        elif sys.platform == "darwin":
+            rows = -event.delta
+        else:
+            rows = -_WHEEL_ROWS if event.delta > 0 else _WHEEL_ROWS
+        self._scroll_to(self._top + rows * ROW_STEP)